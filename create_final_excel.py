@@ -6,8 +6,8 @@ import openpyxl
 from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
 from openpyxl.drawing.image import Image
 from io import BytesIO
-import requests
 from datetime import datetime
+from studio_common import VideoMetrics, extract_video_metrics, ThumbnailCache, thumbnail_item
 
 def create_final_excel():
     """실제 수집된 데이터로 사용자 요청 형식의 엑셀 생성"""
@@ -93,62 +93,29 @@ def create_final_excel():
             except:
                 return 'N/A'
         
+        # 썸네일은 행을 쓰기 전에 한꺼번에 준비 (once.py 수집과 같은 디스크 캐시 사용)
+        thumbnail_cache = ThumbnailCache()
+        thumbnails = [thumbnail_item(item.get('basic_video_info'), item.get('video_id')) for item in video_analytics]
+        thumbnail_cache.prefetch(thumbnails, size=(160, 120))
+        
         # 데이터 처리
         for row_idx, item in enumerate(video_analytics, 2):
             video_info = item.get('basic_video_info', {})
-            video_id = item.get('video_id', 'N/A')
+            video_id, thumbnail_url = thumbnails[row_idx - 2]
             video_title = item.get('video_title', 'N/A')
             
             print(f"   📹 처리 중: {video_title[:30]}...")
             
-            # 애널리틱스 데이터에서 메트릭 추출
-            tabs_api_data = item.get('analytics_data', {})
-            
-            impressions = 0
-            click_rate = 0
-            watch_time_minutes = 0
-            average_view_duration_seconds = 0
-            average_percentage_watched = 0
-            
-            # 각 탭의 API 응답에서 데이터 추출
-            for tab_name, tab_api_data in tabs_api_data.items():
-                if tab_api_data and 'response_data' in tab_api_data:
-                    response_data = tab_api_data['response_data']
-                    cards = response_data.get('cards', [])
-                    
-                    for card in cards:
-                        if 'keyMetricCardData' in card:
-                            tabs = card['keyMetricCardData'].get('keyMetricTabs', [])
-                            for tab in tabs:
-                                primary_content = tab.get('primaryContent', {})
-                                metric = primary_content.get('metric', '')
-                                total = primary_content.get('total', 0)
-                                
-                                if metric == 'VIDEO_THUMBNAIL_IMPRESSIONS':
-                                    impressions = total
-                                elif metric == 'VIDEO_THUMBNAIL_IMPRESSIONS_VTR':
-                                    click_rate = total
-                                elif metric in ['EXTERNAL_WATCH_TIME', 'WATCH_TIME']:
-                                    watch_time_minutes = round(total / 1000 / 60, 1)
-                                elif metric in ['WATCH_TIME_MINUTES']:
-                                    watch_time_minutes = total
-                                elif metric in ['AVERAGE_VIEW_DURATION', 'AVG_VIEW_DURATION', 'AVERAGE_VIEW_DURATION_SECONDS']:
-                                    average_view_duration_seconds = total
-                        
-                        elif 'audienceRetentionHighlightsCardData' in card:
-                            videos_data = card['audienceRetentionHighlightsCardData'].get('videosData', [])
-                            for video_data in videos_data:
-                                if video_data.get('videoId') == video_id:
-                                    metric_totals = video_data.get('metricTotals', {})
-                                    
-                                    avg_duration_millis = metric_totals.get('avgViewDurationMillis', 0)
-                                    if avg_duration_millis:
-                                        average_view_duration_seconds = round(avg_duration_millis / 1000)
-                                    
-                                    avg_percentage = metric_totals.get('avgPercentageWatched', 0)
-                                    if avg_percentage:
-                                        average_percentage_watched = round(avg_percentage * 100, 2)
-                                    break
+            # 애널리틱스 데이터에서 메트릭 추출 (수집 시 추출된 메트릭이 있으면 그대로 사용)
+            if item.get('metrics'):
+                metrics = VideoMetrics.from_record(item['metrics'])
+            else:
+                metrics = extract_video_metrics(item.get('analytics_data', {}), video_id)
+            impressions = metrics.impressions
+            click_rate = metrics.click_rate
+            watch_time_minutes = metrics.watch_time_minutes
+            average_view_duration_seconds = metrics.average_view_duration_seconds
+            average_percentage_watched = metrics.average_percentage_watched
             
             # 공개 상태 변환
             privacy_status = (
@@ -159,19 +126,6 @@ def create_final_excel():
             )
             privacy_korean = privacy_mapping.get(privacy_status, privacy_status)
             
-            # 썸네일 URL 추출
-            thumbnail_url = None
-            if 'thumbnailDetails' in video_info and 'thumbnails' in video_info['thumbnailDetails']:
-                thumbnails = video_info['thumbnailDetails']['thumbnails']
-                if thumbnails and len(thumbnails) > 0:
-                    thumbnail_url = thumbnails[-1].get('url')
-            elif 'thumbnail_urls' in video_info:
-                urls = video_info['thumbnail_urls']
-                if urls and len(urls) > 0:
-                    thumbnail_url = urls[-1]
-            if not thumbnail_url and video_id != 'N/A':
-                thumbnail_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
-            
             # 사용자 요청에 맞는 데이터 (애널리틱스조회수 제거, 좋아요/댓글수 제거)
             data = [
                 "📷 썸네일",  # 썸네일 (첫 번째 열)
@@ -217,13 +171,10 @@ def create_final_excel():
             thumbnail_cell = worksheet.cell(row=row_idx, column=1)
             if thumbnail_url:
                 try:
-                    print(f"      📷 썸네일 다운로드: {thumbnail_url[:50]}...")
-                    response = requests.get(thumbnail_url, timeout=15, headers={
-                        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                    })
+                    image_bytes, error = thumbnail_cache.fetch_resized(video_id, thumbnail_url, 160, 120)
                     
-                    if response.status_code == 200:
-                        img_data = BytesIO(response.content)
+                    if image_bytes:
+                        img_data = BytesIO(image_bytes)
                         img = Image(img_data)
                         
                         # 이미지 크기 조정 (크게)
@@ -238,10 +189,8 @@ def create_final_excel():
                         worksheet.row_dimensions[row_idx].height = 100
                         
                         thumbnail_cell.value = "📷"
-                        print(f"      ✅ 썸네일 삽입 완료")
                     else:
-                        thumbnail_cell.value = f"❌ HTTP {response.status_code}"
-                        print(f"      ❌ 썸네일 다운로드 실패: {response.status_code}")
+                        thumbnail_cell.value = f"❌ {error}"
                 except Exception as e:
                     thumbnail_cell.value = "❌ 오류"
                     print(f"      ❌ 썸네일 오류: {str(e)[:50]}")
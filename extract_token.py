@@ -2,10 +2,9 @@
 # -*- coding: utf-8 -*-
 
 import json
-import requests
-import time
 import os
 from datetime import datetime
+from studio_common import ReplayClient, AdaptiveRateLimiter
 
 def extract_next_page_token():
     """실제 수집된 JSON에서 nextPageToken 추출"""
@@ -112,6 +111,10 @@ def collect_remaining_pages(next_token, request_info, existing_videos):
     page_count = 1  # 이미 첫 페이지는 수집됨
     current_token = next_token
     
+    # 모든 페이지가 하나의 연결 풀/쿠키 jar와 속도 제한기를 공유
+    replay_client = ReplayClient(rate_limiter=AdaptiveRateLimiter(rate=1.0, burst=1))
+    headers = request_info['headers']
+    
     while current_token:
         page_count += 1
         print(f"\n📄 페이지 {page_count} 수집 중...")
@@ -120,30 +123,13 @@ def collect_remaining_pages(next_token, request_info, existing_videos):
         payload = request_info['base_payload'].copy()
         payload['pageToken'] = current_token
         
-        # 요청 전송
-        session = requests.Session()
-        headers = request_info['headers'].copy()
-        
-        # 쿠키 설정
-        if 'Cookie' in headers:
-            cookie_str = headers['Cookie']
-            cookies = {}
-            for item in cookie_str.split(';'):
-                if '=' in item:
-                    key, value = item.strip().split('=', 1)
-                    cookies[key] = value
-            session.cookies.update(cookies)
-            print(f"   🍪 쿠키 설정: {len(cookies)}개")
-        
-        # Content-Length 제거
-        headers.pop('Content-Length', None)
-        
         try:
             print(f"   📡 API 요청 전송 중...")
-            response = session.post(
+            response = replay_client.send(
                 request_info['url'], 
-                headers=headers, 
-                json=payload, 
+                'POST', 
+                headers, 
+                json.dumps(payload, separators=(',', ':')), 
                 timeout=30
             )
             
@@ -181,9 +167,8 @@ def collect_remaining_pages(next_token, request_info, existing_videos):
         except Exception as e:
             print(f"   ❌ 요청 오류: {e}")
             break
-        
-        # API 제한 고려
-        time.sleep(1)
+    
+    replay_client.close()
     
     print(f"\n🎉 전체 수집 완료!")
     print(f"   📄 총 페이지: {page_count}개")
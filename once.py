@@ -1,10 +1,21 @@
 import json
 import time
+import base64
+import copy
+import gzip
+import sqlite3
+import asyncio
 import requests
 import pandas as pd
-from datetime import datetime
+import numpy as np
+from datetime import datetime, timedelta
 import websocket
 import threading
+import argparse
+import itertools
+import importlib.util
+import queue
+from concurrent.futures import ThreadPoolExecutor, Future, TimeoutError as FutureTimeoutError
 from urllib.parse import urlparse, parse_qs
 import re
 import os
@@ -13,7 +24,8 @@ import psutil
 import webbrowser
 from pathlib import Path
 import openpyxl
-from openpyxl.styles import PatternFill, Font, Alignment, Border, Side
+from openpyxl.styles import PatternFill, Font, Alignment, Border, Side, NamedStyle
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils.dataframe import dataframe_to_rows
 from openpyxl.drawing.image import Image
 from io import BytesIO
@@ -21,18 +33,1191 @@ import tempfile
 import urllib.request
 import platform
 import shutil
+from studio_common import (
+    AdaptiveRateLimiter, RetryPolicy, DEFAULT_RETRY_POLICIES,
+    STUDIO_ORIGIN, build_sapisid_authorization, SapisidSigner,
+    ReplayClient,
+    KEY_METRIC_FIELDS, VideoMetrics, extract_response_metrics, extract_video_metrics,
+    thumbnail_item, ThumbnailCache,
+)
+
+try:
+    import aiohttp  # asyncio 복제 백엔드용 (선택 사항)
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    aiohttp = None
+    AIOHTTP_AVAILABLE = False
+
+# Parquet 내보내기용 (선택 사항) - pandas가 직접 불러 쓰므로 설치 여부만 확인
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+class ReplayResponse:
+    """비동기 백엔드 응답을 requests 응답처럼 다루기 위한 최소 래퍼"""
+
+    def __init__(self, status_code, content, headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class AsyncReplayClient:
+    """aiohttp 기반 asyncio 복제 클라이언트
+
+    전용 스레드에서 도는 이벤트 루프 하나가 모든 get_screen/get_cards 요청을 처리하므로
+    비디오마다 OS 스레드를 쓰지 않고도 수백 개의 요청을 동시에 진행할 수 있습니다.
+    send()는 ReplayClient와 같은 시그니처의 블로킹 래퍼라서 기존 호출부가 그대로 동작합니다.
+    """
+
+    def __init__(self, max_connections=100, rate_limiter=None, retry_policies=None):
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("aiohttp가 설치되어 있지 않습니다. (pip install aiohttp)")
+
+        self.max_connections = max_connections
+        self.rate_limiter = rate_limiter  # 모든 요청이 거쳐가는 AdaptiveRateLimiter (선택)
+        self.retry_policies = retry_policies or DEFAULT_RETRY_POLICIES  # 엔드포인트별 RetryPolicy
+        self.session = None
+        self.prepared_headers = {}  # id(캡처된 헤더) -> (캡처된 헤더, 기본 헤더)
+        self.signer = SapisidSigner()  # 요청마다 Authorization 재계산
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='replay-event-loop', daemon=True)
+        self.thread.start()
+
+    def prepare_headers(self, headers):
+        """캡처된 헤더에서 전송용 기본 헤더 생성 (Content-Length 제외, 캐시 사용)"""
+        cached = self.prepared_headers.get(id(headers))
+        if cached and cached[0] is headers:
+            return cached[1]
+
+        base_headers = {key: value for key, value in headers.items() if key.lower() != 'content-length'}
+        if not any(key.lower() == 'content-type' for key in base_headers):
+            base_headers['Content-Type'] = 'application/json'
+        self.signer.update_cookies(headers.get('Cookie') or headers.get('cookie') or '')
+
+        self.prepared_headers[id(headers)] = (headers, base_headers)
+        return base_headers
+
+    async def send_async(self, url, method, headers, data=None, timeout=30):
+        """캡처된 헤더로 비동기 요청 전송 (이벤트 루프 스레드에서 실행, 재시도 정책 적용)"""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=self.max_connections),
+                cookie_jar=aiohttp.DummyCookieJar()  # 캡처된 Cookie 헤더를 그대로 사용
+            )
+
+        request_headers = self.prepare_headers(headers)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        policy = RetryPolicy.for_url(self.retry_policies, url)
+        attempt = 0
+
+        while True:
+            attempt += 1
+            if self.rate_limiter:
+                await self.rate_limiter.acquire_async()
+
+            try:
+                async with self.session.request(
+                    method.upper(),
+                    url,
+                    headers=self.signer.sign(request_headers),  # 전송 시각 기준 Authorization
+                    data=data if method.upper() == 'POST' else None,
+                    timeout=aiohttp.ClientTimeout(total=timeout)
+                ) as response:
+                    content = await response.read()
+                    replay_response = ReplayResponse(response.status, content, dict(response.headers))
+            except (asyncio.TimeoutError, aiohttp.ClientError) as e:
+                if not policy.should_retry(attempt, error=e):
+                    e.retry_count = attempt - 1
+                    raise
+                delay = policy.backoff(attempt)
+                print(f"   🔁 요청 오류 ({type(e).__name__}) - {delay:.1f}초 후 재시도 ({attempt}/{policy.max_attempts})")
+                await asyncio.sleep(delay)
+                continue
+
+            retry_after = replay_response.headers.get('Retry-After')
+            if self.rate_limiter:
+                self.rate_limiter.record(replay_response.status_code, retry_after)
+
+            if replay_response.status_code != 200 and policy.should_retry(attempt, status_code=replay_response.status_code):
+                delay = policy.backoff(attempt, retry_after)
+                print(f"   🔁 HTTP {replay_response.status_code} - {delay:.1f}초 후 재시도 ({attempt}/{policy.max_attempts})")
+                await asyncio.sleep(delay)
+                continue
+
+            replay_response.retry_count = attempt - 1
+            return replay_response
+
+    def run(self, coroutine):
+        """이벤트 루프에서 코루틴을 실행하고 결과를 기다림 (블로킹)"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def send(self, url, method, headers, data=None, timeout=30):
+        """send_async의 블로킹 래퍼 (ReplayClient.send와 호환)"""
+        try:
+            return self.run(self.send_async(url, method, headers, data, timeout))
+        except asyncio.TimeoutError as e:
+            timeout_error = requests.Timeout(f"요청 타임아웃 ({timeout}초): {url}")
+            timeout_error.retry_count = getattr(e, 'retry_count', 0)
+            raise timeout_error
+
+    def close(self):
+        """세션과 이벤트 루프 정리"""
+        if self.session is not None:
+            self.run(self.session.close())
+            self.session = None
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+class CDPSession:
+    """Chrome DevTools Protocol 세션 - WebSocket 하나를 독점하고 명령 응답을 ID로 매칭
+
+    - 수신 스레드가 모든 메시지를 읽어 명령 응답은 해당 ID의 Future로 전달
+    - 이벤트는 별도 디스패치 스레드에서 구독자에게 전달 (구독자 안에서 send를 호출해도 교착되지 않음)
+    """
+
+    def __init__(self, ws_url, connect_timeout=10):
+        self.ws = websocket.create_connection(ws_url, timeout=connect_timeout)
+        self.ws.settimeout(1.0)  # 수신 스레드가 종료 플래그를 주기적으로 확인하도록
+        self.ids = itertools.count(1)
+        self.pending = {}  # 명령 ID -> Future
+        self.pending_lock = threading.Lock()
+        self.send_lock = threading.Lock()
+        self.subscribers = {}  # 이벤트 이름(None이면 전체) -> 콜백 목록
+        self.events = queue.Queue()
+        self.closed = False
+        
+        self.reader_thread = threading.Thread(target=self.read_messages, name='cdp-reader', daemon=True)
+        self.dispatcher_thread = threading.Thread(target=self.dispatch_events, name='cdp-events', daemon=True)
+        self.reader_thread.start()
+        self.dispatcher_thread.start()
+
+    @property
+    def connected(self):
+        return not self.closed
+
+    def send(self, method, params=None, timeout=10):
+        """CDP 명령 전송 후 응답 result 반환 (오류 응답이면 RuntimeError, 시간 초과면 TimeoutError)"""
+        if self.closed:
+            raise RuntimeError("CDP 연결이 닫혀 있습니다.")
+        
+        command_id = next(self.ids)
+        future = Future()
+        with self.pending_lock:
+            self.pending[command_id] = future
+        
+        message = {"id": command_id, "method": method}
+        if params:
+            message["params"] = params
+        
+        try:
+            with self.send_lock:
+                self.ws.send(json.dumps(message))
+            response = future.result(timeout=timeout)
+        except FutureTimeoutError:
+            raise TimeoutError(f"CDP 명령 응답 시간 초과 ({timeout}초): {method}")
+        finally:
+            with self.pending_lock:
+                self.pending.pop(command_id, None)
+        
+        if 'error' in response:
+            error = response['error']
+            raise RuntimeError(f"CDP 명령 실패: {method} - {error.get('message', error)}")
+        return response.get('result', {})
+
+    def subscribe(self, method, callback):
+        """이벤트 구독 (method가 None이면 모든 이벤트)"""
+        self.subscribers.setdefault(method, []).append(callback)
+
+    def unsubscribe(self, method, callback):
+        callbacks = self.subscribers.get(method, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def read_messages(self):
+        """수신 스레드: 명령 응답은 Future로, 이벤트는 디스패치 큐로 전달"""
+        while not self.closed:
+            try:
+                data = json.loads(self.ws.recv())
+            except websocket.WebSocketTimeoutException:
+                continue
+            except websocket.WebSocketConnectionClosedException:
+                if not self.closed:
+                    print("WebSocket 연결이 끊어졌습니다.")
+                break
+            except Exception as e:
+                if self.closed:
+                    break
+                print(f"메시지 수신 오류: {e}")
+                continue
+            
+            if 'id' in data:
+                with self.pending_lock:
+                    future = self.pending.get(data['id'])
+                if future and not future.done():
+                    future.set_result(data)
+            elif 'method' in data:
+                self.events.put(data)
+        
+        self.shutdown()
+
+    def dispatch_events(self):
+        """디스패치 스레드: 이벤트를 도착 순서대로 구독자에게 전달"""
+        while True:
+            message = self.events.get()
+            if message is None:
+                break
+            
+            callbacks = self.subscribers.get(message['method'], []) + self.subscribers.get(None, [])
+            for callback in callbacks:
+                try:
+                    callback(message)
+                except Exception as e:
+                    print(f"CDP 이벤트 처리 오류 ({message['method']}): {e}")
+
+    def shutdown(self):
+        """대기 중인 명령을 모두 실패 처리하고 디스패치 스레드 종료"""
+        self.closed = True
+        with self.pending_lock:
+            pending_futures = list(self.pending.values())
+            self.pending.clear()
+        for future in pending_futures:
+            if not future.done():
+                future.set_result({'error': {'message': 'CDP 연결 종료'}})
+        self.events.put(None)
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        try:
+            self.ws.close()
+        except Exception:
+            pass
+        if threading.current_thread() is not self.reader_thread:
+            self.reader_thread.join(timeout=2)
+        self.shutdown()
+
+
+class CompiledPayload:
+    """videoId / pageToken 자리만 비워 둔 POST 바디 바이트 템플릿
+
+    캡처된 바디를 한 번만 파싱해 모든 문자열 videoId 값(replace_video_id_in_payload와
+    같은 규칙)을 표시값으로 바꿔 직렬화하고, 그 위치에서 바이트를 잘라 둡니다.
+    render()는 조각 사이에 JSON 인코딩된 값을 이어 붙이기만 하므로 요청마다
+    파싱·깊은 복사·재귀 탐색·재직렬화가 일어나지 않습니다.
+    """
+
+    SLOT_MARKER = '\u0000{}\u0000'
+    SLOT_PATTERN = re.compile(rb'"\\u0000(videoId|pageToken)\\u0000"')
+
+    def __init__(self, post_data):
+        payload = json.loads(post_data)
+        self.video_id_paths = []
+        self.original_video_ids = []
+        self.mark_video_ids(payload, '')
+
+        self.segments = self.split(payload)
+        self.paged_segments = None
+        if isinstance(payload, dict):
+            # 다음 페이지 요청용: pageToken 자리 추가 (기존 키가 있으면 그 위치 유지)
+            payload['pageToken'] = self.SLOT_MARKER.format('pageToken')
+            self.paged_segments = self.split(payload)
+
+    def mark_video_ids(self, obj, path):
+        """문자열 videoId 값을 표시값으로 바꾸고 경로와 원래 값을 직렬화 순서대로 기록"""
+        if isinstance(obj, dict):
+            for key, value in obj.items():
+                child_path = f"{path}.{key}" if path else key
+                if key == 'videoId' and isinstance(value, str):
+                    self.video_id_paths.append(child_path)
+                    self.original_video_ids.append(json.dumps(value).encode())
+                    obj[key] = self.SLOT_MARKER.format('videoId')
+                elif isinstance(value, (dict, list)):
+                    self.mark_video_ids(value, child_path)
+        elif isinstance(obj, list):
+            for index, item in enumerate(obj):
+                self.mark_video_ids(item, f"{path}[{index}]")
+
+    def split(self, payload):
+        """직렬화한 바디를 (고정 바이트 조각들, 자리 이름들)로 분리"""
+        pieces = self.SLOT_PATTERN.split(json.dumps(payload, separators=(',', ':')).encode())
+        return pieces[0::2], [slot.decode() for slot in pieces[1::2]]
+
+    def render(self, video_id=None, page_token=None):
+        """자리에 값을 채운 바디(bytes) 반환 - video_id가 없으면 캡처된 원래 ID 유지"""
+        if page_token is None or self.paged_segments is None:
+            literals, slots = self.segments
+        else:
+            literals, slots = self.paged_segments
+
+        encoded_video_id = json.dumps(video_id).encode() if video_id is not None else None
+        parts = [literals[0]]
+        video_index = 0
+        for slot, literal in zip(slots, literals[1:]):
+            if slot == 'videoId':
+                parts.append(encoded_video_id or self.original_video_ids[video_index])
+                video_index += 1
+            else:
+                parts.append(json.dumps(page_token).encode())
+            parts.append(literal)
+        return b''.join(parts)
+
+
+class RequestTemplateStore:
+    """엔드포인트별 youtubei 요청 템플릿 저장소 (브라우저 이동 없이 요청을 만들기 위한 것)
+
+    캡처된 요청에서 바뀌는 값은 매개변수로 분리해 저장합니다.
+    - videoId, 채널 ID -> 자리표시자, pageToken -> 제거
+    - 기간(screenConfig.timePeriod)과 클라이언트 컨텍스트(context) -> 별도 필드 (렌더링 시 교체 가능)
+    - Cookie/Authorization 헤더 -> 저장하지 않음 (실행 시 새 쿠키로 생성)
+    """
+
+    VIDEO_ID = '{{videoId}}'
+    CHANNEL_ID = '{{channelId}}'
+    VOLATILE_HEADERS = ('cookie', 'authorization', 'content-length')
+
+    def __init__(self, path='request_templates.json'):
+        self.path = Path(path)
+        self.channel_id = None
+        self.templates = {}
+        self.lock = threading.Lock()
+
+    def load(self):
+        if not self.path.exists():
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.channel_id = data.get('channel_id')
+            self.templates = data.get('templates', {})
+            return True
+        except Exception as e:
+            print(f"⚠️ 요청 템플릿 읽기 실패: {e}")
+            return False
+
+    def has(self, *endpoints):
+        return all(endpoint in self.templates for endpoint in endpoints)
+
+    def parameterize(self, value, channel_id):
+        """videoId 값과 채널 ID 문자열을 자리표시자로 치환 (재귀)"""
+        if isinstance(value, dict):
+            return {
+                key: self.VIDEO_ID if key == 'videoId' and isinstance(item, str) else self.parameterize(item, channel_id)
+                for key, item in value.items()
+            }
+        if isinstance(value, list):
+            return [self.parameterize(item, channel_id) for item in value]
+        if isinstance(value, str) and channel_id and channel_id in value:
+            return value.replace(channel_id, self.CHANNEL_ID)
+        return value
+
+    def fill(self, value, channel_id, video_id):
+        """자리표시자를 실제 값으로 채우기 (video_id가 없으면 videoId 자리표시자는 그대로 둠)"""
+        if isinstance(value, dict):
+            return {key: self.fill(item, channel_id, video_id) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self.fill(item, channel_id, video_id) for item in value]
+        if isinstance(value, str):
+            if video_id and value == self.VIDEO_ID:
+                return video_id
+            if channel_id and self.CHANNEL_ID in value:
+                return value.replace(self.CHANNEL_ID, channel_id)
+        return value
+
+    def save_captured(self, endpoint, captured_request, channel_id):
+        """캡처된 요청 하나를 템플릿으로 변환해 저장"""
+        try:
+            payload = json.loads(captured_request.get('postData') or '{}')
+        except json.JSONDecodeError:
+            print(f"⚠️ {endpoint} 요청 바디가 JSON이 아니어서 템플릿으로 저장하지 않습니다.")
+            return False
+        
+        payload.pop('pageToken', None)
+        context = payload.pop('context', None)
+        time_period = payload.get('screenConfig', {}).pop('timePeriod', None) if isinstance(payload.get('screenConfig'), dict) else None
+        headers = {
+            key: value for key, value in captured_request.get('headers', {}).items()
+            if key.lower() not in self.VOLATILE_HEADERS
+        }
+        
+        with self.lock:
+            self.channel_id = channel_id or self.channel_id
+            self.templates[endpoint] = {
+                'url': captured_request['url'],
+                'method': captured_request.get('method', 'POST'),
+                'headers': self.parameterize(headers, channel_id),
+                'payload': self.parameterize(payload, channel_id),
+                'time_period': self.parameterize(time_period, channel_id),
+                'context': self.parameterize(context, channel_id),
+                'saved_at': datetime.now().isoformat()
+            }
+            temp_path = self.path.with_suffix('.json.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump({'channel_id': self.channel_id, 'templates': self.templates}, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        return True
+
+    def render(self, endpoint, video_id=None, page_token=None, cookie_header=None, authorization=None,
+               time_period=None, client_context=None):
+        """템플릿으로 캡처 요청과 같은 형식의 dict 생성 (url, method, headers, postData)"""
+        template = self.templates[endpoint]
+        channel_id = self.channel_id
+        payload = self.fill(copy.deepcopy(template['payload']), channel_id, video_id)
+        
+        period = time_period if time_period is not None else template.get('time_period')
+        if period is not None:
+            payload.setdefault('screenConfig', {})['timePeriod'] = self.fill(copy.deepcopy(period), channel_id, video_id)
+        
+        context = self.fill(copy.deepcopy(template.get('context')), channel_id, video_id)
+        if context is not None:
+            if client_context:
+                # 실행 중인 Studio에서 얻은 최신 클라이언트 정보(clientVersion 등)로 교체
+                context['client'] = {**context.get('client', {}), **client_context}
+            payload['context'] = context
+        
+        if page_token:
+            payload['pageToken'] = page_token
+        
+        headers = self.fill(dict(template['headers']), channel_id, video_id)
+        if cookie_header:
+            headers['Cookie'] = cookie_header
+        if authorization:
+            headers['Authorization'] = authorization
+        
+        return {
+            'url': template['url'],
+            'method': template['method'],
+            'headers': headers,
+            'postData': json.dumps(payload, separators=(',', ':')),
+            'from_template': True
+        }
+
+
+class CollectionCheckpoint:
+    """긴 수집 작업을 위한 디스크 체크포인트 (중단 후 --resume으로 이어서 수집)
+
+    state.json     : 채널 ID, 공개 비디오 목록, 캡처된 애널리틱스 요청 템플릿 (원자적 교체 저장)
+    analytics.ndjson: 비디오 하나가 끝날 때마다 한 줄씩 추가되는 종합 데이터 (append-only)
+
+    캡처된 요청 헤더에는 로그인 쿠키가 포함되므로 체크포인트 폴더는 외부에 공유하지 마세요.
+    """
+
+    def __init__(self, directory='collection_checkpoint'):
+        self.directory = Path(directory)
+        self.state_path = self.directory / 'state.json'
+        self.records_path = self.directory / 'analytics.ndjson'
+        self.lock = threading.Lock()
+        self.state = {}
+
+    def exists(self):
+        return self.state_path.exists()
+
+    def write_state(self):
+        """state.json을 임시 파일에 쓴 뒤 교체 (쓰는 도중 중단돼도 이전 상태 유지)"""
+        self.state['updated_at'] = datetime.now().isoformat()
+        temp_path = self.state_path.with_suffix('.json.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, ensure_ascii=False)
+        os.replace(temp_path, self.state_path)
+
+    def start(self, channel_id, videos):
+        """새 수집 시작 - 이전 체크포인트를 비우고 비디오 목록 기록"""
+        with self.lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self.state = {
+                'channel_id': channel_id,
+                'started_at': datetime.now().isoformat(),
+                'completed': False,
+                'videos': videos,
+                'templates': {}
+            }
+            self.write_state()
+            open(self.records_path, 'w', encoding='utf-8').close()
+
+    def save_templates(self, reach_viewers_request, interest_viewers_request):
+        """두 번째 이후 비디오 수집에 쓰이는 캡처 요청 템플릿 기록"""
+        with self.lock:
+            if not self.state:
+                return
+            self.state['templates'] = {
+                'reach_viewers': reach_viewers_request,
+                'interest_viewers': interest_viewers_request
+            }
+            self.write_state()
+
+    def append_record(self, combined_data):
+        """완료된 비디오 한 개를 NDJSON 한 줄로 추가하고 디스크에 즉시 반영"""
+        with self.lock:
+            if not self.state:
+                return
+            with open(self.records_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(combined_data, ensure_ascii=False, separators=(',', ':')) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def mark_completed(self):
+        with self.lock:
+            if not self.state:
+                return
+            self.state['completed'] = True
+            self.write_state()
+
+    def load(self):
+        """체크포인트 상태와 완료된 비디오 레코드 읽기 (중단으로 잘린 마지막 줄은 무시)"""
+        with open(self.state_path, 'r', encoding='utf-8') as f:
+            self.state = json.load(f)
+
+        records = []
+        has_broken_line = False
+        if self.records_path.exists():
+            with open(self.records_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        has_broken_line = True
+        
+        if has_broken_line:
+            # 이어서 추가되는 레코드가 잘린 줄에 붙지 않도록 정상 레코드만으로 다시 기록
+            print("⚠️ 체크포인트의 불완전한 레코드를 건너뜁니다.")
+            temp_path = self.records_path.with_suffix('.ndjson.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')) + '\n')
+            os.replace(temp_path, self.records_path)
+        return self.state, records
+
+
+class IncrementalStore:
+    """증분 수집용 이전 실행 결과 저장소 (videoId -> 마지막 스냅샷 카운터 + 애널리틱스 레코드)
+
+    새 list_creator_videos 스냅샷과 비교해 새 비디오, 조회수/게시 시각이 바뀐 비디오,
+    최근 recent_days일 이내 게시된 비디오만 다시 수집하고 나머지는 이전 레코드를 재사용합니다.
+    """
+
+    def __init__(self, path='incremental_store.json'):
+        self.path = Path(path)
+        self.videos = {}
+
+    def load(self):
+        if not self.path.exists():
+            return False
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.videos = json.load(f).get('videos', {})
+            return True
+        except Exception as e:
+            print(f"⚠️ 증분 저장소 읽기 실패 - 전체 수집으로 진행합니다: {e}")
+            self.videos = {}
+            return False
+
+    def refresh_reason(self, video, recent_days=7, now=None):
+        """다시 수집해야 하는 이유를 반환 (재사용 가능하면 None)"""
+        previous = self.videos.get(video.get('videoId'))
+        if not previous or not previous.get('record'):
+            return 'new'
+        if str(video.get('public_viewCount')) != str(previous.get('public_viewCount')):
+            return 'views_changed'
+        if str(video.get('timePublishedSeconds')) != str(previous.get('timePublishedSeconds')):
+            return 'republished'
+        try:
+            published_at = int(video.get('timePublishedSeconds'))
+        except (TypeError, ValueError):
+            return 'unknown_publish_time'
+        if (now or time.time()) - published_at < recent_days * 86400:
+            return 'recent'
+        return None
+
+    def previous_record(self, video_id):
+        previous = self.videos.get(video_id)
+        return previous.get('record') if previous else None
+
+    def update(self, analytics_data):
+        """이번 실행에서 확보한 레코드로 저장소 갱신"""
+        for record in analytics_data:
+            basic_video_info = record.get('basic_video_info') or {}
+            video_id = record.get('video_id')
+            if not video_id or not record.get('analytics_data'):
+                continue  # 수집 실패한 비디오는 다음 실행에서 다시 시도
+            self.videos[video_id] = {
+                'public_viewCount': basic_video_info.get('public_viewCount'),
+                'timePublishedSeconds': basic_video_info.get('timePublishedSeconds'),
+                'updated_at': record.get('collected_at'),
+                'record': {key: value for key, value in record.items() if key != 'reused_from_previous_run'}
+            }
+
+    def save(self):
+        temp_path = self.path.with_suffix('.json.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'saved_at': datetime.now().isoformat(), 'videos': self.videos}, f, ensure_ascii=False)
+        os.replace(temp_path, self.path)
+
+
+def series_columns(datums):
+    """mainSeries.datums를 (int64 유닉스 타임스탬프(ms), float64 값) 배열로 변환 (값이 없으면 NaN, 시각이 없는 점은 제외)"""
+    datums = [datum for datum in datums if datum.get('x') is not None]
+    timestamps = np.fromiter((datum['x'] for datum in datums), dtype=np.int64, count=len(datums))
+    values = np.fromiter(
+        (np.nan if datum.get('y') is None else datum['y'] for datum in datums), dtype=np.float64, count=len(datums)
+    )
+    return timestamps, values
+
+
+class MetricSeriesStore:
+    """비디오별 메트릭 시계열을 열 단위 배열로 보관하는 저장소
+
+    시계열마다 int64 타임스탬프(ms)와 float64 값 배열만 두고, 저장할 때는 모든 시계열을
+    timestamps/values 두 열로 이어 붙여 (video_id, metric, offset) 색인과 함께 .npz로 기록합니다.
+    """
+
+    def __init__(self):
+        self.series = {}  # (video_id, metric) -> (timestamps, values)
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.series)
+
+    def add_metrics(self, video_id, metrics):
+        """VideoMetrics.series(collect_series=True로 추출)를 열 배열로 변환해 보관"""
+        columns = {metric: series_columns(datums) for metric, datums in metrics.series.items()}
+        with self.lock:
+            for metric, (timestamps, values) in columns.items():
+                self.series[(video_id, metric)] = (timestamps, values)
+
+    def get(self, video_id, metric):
+        return self.series.get((video_id, metric))
+
+    def save(self, path):
+        with self.lock:
+            keys = list(self.series)
+            columns = [self.series[key] for key in keys]
+        lengths = np.array([len(timestamps) for timestamps, _ in columns], dtype=np.int64)
+        np.savez_compressed(
+            path,
+            video_ids=np.array([video_id for video_id, _ in keys], dtype=str),
+            metrics=np.array([metric for _, metric in keys], dtype=str),
+            offsets=np.concatenate(([0], np.cumsum(lengths))),
+            timestamps=np.concatenate([timestamps for timestamps, _ in columns]) if columns else np.empty(0, np.int64),
+            values=np.concatenate([values for _, values in columns]) if columns else np.empty(0, np.float64)
+        )
+
+    @classmethod
+    def load(cls, path):
+        """save()로 기록한 .npz 읽기 (시계열은 이어 붙인 열의 뷰로 복원)"""
+        store = cls()
+        with np.load(path) as data:
+            offsets = data['offsets']
+            timestamps, values = data['timestamps'], data['values']
+            for index, (video_id, metric) in enumerate(zip(data['video_ids'], data['metrics'])):
+                start, end = offsets[index], offsets[index + 1]
+                store.series[(str(video_id), str(metric))] = (timestamps[start:end], values[start:end])
+        return store
+
+    def to_frame(self):
+        """전체 시계열을 (video_id, metric, timestamp, value) 긴 형식 DataFrame으로 변환"""
+        with self.lock:
+            keys = list(self.series)
+            columns = [self.series[key] for key in keys]
+        lengths = [len(timestamps) for timestamps, _ in columns]
+        timestamps = np.concatenate([timestamps for timestamps, _ in columns]) if columns else np.empty(0, np.int64)
+        return pd.DataFrame({
+            'video_id': np.repeat([video_id for video_id, _ in keys], lengths),
+            'metric': np.repeat([metric for _, metric in keys], lengths),
+            'timestamp': timestamps.astype('datetime64[ms]'),
+            'value': np.concatenate([values for _, values in columns]) if columns else np.empty(0, np.float64)
+        })
+
+
+# Parquet 비디오 테이블의 list_creator_videos 열: 열 이름 -> (basic_video_info 키, 타입)
+VIDEO_TABLE_INFO_COLUMNS = {
+    'title': ('title', 'string'),
+    'privacy': ('privacy', 'string'),
+    'status': ('status', 'string'),
+    'length_seconds': ('lengthSeconds', 'Int64'),
+    'time_created': ('timeCreatedSeconds', 'datetime'),
+    'time_published': ('timePublishedSeconds', 'datetime'),
+    'view_count': ('public_viewCount', 'Int64'),
+    'like_count': ('public_likeCount', 'Int64'),
+    'comment_count': ('public_commentCount', 'Int64'),
+    'external_view_count': ('public_externalViewCount', 'Int64'),
+}
+
+# 추출된 애널리틱스 메트릭 열: VideoMetrics 필드 -> 타입
+VIDEO_TABLE_METRIC_COLUMNS = {
+    'impressions': 'Int64',
+    'click_rate': 'float64',
+    'views': 'Int64',
+    'watch_time_minutes': 'float64',
+    'average_view_duration_seconds': 'Int64',
+    'average_percentage_watched': 'float64',
+    'subscribers_net_change': 'Int64',
+    'retention_views': 'Int64',
+}
+
+
+def parse_iso_timestamp(value):
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def build_video_table(analytics_data, channel_id=None, collected_at=None):
+    """애널리틱스 레코드를 비디오당 한 행, 열마다 타입이 정해진 DataFrame으로 평탄화"""
+    collected_at = collected_at or datetime.now()
+    columns = {name: [] for name in ['video_id', 'collected_at', 'retry_count',
+                                     *VIDEO_TABLE_INFO_COLUMNS, *VIDEO_TABLE_METRIC_COLUMNS]}
+    
+    for record in analytics_data:
+        video_id = record.get('video_id')
+        video_info = record.get('basic_video_info') or {}
+        if record.get('metrics'):
+            metrics = VideoMetrics.from_record(record['metrics'])
+        else:
+            metrics = extract_video_metrics(record.get('analytics_data', {}), video_id)
+        
+        columns['video_id'].append(video_id)
+        columns['collected_at'].append(record.get('collected_at'))
+        columns['retry_count'].append(record.get('retry_count', 0))
+        for name, (key, _) in VIDEO_TABLE_INFO_COLUMNS.items():
+            columns[name].append(video_info.get(key))
+        for name in VIDEO_TABLE_METRIC_COLUMNS:
+            columns[name].append(getattr(metrics, name))
+    
+    table = pd.DataFrame({
+        'channel_id': pd.Series([channel_id or 'unknown'] * len(columns['video_id']), dtype='string'),
+        'collection_date': pd.Series([collected_at.date().isoformat()] * len(columns['video_id']), dtype='string'),
+        'video_id': pd.Series(columns['video_id'], dtype='string'),
+        # 마이크로초 유무가 섞인 ISO 문자열이라 값마다 파싱 (pandas 형식 추론은 첫 값 형식만 사용)
+        'collected_at': pd.to_datetime(pd.Series([parse_iso_timestamp(value) for value in columns['collected_at']], dtype='object')),
+        'retry_count': pd.to_numeric(pd.Series(columns['retry_count'], dtype='object'), errors='coerce').astype('Int64'),
+    })
+    for name, (_, dtype) in VIDEO_TABLE_INFO_COLUMNS.items():
+        values = pd.Series(columns[name], dtype='object')
+        if dtype == 'datetime':
+            table[name] = pd.to_datetime(pd.to_numeric(values, errors='coerce'), unit='s', utc=True)
+        elif dtype == 'Int64':
+            table[name] = pd.to_numeric(values, errors='coerce').astype('Int64')
+        else:
+            table[name] = values.astype(dtype)
+    for name, dtype in VIDEO_TABLE_METRIC_COLUMNS.items():
+        table[name] = pd.to_numeric(pd.Series(columns[name], dtype='object'), errors='coerce').astype(dtype)
+    return table
+
+
+# 공개 상태 코드 -> 엑셀 표시 이름
+PRIVACY_LABELS = {
+    'VIDEO_PRIVACY_PUBLIC': '공개',
+    'VIDEO_PRIVACY_PRIVATE': '비공개',
+    'VIDEO_PRIVACY_UNLISTED': '제한공개',
+    'VIDEO_PRIVACY_DRAFT': '임시보관함',
+    'VIDEO_PRIVACY_SCHEDULED': '예약 게시',
+    'VIDEO_STATUS_PROCESSED': '처리 완료',
+    'VIDEO_STATUS_UPLOADING': '업로드 중',
+    'VIDEO_STATUS_PROCESSING': '처리 중',
+    'VIDEO_STATUS_FAILED': '실패',
+    'PUBLIC': '공개',
+    'PRIVATE': '비공개',
+    'UNLISTED': '제한공개'
+}
+
+
+def privacy_label(video_info):
+    privacy_status = (
+        video_info.get('privacy') or
+        video_info.get('status') or
+        video_info.get('privacyStatus') or
+        'Unknown'
+    )
+    return PRIVACY_LABELS.get(privacy_status, privacy_status)
+
+
+def format_timestamp_korean(timestamp):
+    """유닉스 타임스탬프(초) -> 'YYYY년 MM월 DD일 HH시 MM분'"""
+    try:
+        if timestamp and str(timestamp) != 'N/A' and str(timestamp).isdigit():
+            return datetime.fromtimestamp(int(timestamp)).strftime('%Y년 %m월 %d일 %H시 %M분')
+        return 'N/A'
+    except Exception:
+        return 'N/A'
+
+
+def format_duration(seconds):
+    """초 -> 'H:MM:SS' 또는 'M:SS'"""
+    try:
+        if seconds and str(seconds) != 'N/A' and str(seconds).isdigit():
+            seconds = int(seconds)
+            hours = seconds // 3600
+            minutes = (seconds % 3600) // 60
+            secs = seconds % 60
+            if hours > 0:
+                return f"{hours}:{minutes:02d}:{secs:02d}"
+            return f"{minutes}:{secs:02d}"
+        return 'N/A'
+    except Exception:
+        return 'N/A'
+
+
+def metric_text(value, spec=','):
+    """콘솔 출력용 메트릭 값 (수집되지 않은 메트릭은 '-')"""
+    return '-' if value is None else format(value, spec)
+
+
+def safe_int(value, default=0):
+    try:
+        if value and str(value) != 'N/A':
+            return int(value)
+        return default
+    except Exception:
+        return default
+
+
+class HistoryStore:
+    """실행마다 쌓이는 비디오/애널리틱스 스냅샷을 보관하는 SQLite(WAL) 기록 저장소
+
+    videos(비디오별 최신 정보), snapshots(비디오 x 수집 시각), metric_values(스냅샷별 메트릭)
+    세 테이블에 채널/비디오/수집 시각 색인을 두어 "비디오 X의 최근 30일 CTR" 같은 추이 조회가
+    JSON 파일 전체를 읽지 않고 색인 조회로 끝나도록 합니다.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS videos (
+            video_id TEXT PRIMARY KEY,
+            channel_id TEXT,
+            title TEXT,
+            length_seconds INTEGER,
+            time_published INTEGER,
+            updated_at TEXT
+        );
+        CREATE TABLE IF NOT EXISTS snapshots (
+            snapshot_id INTEGER PRIMARY KEY,
+            video_id TEXT NOT NULL REFERENCES videos(video_id),
+            channel_id TEXT,
+            collected_at TEXT NOT NULL,
+            view_count INTEGER,
+            like_count INTEGER,
+            comment_count INTEGER,
+            UNIQUE (video_id, collected_at)
+        );
+        CREATE TABLE IF NOT EXISTS metric_values (
+            snapshot_id INTEGER NOT NULL REFERENCES snapshots(snapshot_id),
+            metric TEXT NOT NULL,
+            value REAL,
+            PRIMARY KEY (snapshot_id, metric)
+        ) WITHOUT ROWID;
+        CREATE INDEX IF NOT EXISTS idx_videos_channel ON videos(channel_id);
+        CREATE INDEX IF NOT EXISTS idx_snapshots_channel_time ON snapshots(channel_id, collected_at);
+        CREATE INDEX IF NOT EXISTS idx_snapshots_time ON snapshots(collected_at);
+    """
+
+    def __init__(self, path='youtube_history.db', batch_size=500):
+        self.path = Path(path)
+        self.batch_size = batch_size
+
+    def connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.executescript(self.SCHEMA)
+        return connection
+
+    def record_run(self, analytics_data, channel_id=None):
+        """이번 실행의 레코드를 batch_size개씩 한 트랜잭션으로 기록 (이미 있는 스냅샷은 건너뜀, 추가된 수 반환)"""
+        inserted = 0
+        connection = self.connect()
+        try:
+            for start in range(0, len(analytics_data), self.batch_size):
+                with connection:
+                    for record in analytics_data[start:start + self.batch_size]:
+                        inserted += self.insert_record(connection, record, channel_id)
+        finally:
+            connection.close()
+        return inserted
+
+    def insert_record(self, connection, record, channel_id):
+        video_id = record.get('video_id')
+        collected_at = record.get('collected_at')
+        if not video_id or not collected_at:
+            return 0
+        
+        video_info = record.get('basic_video_info') or {}
+        connection.execute(
+            """INSERT INTO videos (video_id, channel_id, title, length_seconds, time_published, updated_at)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(video_id) DO UPDATE SET
+                   channel_id = excluded.channel_id, title = excluded.title,
+                   length_seconds = excluded.length_seconds, time_published = excluded.time_published,
+                   updated_at = excluded.updated_at
+               WHERE excluded.updated_at >= videos.updated_at""",
+            (video_id, channel_id, video_info.get('title') or record.get('video_title'), safe_int(video_info.get('lengthSeconds'), None),
+             safe_int(video_info.get('timePublishedSeconds'), None), collected_at)
+        )
+        
+        # 증분 수집으로 재사용된 레코드는 수집 시각이 같으므로 무시됨
+        cursor = connection.execute(
+            """INSERT OR IGNORE INTO snapshots (video_id, channel_id, collected_at, view_count, like_count, comment_count)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            (video_id, channel_id, collected_at, safe_int(video_info.get('public_viewCount'), None),
+             safe_int(video_info.get('public_likeCount'), None), safe_int(video_info.get('public_commentCount'), None))
+        )
+        if not cursor.rowcount:
+            return 0
+        
+        # 두 탭 모두 실패한 비디오는 카운터만 기록 (추이 조회에 가짜 0이 섞이지 않도록)
+        if not record.get('analytics_data'):
+            return 1
+        
+        if record.get('metrics'):
+            metrics = VideoMetrics.from_record(record['metrics'])
+        else:
+            metrics = extract_video_metrics(record.get('analytics_data', {}), video_id)
+        values = {name: getattr(metrics, name) for name in VIDEO_TABLE_METRIC_COLUMNS}
+        values.update({metric: total for metric, total in metrics.totals.items() if metric not in KEY_METRIC_FIELDS})
+        # 응답에 없던 메트릭(None)은 행을 만들지 않음
+        connection.executemany(
+            "INSERT INTO metric_values (snapshot_id, metric, value) VALUES (?, ?, ?)",
+            [(cursor.lastrowid, metric, value) for metric, value in values.items()
+             if isinstance(value, (int, float))]
+        )
+        return 1
+
+    def metric_trend(self, video_id, metric, days=30):
+        """비디오 하나의 메트릭 추이 [(collected_at, value), ...] (수집 시각 순)"""
+        since = (datetime.now() - timedelta(days=days)).isoformat()
+        # 조회는 읽기 전용으로 열어 경로를 잘못 주면 빈 DB를 만드는 대신 오류가 나도록 함
+        connection = sqlite3.connect(self.path.resolve().as_uri() + "?mode=ro", uri=True)
+        try:
+            return connection.execute(
+                """SELECT s.collected_at, m.value
+                   FROM snapshots s JOIN metric_values m ON m.snapshot_id = s.snapshot_id AND m.metric = ?
+                   WHERE s.video_id = ? AND s.collected_at >= ?
+                   ORDER BY s.collected_at""",
+                (metric, video_id, since)
+            ).fetchall()
+        finally:
+            connection.close()
+
+
+class StreamingExcelWriter:
+    """openpyxl write_only 모드로 행을 바로 시트 XML에 기록하는 엑셀 작성기
+
+    셀 서식은 NamedStyle로 워크북에 한 번만 등록하고 모든 셀이 이름으로 공유합니다.
+    append()한 행은 즉시 기록되므로 메모리에는 삽입할 썸네일과 하이퍼링크만 남고,
+    저장 시간은 행 수에 비례합니다.
+    """
+
+    FONT_NAME = "맑은 고딕"
+
+    def __init__(self, filename, sheet_title, headers, column_widths, column_styles, header_color, header_height=None):
+        self.filename = filename
+        self.column_styles = column_styles
+        self.column_count = len(headers)
+        self.row_count = 0
+        self.workbook = openpyxl.Workbook(write_only=True)
+        self.worksheet = self.workbook.create_sheet(sheet_title)
+        self.register_styles(header_color)
+        
+        # 열 너비와 틀 고정은 첫 행을 쓰기 전에 설정해야 함
+        for col_num, width in enumerate(column_widths, 1):
+            self.worksheet.column_dimensions[openpyxl.utils.get_column_letter(col_num)].width = width
+        self.worksheet.freeze_panes = "A2"
+        self.write_row(headers, ['header'] * len(headers), height=header_height)
+
+    def register_styles(self, header_color):
+        thin = Side(style='thin')
+        border = Border(left=thin, right=thin, top=thin, bottom=thin)
+        cell_font = Font(name=self.FONT_NAME, size=10)
+        
+        def cell_style(name, horizontal, number_format='General', font=cell_font):
+            return NamedStyle(
+                name=name, font=font, border=border, number_format=number_format,
+                alignment=Alignment(horizontal=horizontal, vertical="center")
+            )
+        
+        header = cell_style('header', 'center', font=Font(name=self.FONT_NAME, size=11, bold=True, color="FFFFFF"))
+        header.fill = PatternFill(start_color=header_color, end_color=header_color, fill_type="solid")
+        for style in [
+            header,
+            cell_style('text', 'left'),
+            cell_style('center', 'center'),
+            cell_style('number', 'right', '#,##0'),
+            cell_style('decimal', 'right', '0.00'),
+            cell_style('link', 'left', font=Font(name=self.FONT_NAME, size=10, color="0000FF", underline="single"))
+        ]:
+            self.workbook.add_named_style(style)
+
+    def write_row(self, values, styles, height=None, hyperlinks=None):
+        row_idx = self.row_count + 1
+        if height:
+            self.worksheet.row_dimensions[row_idx].height = height
+        
+        cells = []
+        for col_num, (value, style) in enumerate(zip(values, styles), 1):
+            cell = WriteOnlyCell(self.worksheet, value=value)
+            cell.style = style
+            if hyperlinks and col_num in hyperlinks:
+                cell.hyperlink = hyperlinks[col_num]
+            cells.append(cell)
+        self.worksheet.append(cells)
+        
+        self.worksheet.row_dimensions.pop(row_idx, None)  # 이미 기록된 행의 높이는 보관할 필요 없음
+        self.row_count = row_idx
+        return row_idx
+
+    def append(self, values, height=None, hyperlinks=None, image_bytes=None, image_column=1, image_size=None):
+        """데이터 행 하나를 기록 (image_bytes가 있으면 image_column 셀에 image_size로 고정)"""
+        row_idx = self.write_row(values, self.column_styles, height, hyperlinks)
+        if image_bytes:
+            img = Image(BytesIO(image_bytes))
+            img.width, img.height = image_size
+            img.anchor = f"{openpyxl.utils.get_column_letter(image_column)}{row_idx}"
+            self.worksheet.add_image(img)
+        return row_idx
+
+    def close(self):
+        self.worksheet.auto_filter.ref = f"A1:{openpyxl.utils.get_column_letter(self.column_count)}{self.row_count}"
+        self.workbook.save(self.filename)
+        return self.row_count - 1
+
+
+ANALYTICS_EXCEL_HEADERS = [
+    '썸네일', '비디오 ID', '제목', '공개상태', '길이', '게시일',
+    '조회수', '노출수', '클릭률',
+    '시청시간 (분)', '평균 시청시간 (초)',
+    '평균 조회율 (%)'
+]
+ANALYTICS_EXCEL_COLUMN_WIDTHS = [30, 15, 40, 12, 8, 18, 12, 12, 10, 15, 15, 12]
+ANALYTICS_EXCEL_COLUMN_STYLES = [
+    'center', 'center', 'text', 'center', 'center', 'text',
+    'number', 'number', 'decimal', 'number', 'number', 'decimal'
+]
+ANALYTICS_THUMBNAIL_SIZE = (200, 150)
+
+VIDEOS_EXCEL_HEADERS = [
+    '비디오 ID', '제목', '공개 상태', '길이', '생성일', '게시일',
+    '조회수', '좋아요', '댓글수', '시청 시간 (분)', '구독자 증가',
+    '상태', '비디오 URL', '썸네일', '설명'
+]
+VIDEOS_EXCEL_COLUMN_WIDTHS = [15, 50, 12, 10, 22, 22, 12, 10, 10, 15, 12, 12, 50, 25, 60]
+VIDEOS_EXCEL_COLUMN_STYLES = [
+    'center', 'text', 'center', 'text', 'text', 'text',
+    'number', 'number', 'number', 'number', 'number',
+    'center', 'link', 'text', 'text'
+]
+VIDEOS_THUMBNAIL_SIZE = (120, 90)
+
+
+def join_post_data_entries(entries):
+    """Fetch.requestPaused의 request.postDataEntries(base64 조각 목록)를 POST 본문 문자열로 합침"""
+    body = b''.join(base64.b64decode(entry['bytes']) for entry in entries or [] if entry.get('bytes'))
+    return body.decode('utf-8', errors='replace')
+
+
+# 프로필이 Google 계정에 로그인되어 있을 때 .google.com에 있는 인증 쿠키
+GOOGLE_AUTH_COOKIES = ('SID', 'SAPISID', '__Secure-3PAPISID')
+
+# Fetch 캡처 모드에서 브라우저가 일시 정지시켜 전달할 요청 (응답 단계에서 본문까지 확보)
+FETCH_CAPTURE_PATTERNS = [
+    {'urlPattern': '*youtubei/v1/creator/list_creator_videos*', 'requestStage': 'Response'},
+    {'urlPattern': '*youtubei/v1/yta_web/*', 'requestStage': 'Response'},
+]
+
+
+# 가벼운 캡처 모드에서 차단할 리소스 (이미지/영상/폰트/추적 스크립트 - 애널리틱스 요청에는 불필요)
+LEAN_CAPTURE_BLOCKED_URLS = [
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.svg', '*.ico',
+    '*.woff', '*.woff2', '*.ttf', '*.otf',
+    '*.mp4', '*.webm', '*.m4a',
+    '*i.ytimg.com*', '*yt3.ggpht.com*', '*googlevideo.com*', '*fonts.gstatic.com*',
+    '*doubleclick.net*', '*google-analytics.com*', '*googletagmanager.com*',
+    '*play.google.com/log*', '*youtube.com/api/stats*', '*youtube.com/ptracking*',
+]
+LEAN_CAPTURE_BLOCKED_RESOURCE_TYPES = ['Image', 'Media', 'Font']
+
 
 class YouTubeStudioMonitor:
-    def __init__(self, chrome_port=9222):
+    def __init__(self, chrome_port=9222, max_workers=8, replay_backend='threads',
+                 requests_per_second=5.0, burst=10, checkpoint_dir='collection_checkpoint',
+                 incremental=False, recent_days=7, incremental_store_path='incremental_store.json',
+                 capture_mode='network', lean_capture=False, headless=False,
+                 template_store_path='request_templates.json', raw_bodies='keep', raw_dir='raw_responses',
+                 thumbnail_cache_dir='thumbnail_cache', thumbnail_quality=80, stream_excel=False,
+                 parquet=False, parquet_dataset_dir=None, history_db='youtube_history.db'):
         self.chrome_port = chrome_port
-        self.ws = None
+        self.template_store = RequestTemplateStore(template_store_path)  # 다음 실행에서 브라우저 이동 없이 쓸 요청 템플릿
+        self.compiled_payloads = {}  # postData 문자열 -> CompiledPayload (캡처된 요청마다 한 번만 컴파일)
+        self.headless = headless  # 로그인된 프로필이 있으면 헤드리스 Chrome으로 무인 실행
+        self.headless_active = False  # 실제로 헤드리스로 실행되었는지
+        self.capture_mode = capture_mode  # 'network' (Network 도메인 전체) 또는 'fetch' (youtubei 요청만)
+        self.lean_capture = lean_capture  # 애널리틱스 탭 이동 중 이미지/폰트/추적 리소스 차단
+        self.resource_blocking = False
+        # 캡처된 요청 처리(템플릿 저장, 응답 본문 파싱)는 CDP 디스패치 스레드 밖에서 도착 순서대로 실행
+        self.capture_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='capture-dispatch')
+        self.cdp = None  # YouTube Studio 탭의 CDPSession
+        self.max_workers = max(1, max_workers)  # 애널리틱스 병렬 수집 워커 수 (asyncio 백엔드에서는 동시 요청 수)
+        
+        # 복제 요청 백엔드: 'threads' (requests + 스레드 풀) 또는 'asyncio' (aiohttp 이벤트 루프)
+        if replay_backend == 'asyncio' and not AIOHTTP_AVAILABLE:
+            print("⚠️ aiohttp가 설치되어 있지 않아 threads 백엔드를 사용합니다. (pip install aiohttp)")
+            replay_backend = 'threads'
+        self.replay_backend = replay_backend
+        
+        # 모든 youtubei 요청이 공유하는 속도 제한기 (고정 sleep 대신 응답 상태에 따라 자동 조절)
+        self.rate_limiter = AdaptiveRateLimiter(rate=requests_per_second, burst=burst)
+        
+        # 모든 복제 요청이 공유하는 HTTP 클라이언트
+        if self.replay_backend == 'asyncio':
+            self.replay_client = AsyncReplayClient(max_connections=self.max_workers * 2, rate_limiter=self.rate_limiter)
+        else:
+            self.replay_client = ReplayClient(pool_size=self.max_workers * 2, rate_limiter=self.rate_limiter)
         self.captured_request = None  # 캡처된 원본 요청 저장
         self.captured_analytics_request = None  # 캡처된 애널리틱스 요청 저장 (get_screen)
         self.captured_analytics_cards_request = None  # 캡처된 get_cards 요청 저장
+        self.captured_reach_viewers_request = None  # 첫 번째 비디오에서 캡처된 reach_viewers(get_screen) 요청
+        self.captured_interest_viewers_request = None  # 첫 번째 비디오에서 캡처된 interest_viewers(get_cards) 요청
         self.channel_id = None
         self.collected_data = []
+        self.collected_data_by_id = {}  # videoId -> 기본 비디오 정보
         self.video_analytics_data = []  # 비디오 상세 정보 저장
+        self.completed_video_ids = set()  # 애널리틱스 수집이 끝난 비디오 ID
+        self.video_retry_counts = {}  # videoId -> 복제 요청 재시도 횟수
+        self.results_lock = threading.Lock()  # video_analytics_data 병합 시 락
+        self.checkpoint = CollectionCheckpoint(checkpoint_dir)  # 비디오 단위 진행 상황 디스크 기록
+        
+        # 증분 수집: 바뀌었거나 최근 게시된 비디오만 다시 수집
+        self.incremental = incremental
+        self.recent_days = recent_days
+        self.incremental_store = IncrementalStore(incremental_store_path) if incremental else None
+        
+        # 응답 본문 보관 방식: 'keep' (레코드에 그대로), 'spill' (비디오별 gzip 파일), 'drop' (버림)
+        # keep이 아니면 메모리/체크포인트에는 도착 즉시 추출한 메트릭만 남는 작은 레코드가 쌓임
+        self.raw_bodies = raw_bodies
+        self.raw_dir = Path(raw_dir)
+        self.series_store = MetricSeriesStore()  # 비디오별 메트릭 시계열 (열 단위 배열)
+        self.stream_excel = stream_excel  # 비디오 결과가 확정될 때마다 애널리틱스 엑셀 행을 바로 기록
+        
+        # Parquet 내보내기: 실행마다 파일 하나, 또는 채널/수집 날짜로 분할된 데이터셋 폴더에 추가
+        self.parquet = parquet or bool(parquet_dataset_dir)
+        self.parquet_dataset_dir = parquet_dataset_dir
+        self.history_store = HistoryStore(history_db) if history_db else None  # 실행마다 스냅샷을 쌓는 SQLite 기록
+        self.analytics_excel_stream = None  # 스트리밍 중인 StreamingExcelWriter
+        self.streamed_video_ids = set()
+        self.excel_stream_lock = threading.Lock()
+        self.thumbnail_cache = ThumbnailCache(thumbnail_cache_dir, max_workers=self.max_workers, quality=thumbnail_quality)  # 엑셀 썸네일 디스크 캐시
         self.monitoring = False
+        self.collection_done = threading.Event()  # 마지막 비디오 결과 저장 시 설정됨
+        self.last_progress_at = time.monotonic()  # 진행이 마지막으로 확인된 시각 (유휴 타임아웃 기준)
         self.chrome_process = None
         self.pending_requests = {}  # 대기 중인 요청들 저장 (request_id -> request_data)
         self.collection_phase = "videos_list"  # "videos_list" → "video_analytics"
@@ -189,14 +1374,30 @@ class YouTubeStudioMonitor:
         return profile_dir
     
     def is_profile_logged_in(self, profile_path):
-        """프로필이 Google 계정에 로그인되어 있는지 확인"""
-        try:
-            prefs_file = os.path.join(profile_path, "Default", "Preferences")
-            if os.path.exists(prefs_file) and os.path.getsize(prefs_file) > 1000:
-                return True
-            return False
-        except:
-            return False
+        """프로필에 만료되지 않은 Google 로그인 쿠키(SID/SAPISID)가 있는지 확인"""
+        for cookies_file in (os.path.join(profile_path, "Default", "Network", "Cookies"),
+                             os.path.join(profile_path, "Default", "Cookies")):
+            if not os.path.exists(cookies_file):
+                continue
+            try:
+                # 쿠키 값은 암호화되어 있지만 이름/도메인/만료 시각은 평문 (Chrome 실행 중에도 읽도록 immutable)
+                connection = sqlite3.connect(Path(cookies_file).resolve().as_uri() + "?mode=ro&immutable=1", uri=True)
+                try:
+                    now_chrome = int((time.time() + 11644473600) * 1_000_000)  # 1601-01-01 기준 마이크로초
+                    row = connection.execute(
+                        """SELECT 1 FROM cookies
+                           WHERE host_key LIKE '%google.com' AND name IN (?, ?, ?)
+                             AND (expires_utc = 0 OR expires_utc > ?)
+                           LIMIT 1""",
+                        (*GOOGLE_AUTH_COOKIES, now_chrome)
+                    ).fetchone()
+                finally:
+                    connection.close()
+                if row:
+                    return True
+            except Exception as e:
+                print(f"⚠️ 프로필 쿠키 확인 실패: {e}")
+        return False
     
     def start_chrome_debug_mode(self):
         """크롬을 디버그 모드로 실행 (YouTube Studio로 바로 이동하지 않음)"""
@@ -216,7 +1417,6 @@ class YouTubeStudioMonitor:
         else:
             print("새 프로그램 전용 프로필을 생성합니다.")
         
-        # YouTube Studio로 바로 이동하지 않고 Google 홈페이지로 시작
         chrome_args = [
             chrome_path,
             f"--remote-debugging-port={self.chrome_port}",
@@ -226,9 +1426,25 @@ class YouTubeStudioMonitor:
             "--no-default-browser-check",
             "--disable-web-security",
             "--disable-features=VizDisplayCompositor",
-            "https://www.google.com"  # YouTube Studio 대신 Google 홈페이지로 시작
         ]
         
+        if self.headless and is_logged_in:
+            # 로그인 세션이 있는 프로필로 화면 없이 YouTube Studio에 바로 접속
+            print("🤖 헤드리스 모드로 실행합니다 (로그인된 프로필 재사용).")
+            chrome_args += [
+                "--headless=new",
+                "--window-size=1366,900",
+                "--mute-audio",
+                "https://studio.youtube.com"
+            ]
+            self.headless_active = True
+        else:
+            if self.headless:
+                print("⚠️ 로그인된 프로필이 없어 헤드리스 모드를 사용할 수 없습니다. 일반 모드로 실행합니다.")
+                print("   💡 한 번 일반 모드로 로그인하면 다음 실행부터 헤드리스로 동작합니다.")
+            # YouTube Studio로 바로 이동하지 않고 Google 홈페이지로 시작
+            chrome_args.append("https://www.google.com")
+        
         try:
             print(f"크롬을 디버그 모드로 실행하는 중... (포트: {self.chrome_port})")
             self.chrome_process = subprocess.Popen(
@@ -300,32 +1516,9 @@ class YouTubeStudioMonitor:
             # 비디오 업로드 페이지로 이동
             videos_url = f"https://studio.youtube.com/channel/{self.channel_id}/videos/upload"
             
-            # 활성 탭에서 URL 변경
-            response = requests.get(f'http://localhost:{self.chrome_port}/json')
-            tabs = response.json()
-            
-            studio_tab = None
-            for tab in tabs:
-                if 'studio.youtube.com' in tab.get('url', ''):
-                    studio_tab = tab
-                    break
-            
-            if studio_tab:
-                # JavaScript로 페이지 이동
-                ws_url = studio_tab['webSocketDebuggerUrl']
-                ws = websocket.create_connection(ws_url)
-                
-                ws.send(json.dumps({
-                    "id": 1,
-                    "method": "Runtime.evaluate",
-                    "params": {
-                        "expression": f"window.location.href = '{videos_url}'"
-                    }
-                }))
-                
-                ws.close()
+            # 연결된 CDP 세션으로 이동하고 페이지 로딩 완료 이벤트까지 대기
+            if self.navigate_and_wait(videos_url):
                 print(f"✅ 비디오 목록 페이지로 이동: {videos_url}")
-                time.sleep(5)  # 페이지 로딩 대기
                 return True
             
             return False
@@ -344,43 +1537,69 @@ class YouTubeStudioMonitor:
             # 비디오 애널리틱스 페이지로 이동
             analytics_url = f"https://studio.youtube.com/video/{video_id}/analytics/tab-reach_viewers/period-default"
             
-            # 활성 탭에서 URL 변경
-            response = requests.get(f'http://localhost:{self.chrome_port}/json')
-            tabs = response.json()
-            
-            studio_tab = None
-            for tab in tabs:
-                if 'studio.youtube.com' in tab.get('url', ''):
-                    studio_tab = tab
-                    break
-            
-            if studio_tab:
-                # JavaScript로 페이지 이동
-                ws_url = studio_tab['webSocketDebuggerUrl']
-                ws = websocket.create_connection(ws_url)
-                
-                ws.send(json.dumps({
-                    "id": 1,
-                    "method": "Runtime.evaluate",
-                    "params": {
-                        "expression": f"window.location.href = '{analytics_url}'"
-                    }
-                }))
-                
-                ws.close()
+            # get_screen 요청이 시작되면 데이터가 준비된 것으로 보고 바로 반환
+            if self.navigate_and_wait(analytics_url, ready_when=self.is_get_screen_api):
                 print(f"✅ 비디오 애널리틱스 페이지로 이동: {analytics_url}")
-                time.sleep(8)  # 페이지 로딩 대기 (애널리틱스는 더 오래 걸림)
                 return True
             
-            return False
+            return False
+            
+        except Exception as e:
+            print(f"❌ 비디오 애널리틱스 페이지 이동 오류: {e}")
+            return False
+
+    def navigate_and_wait(self, url, ready_when=None, timeout=30):
+        """연결된 CDP 세션에서 Page.navigate로 이동하고 준비될 때까지 대기
+
+        ready_when(request_url)이 주어지면 해당 요청이 시작되는 즉시, 아니면 페이지 load 이벤트
+        (또는 메인 프레임 로딩 종료) 시점에 반환합니다. timeout초 안에 준비되지 않으면 False.
+        """
+        if not self.cdp or not self.cdp.connected:
+            print("❌ CDP 세션이 연결되어 있지 않습니다.")
+            return False
+        
+        ready = threading.Event()
+        main_frame = {}
+        
+        def on_event(message):
+            method = message.get('method')
+            params = message.get('params', {})
+            if ready_when:
+                if method in ('Network.requestWillBeSent', 'Fetch.requestPaused') and ready_when(params.get('request', {}).get('url', '')):
+                    ready.set()
+            elif method == 'Page.loadEventFired':
+                ready.set()
+            elif method == 'Page.frameStoppedLoading' and params.get('frameId') == main_frame.get('id'):
+                ready.set()
+        
+        self.cdp.subscribe(None, on_event)
+        try:
+            started_at = time.time()
+            result = self.cdp.send("Page.navigate", {"url": url})
+            if result.get('errorText'):
+                print(f"❌ 페이지 이동 실패: {result['errorText']}")
+                return False
+            main_frame['id'] = result.get('frameId')
+            
+            if not ready.wait(timeout):
+                print(f"⏰ 페이지 준비 대기 시간 초과 ({timeout}초): {url}")
+                return False
             
-        except Exception as e:
-            print(f"❌ 비디오 애널리틱스 페이지 이동 오류: {e}")
-            return False
+            print(f"   ⚡ 페이지 준비 완료 ({time.time() - started_at:.1f}초)")
+            self.mark_progress()
+            return True
+        finally:
+            self.cdp.unsubscribe(None, on_event)
 
     def connect_to_chrome(self):
         """크롬 브라우저에 CDP로 연결"""
         try:
+            if self.headless and self.is_chrome_debug_running():
+                # 이미 떠 있는 Chrome은 헤드리스로 바꿀 수 없고, 무인 실행에서는 엔터 입력을 기다릴 수 없음
+                print(f"❌ 포트 {self.chrome_port}에 디버그 Chrome이 이미 실행 중이라 --headless로 실행할 수 없습니다.")
+                print("   💡 열려 있는 Chrome을 종료한 뒤 다시 실행하거나 --headless 없이 실행해주세요.")
+                return False
+            
             if not self.is_chrome_debug_running():
                 print("크롬이 디버그 모드로 실행되지 않았습니다. 자동으로 실행합니다...")
                 
@@ -390,29 +1609,38 @@ class YouTubeStudioMonitor:
                 print("✅ Chrome이 시작되었습니다.")
                 time.sleep(3)  # 짧은 로딩 대기
             
-            print("📋 계정 설정 안내:")
-            print("   1. 열린 Chrome 브라우저에서 원하는 Google 계정으로 로그인하세요")
-            print("   2. YouTube Studio (https://studio.youtube.com) 페이지로 이동하세요")
-            print("   3. 수집할 채널을 선택하고 비디오 목록 페이지까지 이동하세요")
-            print("   4. 준비가 완료되면 이 터미널에서 엔터를 누르세요")
-            
-            # 사용자 입력 대기
-            input("\n⏳ 로그인 및 채널 선택 완료 후 엔터를 누르세요...")
+            if self.headless_active:
+                # 헤드리스: 사용자 입력 없이 Studio가 채널 페이지로 리다이렉트될 때까지 대기
+                print("🤖 헤드리스 모드: YouTube Studio 로딩을 기다립니다...")
+                max_attempts = 15
+            else:
+                print("📋 계정 설정 안내:")
+                print("   1. 열린 Chrome 브라우저에서 원하는 Google 계정으로 로그인하세요")
+                print("   2. YouTube Studio (https://studio.youtube.com) 페이지로 이동하세요")
+                print("   3. 수집할 채널을 선택하고 비디오 목록 페이지까지 이동하세요")
+                print("   4. 준비가 완료되면 이 터미널에서 엔터를 누르세요")
+                
+                # 사용자 입력 대기
+                input("\n⏳ 로그인 및 채널 선택 완료 후 엔터를 누르세요...")
+                max_attempts = 5
             
             print("\n🔍 YouTube Studio 탭을 찾는 중...")
             
-            # YouTube Studio 탭 찾기 시도 (여러 번)
+            # YouTube Studio 탭 찾기 시도 (여러 번, 헤드리스는 채널 ID가 보일 때까지)
             target_tab = None
-            for attempt in range(5):
+            for attempt in range(max_attempts):
                 target_tab = self.find_youtube_studio_tab()
-                if target_tab:
+                if target_tab and (not self.headless_active or self.extract_channel_id_from_url(target_tab.get('url', ''))):
                     break
-                print(f"   시도 {attempt + 1}/5: YouTube Studio 탭을 찾지 못했습니다. 다시 시도...")
+                print(f"   시도 {attempt + 1}/{max_attempts}: YouTube Studio 탭을 찾지 못했습니다. 다시 시도...")
                 time.sleep(2)
             
             if not target_tab:
                 print("❌ YouTube Studio 탭을 찾을 수 없습니다.")
-                print("   💡 YouTube Studio (https://studio.youtube.com)로 이동했는지 확인해주세요.")
+                if self.headless_active:
+                    print("   💡 로그인 세션이 만료되었을 수 있습니다. --headless 없이 실행해 다시 로그인해주세요.")
+                else:
+                    print("   💡 YouTube Studio (https://studio.youtube.com)로 이동했는지 확인해주세요.")
                 return False
             
             # URL에서 채널 ID 추출
@@ -421,28 +1649,30 @@ class YouTubeStudioMonitor:
             
             if self.channel_id:
                 print(f"✅ 채널 ID 추출됨: {self.channel_id}")
+            elif self.headless_active:
+                # 헤드리스에서는 채널 페이지로 직접 이동할 방법이 없으므로 유휴 타임아웃까지 기다리지 않고 중단
+                print(f"❌ 헤드리스 모드에서 채널 ID를 확인하지 못했습니다. (Studio 탭: {studio_url})")
+                print("   💡 로그인 세션이 만료되었거나 채널 선택이 필요할 수 있습니다. --headless 없이 실행해주세요.")
+                return False
             else:
                 print("⚠️ 채널 ID를 추출할 수 없습니다.")
                 print("   💡 YouTube Studio의 채널 메인 페이지로 이동해주세요.")
             
-            # WebSocket 연결
+            # CDP 세션 연결 (WebSocket 수신은 세션이 전담)
             ws_url = target_tab['webSocketDebuggerUrl']
-            self.ws = websocket.create_connection(ws_url, timeout=10)
+            self.cdp = CDPSession(ws_url)
             
-            # WebSocket 타임아웃 설정
-            self.ws.settimeout(1.0)  # 1초 타임아웃
-            
-            # Network 도메인 활성화
-            self.ws.send(json.dumps({
-                "id": 1,
-                "method": "Network.enable"
-            }))
+            # 캡처 도메인 활성화
+            if self.capture_mode == 'fetch':
+                # 브라우저 쪽에서 youtubei 요청만 걸러서 전달 (이미지/폰트/로그 등 이벤트가 오지 않음)
+                self.cdp.send("Fetch.enable", {"patterns": FETCH_CAPTURE_PATTERNS})
+                print("🎯 Fetch 캡처 모드: youtubei 요청만 수신합니다.")
+            else:
+                self.cdp.send("Network.enable")
             
-            # Runtime 도메인 활성화
-            self.ws.send(json.dumps({
-                "id": 2,
-                "method": "Runtime.enable"
-            }))
+            # Page 도메인은 이동 완료 이벤트용 (Runtime 이벤트는 사용하지 않으므로 활성화하지 않음)
+            self.cdp.send("Page.enable")
+            self.apply_user_session_id()
             
             print("✅ 크롬 브라우저에 성공적으로 연결되었습니다.")
             return True
@@ -470,52 +1700,30 @@ class YouTubeStudioMonitor:
     def fetch_cookies_for_url(self, url):
         """특정 URL에 대한 쿠키를 Chrome에서 가져오기"""
         try:
-            if not self.ws:
+            if not self.cdp:
                 return None
             
             print(f"🍪 쿠키 정보 가져오는 중... (URL: {url})")
             
-            # Network.getCookies 요청
-            self.ws.send(json.dumps({
-                "id": int(time.time()),
-                "method": "Network.getCookies",
-                "params": {"urls": [url]}
-            }))
+            # Network.getCookies 요청 (응답은 명령 ID로 매칭됨)
+            cookies = self.cdp.send("Network.getCookies", {"urls": [url]}, timeout=5).get('cookies', [])
+            print(f"✅ 쿠키 획득: {len(cookies)}개")
             
-            # 응답 대기
-            timeout = 5
-            start_time = time.time()
+            # Cookie 헤더 문자열 생성
+            cookie_pairs = []
+            for cookie in cookies:
+                name = cookie.get('name', '')
+                value = cookie.get('value', '')
+                if name and value:
+                    cookie_pairs.append(f"{name}={value}")
             
-            while time.time() - start_time < timeout:
-                try:
-                    message = self.ws.recv()
-                    data = json.loads(message)
-                    
-                    if 'result' in data and 'cookies' in data['result']:
-                        cookies = data['result']['cookies']
-                        print(f"✅ 쿠키 획득: {len(cookies)}개")
-                        
-                        # Cookie 헤더 문자열 생성
-                        cookie_pairs = []
-                        for cookie in cookies:
-                            name = cookie.get('name', '')
-                            value = cookie.get('value', '')
-                            if name and value:
-                                cookie_pairs.append(f"{name}={value}")
-                        
-                        cookie_header = '; '.join(cookie_pairs)
-                        print(f"🍪 Cookie 헤더 생성: {len(cookie_header)} bytes")
-                        return cookie_header
-                        
-                except websocket.WebSocketTimeoutException:
-                    continue
-                except Exception as e:
-                    print(f"쿠키 수신 오류: {e}")
-                    break
+            cookie_header = '; '.join(cookie_pairs)
+            print(f"🍪 Cookie 헤더 생성: {len(cookie_header)} bytes")
+            return cookie_header
             
+        except TimeoutError:
             print("⏰ 쿠키 요청 시간 초과")
             return None
-            
         except Exception as e:
             print(f"쿠키 요청 오류: {e}")
             return None
@@ -552,8 +1760,12 @@ class YouTubeStudioMonitor:
             
             # POST 데이터가 있다고 표시되어 있는데 실제로는 없다면
             if captured['hasPostData'] and not captured['postData'] and request_id:
-                print("⚠️ POST 데이터가 있다고 하는데 캡처되지 않음. 별도로 가져오기 시도...")
-                captured['needs_post_data_fetch'] = True
+                if self.capture_mode == 'fetch':
+                    # Network.getRequestPostData는 Network 도메인이 켜져 있어야만 동작
+                    print("❌ POST 데이터가 Fetch 이벤트에 포함되지 않았습니다. (--capture-mode network로 다시 시도하세요)")
+                else:
+                    print("⚠️ POST 데이터가 있다고 하는데 캡처되지 않음. 별도로 가져오기 시도...")
+                    captured['needs_post_data_fetch'] = True
             
             return captured
             
@@ -564,41 +1776,20 @@ class YouTubeStudioMonitor:
     def fetch_post_data(self, request_id):
         """별도로 POST 데이터 가져오기"""
         try:
-            if not self.ws or not request_id:
+            if not self.cdp or not request_id:
                 return None
             
             print(f"📡 POST 데이터 별도 요청 중... (Request ID: {request_id})")
             
-            # POST 데이터 요청
-            self.ws.send(json.dumps({
-                "id": int(time.time()),
-                "method": "Network.getRequestPostData",
-                "params": {"requestId": request_id}
-            }))
-            
-            # 응답 대기 (간단한 동기 방식)
-            timeout = 5
-            start_time = time.time()
-            
-            while time.time() - start_time < timeout:
-                try:
-                    message = self.ws.recv()
-                    data = json.loads(message)
-                    
-                    if 'result' in data and 'postData' in data['result']:
-                        post_data = data['result']['postData']
-                        print(f"✅ POST 데이터 획득: {len(post_data)} 바이트")
-                        return post_data
-                        
-                except websocket.WebSocketTimeoutException:
-                    continue
-                except Exception as e:
-                    print(f"POST 데이터 수신 오류: {e}")
-                    break
+            # POST 데이터 요청 (응답은 명령 ID로 매칭됨)
+            post_data = self.cdp.send("Network.getRequestPostData", {"requestId": request_id}, timeout=5).get('postData')
+            if post_data is not None:
+                print(f"✅ POST 데이터 획득: {len(post_data)} 바이트")
+            return post_data
             
+        except TimeoutError:
             print("⏰ POST 데이터 요청 시간 초과")
             return None
-            
         except Exception as e:
             print(f"POST 데이터 요청 오류: {e}")
             return None
@@ -611,89 +1802,202 @@ class YouTubeStudioMonitor:
             
             # 요청이 보내질 때 - 일단 저장만 해둠
             if method == 'Network.requestWillBeSent':
-                request = params['request']
-                url = request['url']
                 request_id = params.get('requestId')
-                
-                # 비디오 목록 API 요청 감지
-                if self.is_video_list_api(url) and self.collection_phase == "videos_list":
-                    print(f"🔍 비디오 목록 API 요청 감지! (대기 중...)")
-                    print(f"   URL: {url}")
-                    print(f"   Request ID: {request_id}")
-                    
-                    # 대기 중인 요청으로 저장 (아직 복제하지 않음)
-                    self.pending_requests[request_id] = {
-                        'request': request,
-                        'request_id': request_id,
-                        'timestamp': datetime.now().isoformat(),
-                        'type': 'videos_list'
-                    }
-                    print(f"   ⏳ 응답 대기 중... (성공하면 복제할 예정)")
-                
-                # 비디오 애널리틱스 API 요청 감지
-                elif self.is_video_analytics_api(url) and self.collection_phase == "video_analytics":
-                    if self.is_get_screen_api(url):
-                        api_type = "get_screen"
-                        print(f"🎯 get_screen API 요청 감지! (대기 중...)")
-                    elif self.is_get_cards_api(url):
-                        api_type = "get_cards"
-                        print(f"🎯 get_cards API 요청 감지! (대기 중...)")
-                    else:
-                        api_type = "unknown"
-                        print(f"🎯 알 수 없는 애널리틱스 API 요청 감지! (대기 중...)")
-                    
-                    print(f"   URL: {url}")
-                    print(f"   Request ID: {request_id}")
-                    
-                    # 대기 중인 요청으로 저장
-                    self.pending_requests[request_id] = {
-                        'request': request,
-                        'request_id': request_id,
-                        'timestamp': datetime.now().isoformat(),
-                        'type': 'video_analytics',
-                        'api_type': api_type
-                    }
+                pending_request = self.build_pending_request(params['request'], request_id)
+                if pending_request:
+                    self.pending_requests[request_id] = pending_request
                     print(f"   ⏳ 응답 대기 중... (성공하면 복제할 예정)")
             
-            # 응답을 받았을 때 - 성공한 경우에만 복제
+            # Fetch 캡처 모드 - 패턴에 맞는 youtubei 요청만 응답 단계에서 일시 정지되어 전달됨
+            elif method == 'Fetch.requestPaused':
+                self.handle_paused_request(params)
+            
+            # 응답 헤더를 받았을 때 - 성공 여부만 기록하고 본문 수신 완료를 기다림
             elif method == 'Network.responseReceived':
                 request_id = params.get('requestId')
                 response = params.get('response', {})
                 status = response.get('status', 0)
-                url = response.get('url', '')
                 
-                # 대기 중인 요청이고 성공한 경우
                 if request_id in self.pending_requests:
-                    pending_request = self.pending_requests[request_id]
-                    request_type = pending_request.get('type')
-                    
                     if status == 200:
-                        if request_type == 'videos_list' and self.is_video_list_api(url):
-                            print(f"✅ 비디오 목록 API 응답 성공! (상태코드: {status})")
-                            self.handle_successful_videos_list_request(pending_request)
-                            
-                        elif request_type == 'video_analytics' and self.is_video_analytics_api(url):
-                            api_type = pending_request.get('api_type', 'unknown')
-                            if api_type == 'get_screen':
-                                print(f"✅ get_screen API 응답 성공! (상태코드: {status})")
-                                self.handle_successful_get_screen_request(pending_request)
-                            elif api_type == 'get_cards':
-                                print(f"✅ get_cards API 응답 성공! (상태코드: {status})")
-                                self.handle_successful_get_cards_request(pending_request)
-                            else:
-                                print(f"✅ 알 수 없는 애널리틱스 API 응답 성공! (상태코드: {status})")
-                                print(f"   URL: {url}")
-                            self.handle_successful_analytics_request(pending_request)
+                        self.pending_requests[request_id]['status'] = status
+                        self.pending_requests[request_id]['response_url'] = response.get('url', '')
                     else:
                         print(f"❌ API 응답 실패! (상태코드: {status})")
                         print(f"   실패한 요청은 복제하지 않습니다.")
-                    
-                    # 처리 완료된 요청은 제거
+                        del self.pending_requests[request_id]
+            
+            # 응답 본문 수신 완료 - 브라우저가 받은 본문을 그대로 가져와서 사용
+            elif method == 'Network.loadingFinished':
+                request_id = params.get('requestId')
+                pending_request = self.pending_requests.get(request_id)
+                
+                if pending_request and pending_request.get('status') == 200:
+                    del self.pending_requests[request_id]
+                    pending_request['response_body'] = self.fetch_response_body(request_id)
+                    self.capture_executor.submit(self.dispatch_successful_request, pending_request)
+            
+            elif method == 'Network.loadingFailed':
+                request_id = params.get('requestId')
+                if request_id in self.pending_requests:
+                    print(f"❌ API 요청 실패: {params.get('errorText', '알 수 없는 오류')}")
                     del self.pending_requests[request_id]
                     
         except Exception as e:
             print(f"네트워크 요청 처리 오류: {e}")
     
+    def build_pending_request(self, request, request_id):
+        """현재 수집 단계에서 필요한 API 요청이면 대기 요청 정보를 만들어 반환 (아니면 None)"""
+        url = request['url']
+        
+        # 비디오 목록 API 요청 감지
+        if self.is_video_list_api(url) and self.collection_phase == "videos_list":
+            print(f"🔍 비디오 목록 API 요청 감지! (대기 중...)")
+            print(f"   URL: {url}")
+            print(f"   Request ID: {request_id}")
+            
+            self.mark_progress()
+            return {
+                'request': request,
+                'request_id': request_id,
+                'timestamp': datetime.now().isoformat(),
+                'type': 'videos_list'
+            }
+        
+        # 비디오 애널리틱스 API 요청 감지
+        if self.is_video_analytics_api(url) and self.collection_phase == "video_analytics":
+            if self.is_get_screen_api(url):
+                api_type = "get_screen"
+                print(f"🎯 get_screen API 요청 감지! (대기 중...)")
+            elif self.is_get_cards_api(url):
+                api_type = "get_cards"
+                print(f"🎯 get_cards API 요청 감지! (대기 중...)")
+            else:
+                api_type = "unknown"
+                print(f"🎯 알 수 없는 애널리틱스 API 요청 감지! (대기 중...)")
+            
+            print(f"   URL: {url}")
+            print(f"   Request ID: {request_id}")
+            
+            self.mark_progress()
+            return {
+                'request': request,
+                'request_id': request_id,
+                'timestamp': datetime.now().isoformat(),
+                'type': 'video_analytics',
+                'api_type': api_type
+            }
+        
+        return None
+    
+    def handle_paused_request(self, params):
+        """Fetch.requestPaused 처리 - 응답 본문을 읽고 즉시 요청을 계속 진행시킨 뒤 처리기로 전달"""
+        fetch_request_id = params.get('requestId')
+        status = params.get('responseStatusCode')
+        request = params['request']
+        if request.get('hasPostData') and not request.get('postData'):
+            # Fetch 모드는 Network 도메인이 꺼져 있으므로 이벤트에 포함된 postDataEntries로 본문 복원
+            request = dict(request, postData=join_post_data_entries(request.get('postDataEntries')))
+        pending_request = self.build_pending_request(request, params.get('networkId') or fetch_request_id)
+        response_body = None
+        
+        try:
+            if pending_request and status == 200:
+                response_body = self.fetch_response_body(fetch_request_id, command="Fetch.getResponseBody")
+        finally:
+            # 페이지가 멈추지 않도록 어떤 경우에도 요청은 그대로 계속 진행
+            self.continue_paused_request(fetch_request_id)
+        
+        if not pending_request:
+            return
+        
+        if status != 200:
+            print(f"❌ API 응답 실패! (상태코드: {status})")
+            print(f"   실패한 요청은 복제하지 않습니다.")
+            return
+        
+        pending_request['status'] = status
+        pending_request['response_url'] = request['url']
+        pending_request['response_body'] = response_body
+        self.capture_executor.submit(self.dispatch_successful_request, pending_request)
+    
+    def set_resource_blocking(self, enabled):
+        """가벼운 캡처 모드의 리소스 차단 켜기/끄기
+
+        network 모드는 Network.setBlockedURLs, fetch 모드는 요청 단계 패턴을 추가해 Fetch.failRequest로 차단합니다.
+        """
+        if not self.lean_capture or not self.cdp or enabled == self.resource_blocking:
+            return
+        
+        try:
+            if self.capture_mode == 'fetch':
+                patterns = list(FETCH_CAPTURE_PATTERNS)
+                if enabled:
+                    patterns += [{'resourceType': resource_type, 'requestStage': 'Request'}
+                                 for resource_type in LEAN_CAPTURE_BLOCKED_RESOURCE_TYPES]
+                    patterns += [{'urlPattern': url_pattern, 'requestStage': 'Request'}
+                                 for url_pattern in LEAN_CAPTURE_BLOCKED_URLS]
+                self.cdp.send("Fetch.enable", {"patterns": patterns})
+            else:
+                self.cdp.send("Network.setBlockedURLs", {"urls": LEAN_CAPTURE_BLOCKED_URLS if enabled else []})
+            
+            self.resource_blocking = enabled
+            print(f"🪶 가벼운 캡처: 리소스 차단 {'켜짐' if enabled else '해제'}")
+        except Exception as e:
+            print(f"⚠️ 리소스 차단 설정 실패: {e}")
+    
+    def continue_paused_request(self, fetch_request_id):
+        """Fetch 도메인에서 일시 정지된 요청을 원래대로 계속 진행"""
+        try:
+            self.cdp.send("Fetch.continueRequest", {"requestId": fetch_request_id})
+        except Exception as e:
+            print(f"⚠️ 일시 정지된 요청 재개 실패: {e}")
+    
+    def dispatch_successful_request(self, pending_request):
+        """성공한(200) 대기 요청을 종류별 처리기로 전달"""
+        request_type = pending_request.get('type')
+        url = pending_request.get('response_url') or pending_request['request']['url']
+        status = pending_request.get('status', 200)
+        
+        if request_type == 'videos_list' and self.is_video_list_api(url):
+            print(f"✅ 비디오 목록 API 응답 성공! (상태코드: {status})")
+            self.handle_successful_videos_list_request(pending_request)
+            
+        elif request_type == 'video_analytics' and self.is_video_analytics_api(url):
+            api_type = pending_request.get('api_type', 'unknown')
+            if api_type == 'get_screen':
+                print(f"✅ get_screen API 응답 성공! (상태코드: {status})")
+                self.handle_successful_get_screen_request(pending_request)
+            elif api_type == 'get_cards':
+                print(f"✅ get_cards API 응답 성공! (상태코드: {status})")
+                self.handle_successful_get_cards_request(pending_request)
+            else:
+                print(f"✅ 알 수 없는 애널리틱스 API 응답 성공! (상태코드: {status})")
+                print(f"   URL: {url}")
+            self.handle_successful_analytics_request(pending_request)
+    
+    def fetch_response_body(self, request_id, command="Network.getResponseBody"):
+        """브라우저가 받은 응답 본문을 JSON으로 가져오기 (실패 시 None - 호출부는 복제 요청으로 대체)
+
+        Fetch 캡처 모드에서는 command="Fetch.getResponseBody"와 Fetch 요청 ID를 사용합니다.
+        """
+        try:
+            if not self.cdp:
+                return None
+            
+            result = self.cdp.send(command, {"requestId": request_id}, timeout=10)
+            body = result.get('body', '')
+            if result.get('base64Encoded'):
+                body = base64.b64decode(body).decode('utf-8')
+            
+            response_data = json.loads(body)
+            print(f"   📥 브라우저 응답 본문 확보: {len(body):,} bytes")
+            return response_data
+            
+        except Exception as e:
+            print(f"   ⚠️ 응답 본문을 가져오지 못했습니다 - 복제 요청으로 대체합니다: {e}")
+            return None
+    
     def handle_successful_videos_list_request(self, pending_request):
         """성공한 비디오 목록 요청 처리"""
         try:
@@ -713,10 +2017,13 @@ class YouTubeStudioMonitor:
                     if additional_post_data:
                         self.captured_request['postData'] = additional_post_data
                 
-                print("🚀 성공한 비디오 목록 요청을 복제하여 전송합니다!")
-                # 별도 스레드에서 즉시 복제 요청 실행
+                self.save_request_template('list_creator_videos', self.captured_request)
+                
+                print("🚀 성공한 비디오 목록 요청으로 나머지 페이지를 수집합니다!")
+                # 별도 스레드에서 즉시 실행 (첫 페이지는 브라우저가 받은 응답을 그대로 사용)
                 threading.Thread(
                     target=self.replay_captured_request, 
+                    args=(pending_request.get('response_body'),),
                     daemon=True
                 ).start()
         except Exception as e:
@@ -770,6 +2077,7 @@ class YouTubeStudioMonitor:
                 self.collected_analytics_data[tab_name] = {
                     'api_type': 'get_screen',
                     'captured_request': captured_request,
+                    'response_data': pending_request.get('response_body'),  # 브라우저 응답 (없으면 종합 시 복제 요청)
                     'tab_config': current_tab
                 }
                 
@@ -823,6 +2131,7 @@ class YouTubeStudioMonitor:
                 self.collected_analytics_data[tab_name] = {
                     'api_type': 'get_cards',
                     'captured_request': captured_request,
+                    'response_data': pending_request.get('response_body'),  # 브라우저 응답 (없으면 종합 시 복제 요청)
                     'tab_config': current_tab
                 }
                 
@@ -923,8 +2232,12 @@ class YouTubeStudioMonitor:
         
         return debug_filename, curl_filename
 
-    def replay_captured_request(self):
-        """캡처된 요청을 그대로 복제해서 다시 보내기 + 페이지네이션 처리"""
+    def replay_captured_request(self, first_page_response=None):
+        """캡처된 요청을 그대로 복제해서 다시 보내기 + 페이지네이션 처리
+
+        first_page_response가 있으면 브라우저가 이미 받은 첫 페이지로 사용하고
+        그 nextPageToken부터 이어서 요청합니다.
+        """
         try:
             if not self.captured_request:
                 print("❌ 캡처된 요청이 없습니다.")
@@ -935,7 +2248,7 @@ class YouTubeStudioMonitor:
             # 캡처된 정보 그대로 사용
             url = self.captured_request['url']
             method = self.captured_request['method']
-            original_headers = self.captured_request['headers'].copy()
+            original_headers = self.captured_request['headers']
             original_post_data = self.captured_request['postData']
             
             print(f"📋 원본 요청 정보:")
@@ -951,90 +2264,66 @@ class YouTubeStudioMonitor:
             
             while True:
                 page_count += 1
+                self.mark_progress()
                 print(f"\n📄 페이지 {page_count} 수집 중...")
                 
-                # requests 세션 생성
-                session = requests.Session()
-                headers = original_headers.copy()
-                post_data = original_post_data
-                
-                # 두 번째 페이지부터는 pageToken 추가
-                if next_page_token:
-                    try:
-                        payload = json.loads(original_post_data)
-                        payload['pageToken'] = next_page_token
-                        post_data = json.dumps(payload, separators=(',', ':'))
+                if page_count == 1 and first_page_response is not None:
+                    # 브라우저가 받은 첫 페이지 응답 재사용 (같은 요청을 다시 보내지 않음)
+                    print(f"   📥 브라우저 응답 사용 (복제 요청 생략)")
+                    api_response = first_page_response
+                else:
+                    post_data = original_post_data
+                    
+                    # 두 번째 페이지부터는 pageToken 추가
+                    if next_page_token:
+                        compiled = self.get_compiled_payload(original_post_data)
+                        if compiled is None or compiled.paged_segments is None:
+                            print(f"   ❌ 페이로드 파싱 실패")
+                            break
+                        post_data = compiled.render(page_token=next_page_token)
                         print(f"   🔄 페이지 토큰 추가: {next_page_token[:50]}...")
-                    except json.JSONDecodeError:
-                        print(f"   ❌ 페이로드 파싱 실패")
+                    
+                    # 요청 전송 (공유 클라이언트의 연결 풀 재사용)
+                    print(f"   📡 API 요청 전송 중...")
+                    response = self.replay_client.send(url, method, original_headers, post_data, timeout=30)
+                    
+                    print(f"   📨 응답 수신: {response.status_code}")
+                    if getattr(response, 'retry_count', 0):
+                        print(f"   🔁 재시도 {response.retry_count}회 후 응답")
+                    
+                    if response.status_code != 200:
+                        print(f"   ❌ 요청 실패: {response.status_code}")
+                        print(f"   응답: {response.text[:300]}...")
                         break
-                
-                # 쿠키 설정
-                if 'Cookie' in headers:
-                    cookie_str = headers['Cookie']
-                    cookies = {}
-                    for item in cookie_str.split(';'):
-                        if '=' in item:
-                            key, value = item.strip().split('=', 1)
-                            cookies[key] = value
-                    session.cookies.update(cookies)
-                    print(f"   🍪 쿠키 설정: {len(cookies)}개")
-                
-                # Content-Length 제거
-                headers.pop('Content-Length', None)
-                
-                # 요청 전송
-                print(f"   📡 API 요청 전송 중...")
-                if method.upper() == 'POST':
-                    if post_data:
-                        try:
-                            json_data = json.loads(post_data)
-                            response = session.post(url, headers=headers, json=json_data, timeout=30)
-                        except json.JSONDecodeError:
-                            response = session.post(url, headers=headers, data=post_data, timeout=30)
-                    else:
-                        response = session.post(url, headers=headers, timeout=30)
-                else:
-                    response = session.get(url, headers=headers, timeout=30)
-                
-                print(f"   📨 응답 수신: {response.status_code}")
-                
-                if response.status_code == 200:
+                    
                     try:
                         api_response = response.json()
-                        
-                        # 이 페이지의 비디오들 추가
-                        page_videos = []
-                        if 'videos' in api_response:
-                            page_videos = api_response['videos']
-                        elif 'video' in api_response:
-                            page_videos = api_response['video']
-                        elif 'items' in api_response:
-                            page_videos = api_response['items']
-                        
-                        print(f"   ✅ 페이지 {page_count}: {len(page_videos)}개 비디오 수집")
-                        all_videos.extend(page_videos)
-                        
-                        # 다음 페이지 토큰 확인
-                        next_page_token = api_response.get('nextPageToken')
-                        if next_page_token:
-                            print(f"   🔄 다음 페이지 토큰 발견: {next_page_token[:50]}...")
-                            print(f"   ➡️ 다음 페이지로 진행합니다...")
-                        else:
-                            print(f"   🏁 마지막 페이지입니다! (nextPageToken 없음)")
-                            break
-                            
                     except json.JSONDecodeError:
                         print(f"   ❌ JSON 파싱 실패: {response.text[:200]}...")
                         break
+                
+                # 이 페이지의 비디오들 추가
+                page_videos = []
+                if 'videos' in api_response:
+                    page_videos = api_response['videos']
+                elif 'video' in api_response:
+                    page_videos = api_response['video']
+                elif 'items' in api_response:
+                    page_videos = api_response['items']
+                
+                print(f"   ✅ 페이지 {page_count}: {len(page_videos)}개 비디오 수집")
+                all_videos.extend(page_videos)
+                
+                # 다음 페이지 토큰 확인
+                next_page_token = api_response.get('nextPageToken')
+                if next_page_token:
+                    print(f"   🔄 다음 페이지 토큰 발견: {next_page_token[:50]}...")
+                    print(f"   ➡️ 다음 페이지로 진행합니다...")
                 else:
-                    print(f"   ❌ 요청 실패: {response.status_code}")
-                    print(f"   응답: {response.text[:300]}...")
+                    print(f"   🏁 마지막 페이지입니다! (nextPageToken 없음)")
                     break
                 
-                # 페이지 간 짧은 대기 (API 제한 고려)
-                if next_page_token:
-                    time.sleep(1)
+                # 페이지 간 간격은 공유 속도 제한기가 조절
             
             # 전체 결과 처리
             if all_videos:
@@ -1231,6 +2520,14 @@ class YouTubeStudioMonitor:
             
             # 메모리에도 저장
             self.collected_data = processed_videos
+            self.collected_data_by_id = {video.get('videoId'): video for video in processed_videos}
+            self.checkpoint.start(self.channel_id, processed_videos)
+            if self.has_captured_analytics_requests():
+                # 템플릿/재개 실행처럼 이미 요청이 준비된 경우 --resume에서 바로 쓸 수 있게 함께 기록
+                self.checkpoint.save_templates(self.captured_reach_viewers_request, self.captured_interest_viewers_request)
+            
+            if self.incremental:
+                self.apply_incremental_snapshot(processed_videos)
             
             # 비디오 목록 수집 완료! 이제 애널리틱스 수집 단계로 이동
             print(f"✅ 1단계 완료: 공개 비디오 목록 수집 완료!")
@@ -1238,8 +2535,12 @@ class YouTubeStudioMonitor:
             self.collection_phase = "video_analytics"
             
             # 첫 번째 비디오의 다중 탭 애널리틱스 수집 시작
-            if processed_videos and len(processed_videos) > 0:
-                first_video_id = processed_videos[0].get('videoId')
+            pending_videos = self.get_pending_videos()
+            if processed_videos and not pending_videos:
+                print("✅ 다시 수집할 비디오가 없습니다. 이전 결과로 파일을 생성합니다.")
+                self.complete_analytics_collection()
+            elif pending_videos:
+                first_video_id = pending_videos[0].get('videoId')
                 if first_video_id:
                     print(f"📊 첫 번째 비디오 다중 탭 애널리틱스 수집 시작: {first_video_id}")
                     print(f"🎯 수집할 탭들: {[tab['name'] for tab in self.analytics_tabs]}")
@@ -1262,32 +2563,203 @@ class YouTubeStudioMonitor:
             return None
     
     def listen_for_messages(self):
-        """WebSocket 메시지 수신 대기"""
+        """CDP 세션의 네트워크 이벤트 구독 시작 (이벤트는 세션의 디스패치 스레드에서 처리됨)"""
         print("👂 네트워크 요청 모니터링 시작...")
-        while self.monitoring:
-            try:
-                message = self.ws.recv()
-                data = json.loads(message)
-                
-                if 'method' in data:
-                    self.process_network_request(data)
-                    
-            except websocket.WebSocketConnectionClosedException:
-                print("WebSocket 연결이 끊어졌습니다.")
+        self.cdp.subscribe(None, self.handle_cdp_event)
+    
+    def handle_cdp_event(self, message):
+        """모니터링 중일 때만 CDP 이벤트를 네트워크 요청 처리기로 전달"""
+        params = message.get('params', {})
+        if message.get('method') == 'Fetch.requestPaused' and 'responseStatusCode' not in params \
+                and 'responseErrorReason' not in params:
+            # 요청 단계에서 멈춘 요청은 가벼운 캡처의 차단 대상 (차단이 해제된 뒤면 그대로 진행)
+            if self.resource_blocking:
+                try:
+                    self.cdp.send("Fetch.failRequest", {"requestId": params['requestId'], "errorReason": "BlockedByClient"})
+                except Exception as e:
+                    print(f"⚠️ 리소스 차단 실패: {e}")
+            else:
+                self.continue_paused_request(params['requestId'])
+            return
+        
+        if self.monitoring:
+            self.process_network_request(message)
+        elif message.get('method') == 'Fetch.requestPaused':
+            # 모니터링 전후에 일시 정지된 요청도 페이지가 멈추지 않도록 바로 진행
+            self.continue_paused_request(message['params']['requestId'])
+    
+    def wait_for_collection(self, idle_timeout):
+        """수집 완료 이벤트까지 대기 (idle_timeout초 동안 진행이 없으면 중단) 후 모니터링 종료"""
+        timed_out = False
+        while self.monitoring and not self.collection_done.wait(1):
+            if time.monotonic() - self.last_progress_at > idle_timeout:
+                timed_out = True
                 break
-            except websocket.WebSocketTimeoutException:
-                # 타임아웃은 정상적인 상황 - 조용히 계속 진행
-                continue
-            except Exception as e:
-                if self.monitoring:  # 모니터링 중일 때만 오류 출력
-                    print(f"메시지 수신 오류: {e}")
+        
+        # 모니터링 중단
+        self.monitoring = False
+        if timed_out:
+            print(f"\n⏹️ {idle_timeout}초 동안 진행이 없어 모니터링을 중단합니다.")
+        else:
+            print("\n⏹️ 모니터링을 중단합니다.")
+        return not timed_out
+    
+    def save_request_template(self, endpoint, captured_request):
+        """캡처된 요청을 다음 실행용 템플릿으로 저장 (쿠키/인증 헤더는 저장하지 않음)"""
+        try:
+            if captured_request and self.template_store.save_captured(endpoint, captured_request, self.channel_id):
+                print(f"   📝 {endpoint} 요청 템플릿 저장: {self.template_store.path}")
+        except Exception as e:
+            print(f"⚠️ {endpoint} 요청 템플릿 저장 실패: {e}")
+    
+    def connect_for_cookies(self):
+        """페이지 이동 없이 쿠키를 읽기 위해 열려 있는 탭 하나에 CDP 세션 연결"""
+        if not self.is_chrome_debug_running() and not self.start_chrome_debug_mode():
+            return False
+        
+        tabs = requests.get(f'http://localhost:{self.chrome_port}/json', timeout=5).json()
+        page_tabs = [tab for tab in tabs if tab.get('type') == 'page' and tab.get('webSocketDebuggerUrl')]
+        if not page_tabs:
+            print("❌ 연결할 Chrome 탭이 없습니다.")
+            return False
+        
+        studio_tabs = [tab for tab in page_tabs if 'studio.youtube.com' in tab.get('url', '')]
+        self.cdp = CDPSession((studio_tabs or page_tabs)[0]['webSocketDebuggerUrl'])
+        return True
+    
+    def disconnect_cdp(self):
+        if self.cdp:
+            self.cdp.close()
+            self.cdp = None
+    
+    def apply_user_session_id(self):
+        """Studio 페이지의 DATASYNC_ID로 복제 요청 서명에 쓸 사용자 세션 ID 설정 (없으면 기본 형식 사용)"""
+        try:
+            result = self.cdp.send("Runtime.evaluate", {
+                "expression": "String((window.ytcfg && ytcfg.get('DATASYNC_ID')) || '')",
+                "returnByValue": True
+            }, timeout=5)
+            user_session_id = result.get('result', {}).get('value', '').split('||')[0]
+            if user_session_id:
+                self.replay_client.signer.user_session_id = user_session_id
+        except Exception:
+            pass
+    
+    def fetch_innertube_client_context(self):
+        """열려 있는 Studio 페이지에서 최신 클라이언트 컨텍스트(clientVersion 등) 읽기 (없으면 None)"""
+        try:
+            result = self.cdp.send("Runtime.evaluate", {
+                "expression": "JSON.stringify((window.ytcfg && ytcfg.get('INNERTUBE_CONTEXT') || {}).client || null)",
+                "returnByValue": True
+            }, timeout=5)
+            value = result.get('result', {}).get('value')
+            return json.loads(value) if value else None
+        except Exception:
+            return None
+    
+    def run_from_templates(self, idle_timeout=300):
+        """저장된 요청 템플릿 + 브라우저의 최신 쿠키로 수집 (페이지 이동 없음)
+
+        템플릿이 부족하거나 쿠키가 없으면 False를 반환하고 호출부가 브라우저 캡처로 진행합니다.
+        """
+        required_endpoints = ['list_creator_videos'] + [tab['api_endpoint'] for tab in self.analytics_tabs]
+        if not self.template_store.load() or not self.template_store.has(*required_endpoints):
+            print(f"⚠️ 요청 템플릿이 없거나 불완전합니다 ({self.template_store.path}). 브라우저 캡처로 진행합니다.")
+            return False
+        
+        if not self.connect_for_cookies():
+            return False
+        
+        cookie_header = self.fetch_cookies_for_url(STUDIO_ORIGIN)
+        authorization = build_sapisid_authorization(cookie_header or '')
+        if not authorization:
+            print("❌ SAPISID 쿠키가 없습니다. 로그인 상태를 확인해주세요. 브라우저 캡처로 진행합니다.")
+            self.disconnect_cdp()
+            return False
+        
+        client_context = self.fetch_innertube_client_context()
+        self.apply_user_session_id()
+        print(f"📝 요청 템플릿으로 수집합니다 (채널: {self.template_store.channel_id}, 페이지 이동 없음)")
+        if client_context:
+            print(f"   🔄 최신 클라이언트 버전 적용: {client_context.get('clientVersion')}")
+        
+        def render(endpoint):
+            return self.template_store.render(endpoint, cookie_header=cookie_header,
+                                              authorization=authorization, client_context=client_context)
+        
+        self.channel_id = self.template_store.channel_id
+        self.captured_request = render('list_creator_videos')
+        self.captured_reach_viewers_request = render(self.analytics_tabs[0]['api_endpoint'])
+        self.captured_interest_viewers_request = render(self.analytics_tabs[1]['api_endpoint'])
+        
+        self.monitoring = True
+        self.collection_done.clear()
+        self.mark_progress()
+        self.collection_phase = "video_analytics"
+        
+        # 목록 수집 -> 캡처된 요청이 있으므로 곧바로 병렬 애널리틱스 수집으로 이어짐
+        if self.replay_captured_request() is None:
+            print("❌ 템플릿으로 비디오 목록을 가져오지 못했습니다. 브라우저 캡처로 진행합니다.")
+            self.monitoring = False
+            self.disconnect_cdp()
+            return False
+        
+        self.wait_for_collection(idle_timeout)
+        return True
+    
+    def mark_progress(self):
+        """수집이 진행 중임을 기록 (API 감지, 페이지 수집, 비디오 완료 시 호출)"""
+        self.last_progress_at = time.monotonic()
+    
+    def resume_collection(self, idle_timeout=300):
+        """체크포인트에서 비디오 목록/캡처 요청/완료 레코드를 복원해 남은 비디오만 수집"""
+        if not self.checkpoint.exists():
+            print(f"❌ 체크포인트가 없습니다: {self.checkpoint.directory}")
+            return
+        
+        try:
+            state, records = self.checkpoint.load()
+        except Exception as e:
+            print(f"❌ 체크포인트 읽기 오류: {e}")
+            return
+        
+        self.channel_id = state.get('channel_id')
+        self.collected_data = state.get('videos', [])
+        self.collected_data_by_id = {video.get('videoId'): video for video in self.collected_data}
+        templates = state.get('templates') or {}
+        self.captured_reach_viewers_request = templates.get('reach_viewers')
+        self.captured_interest_viewers_request = templates.get('interest_viewers')
+        
+        for record in records:
+            video_id = record.get('video_id')
+            if video_id and video_id not in self.completed_video_ids:
+                self.video_analytics_data.append(record)
+                self.completed_video_ids.add(video_id)
+        
+        pending_videos = self.get_pending_videos()
+        print(f"♻️ 체크포인트 복원: 채널 {self.channel_id}, 완료 {len(self.completed_video_ids)}/{len(self.collected_data)}개")
+        
+        if state.get('completed') or not pending_videos:
+            print("✅ 남은 비디오가 없습니다. 저장된 결과로 파일을 다시 생성합니다.")
+            self.complete_analytics_collection()
+        elif self.has_captured_analytics_requests():
+            # 캡처된 요청 템플릿이 있으면 브라우저 없이 바로 병렬 수집
+            print(f"🚀 남은 {len(pending_videos)}개 비디오를 캡처된 요청으로 이어서 수집합니다.")
+            self.collect_videos_concurrently(pending_videos)
+        else:
+            # 첫 비디오 캡처 전에 중단된 경우 브라우저에서 요청 캡처부터 다시 진행
+            print("⚠️ 캡처된 애널리틱스 요청이 없어 브라우저에서 다시 캡처합니다.")
+            self.start_monitoring(idle_timeout, resume_video_id=pending_videos[0].get('videoId'))
     
-    def start_monitoring(self, duration=300):
-        """모니터링 시작"""
+    def start_monitoring(self, idle_timeout=300, resume_video_id=None):
+        """모니터링 시작 - 수집이 끝나는 즉시 종료하고, idle_timeout초 동안 진행이 없을 때만 중단
+
+        resume_video_id가 있으면 비디오 목록 단계를 건너뛰고 해당 비디오부터 캡처합니다.
+        """
         if not self.connect_to_chrome():
             return
         
-        print(f"\n🔍 YouTube Studio 다중 탭 애널리틱스 수집 시작 ({duration}초 동안)")
+        print(f"\n🔍 YouTube Studio 다중 탭 애널리틱스 수집 시작 (진행 없이 {idle_timeout}초가 지나면 중단)")
         print("📋 수행할 작업:")
         print("   🔸 1단계: 비디오 목록 페이지에서 list_creator_videos API 감지")
         print("   🔸 2단계: 다중 탭 애널리틱스 수집")
@@ -1296,7 +2768,9 @@ class YouTubeStudioMonitor:
         print("   🔸 3단계: 모든 비디오의 상세 정보 자동 수집")
         print("   🔸 4단계: 완전한 데이터를 JSON 파일로 저장")
         
-        if self.channel_id:
+        if self.headless_active:
+            print("\n🤖 헤드리스 모드: 비디오 목록 페이지로 자동 이동해 수집을 시작합니다.")
+        elif self.channel_id:
             print("\n📌 다음 단계:")
             print("   1. YouTube Studio에서 '콘텐츠' 메뉴를 클릭하여 비디오 목록으로 이동하세요")
             print("   2. 페이지가 로딩되면 자동으로 API 요청이 감지됩니다")
@@ -1306,40 +2780,53 @@ class YouTubeStudioMonitor:
             print("   YouTube Studio의 채널 메인 페이지로 이동한 후 '콘텐츠' 메뉴를 클릭해주세요!")
         
         self.monitoring = True
+        self.collection_done.clear()
+        self.mark_progress()
         
-        # 메시지 수신 스레드 시작
-        listener_thread = threading.Thread(target=self.listen_for_messages)
-        listener_thread.daemon = True
-        listener_thread.start()
+        # CDP 이벤트 구독 시작
+        self.listen_for_messages()
         
-        # 지정된 시간 동안 대기
-        print(f"\n⏰ {duration}초 동안 API 요청을 감지합니다...")
-        print(f"📌 1단계 완료 후 자동으로 2단계로 진행됩니다.")
-        time.sleep(duration)
+        if self.headless_active and not resume_video_id:
+            # 헤드리스에서는 사용자가 '콘텐츠' 메뉴를 누를 수 없으므로 비디오 목록 페이지로 직접 이동
+            threading.Thread(target=self.navigate_to_videos_page, daemon=True).start()
         
-        # 모니터링 중단
-        self.monitoring = False
-        print("\n⏹️ 모니터링을 중단합니다.")
+        if resume_video_id:
+            self.collection_phase = "video_analytics"
+            threading.Thread(
+                target=self.start_multi_tab_analytics_collection,
+                args=(resume_video_id,),
+                daemon=True
+            ).start()
+        
+        # 수집 완료 이벤트를 기다리며, 진행이 멈춘 경우에만 타임아웃
+        print(f"\n⏰ API 요청을 감지합니다... (완료되면 자동 종료, {idle_timeout}초 동안 진행이 없으면 중단)")
+        print(f"📌 1단계 완료 후 자동으로 2단계로 진행됩니다.")
+        self.wait_for_collection(idle_timeout)
         
-        if self.captured_request and self.video_analytics_data:
+        if self.collection_done.is_set() and self.video_analytics_data:
             print("🎉 모든 데이터 수집이 성공적으로 완료되었습니다!")
             print(f"   ✅ 비디오 목록: {len(self.collected_data)}개")
             print(f"   ✅ 애널리틱스: {len(self.video_analytics_data)}개")
-        elif self.captured_request:
+        elif self.captured_request or resume_video_id:
             print("✅ 1단계(비디오 목록)는 완료되었지만 2단계가 완료되지 않았습니다.")
             print("   수동으로 비디오 애널리틱스 페이지를 방문해보세요.")
+            print(f"   💾 진행 상황은 {self.checkpoint.directory}에 저장되어 있습니다. --resume으로 이어서 수집할 수 있습니다.")
         else:
             print("❌ API 요청이 감지되지 않았습니다.")
             print("   수동으로 YouTube Studio에서 비디오 목록 페이지를 새로고침해보세요.")
         
         # 연결 종료
-        if self.ws:
-            self.ws.close()
+        if self.cdp:
+            self.set_resource_blocking(False)
+            self.cdp.close()
 
     def cleanup(self):
         """리소스 정리"""
-        if self.ws:
-            self.ws.close()
+        if self.cdp:
+            if self.cdp.connected:
+                self.set_resource_blocking(False)  # 사용자가 계속 쓰는 브라우저에 차단이 남지 않도록
+            self.cdp.close()
+        self.replay_client.close()
         
         print("\n✅ 모니터링이 완료되었습니다.")
         print("💡 Chrome 브라우저는 로그인 상태 유지를 위해 계속 실행됩니다.")
@@ -1420,10 +2907,7 @@ class YouTubeStudioMonitor:
                     failed_analytics.append({'video': video, 'reason': 'Request failed'})
                     print(f"❌ 애널리틱스 데이터 수집 실패")
                 
-                # 요청 간 간격 (YouTube API 제한 고려)
-                if i < len(self.collected_data) - 1:  # 마지막이 아니면
-                    print(f"⏰ 다음 요청까지 3초 대기...")
-                    time.sleep(3)
+                # 요청 간 간격은 공유 속도 제한기가 조절 (YouTube API 제한 고려)
             
             # 결과 요약
             print(f"\n🎉 애널리틱스 데이터 수집 완료!")
@@ -1496,33 +2980,11 @@ class YouTubeStudioMonitor:
     def send_analytics_request(self, url, method, headers, payload, video_id):
         """수정된 페이로드로 애널리틱스 요청 전송"""
         try:
-            # requests 세션 생성
-            session = requests.Session()
-            request_headers = headers.copy()
-            
-            # 쿠키 설정
-            if 'Cookie' in request_headers:
-                cookie_str = request_headers['Cookie']
-                cookies = {}
-                for item in cookie_str.split(';'):
-                    if '=' in item:
-                        key, value = item.strip().split('=', 1)
-                        cookies[key] = value
-                session.cookies.update(cookies)
-            
-            # Content-Length 제거 (requests가 자동 계산)
-            request_headers.pop('Content-Length', None)
-            
-            # JSON 요청 전송
+            # JSON 요청 전송 (공유 클라이언트의 연결 풀 재사용)
             json_payload = json.dumps(payload, separators=(',', ':'))
             print(f"   📡 애널리틱스 요청 전송 중... (페이로드: {len(json_payload)} bytes)")
             
-            response = session.post(
-                url, 
-                headers=request_headers, 
-                json=payload, 
-                timeout=30
-            )
+            response = self.replay_client.send(url, method, headers, json_payload, timeout=30)
             
             if response.status_code == 200:
                 try:
@@ -1557,13 +3019,38 @@ class YouTubeStudioMonitor:
             with open(json_filename, 'w', encoding='utf-8') as f:
                 json.dump(save_data, f, ensure_ascii=False, indent=2)
             
-            # 간단한 엑셀 저장 (하나의 시트만)
-            excel_filename = f"youtube_analytics_data_{timestamp}.xlsx"
-            self.save_simple_analytics_excel(analytics_data, excel_filename)
+            # 간단한 엑셀 저장 (하나의 시트만, 스트리밍 중이면 남은 행만 기록하고 닫음)
+            if self.stream_excel:
+                excel_filename = self.finish_analytics_excel_stream(analytics_data)
+            else:
+                excel_filename = f"youtube_analytics_data_{timestamp}.xlsx"
+                self.save_simple_analytics_excel(analytics_data, excel_filename)
+            
+            # 비디오당 한 행으로 평탄화한 Parquet 테이블
+            parquet_path = None
+            if self.parquet:
+                parquet_path = self.save_analytics_parquet(analytics_data, f"youtube_analytics_{timestamp}.parquet")
+            
+            # 실행 간 추이 조회용 SQLite 기록 (비디오 x 수집 시각 스냅샷 누적)
+            history_count = None
+            if self.history_store:
+                history_count = self.save_analytics_history(analytics_data)
+            
+            # 메트릭 시계열 (열 단위 .npz, MetricSeriesStore.load로 읽기)
+            series_filename = None
+            if len(self.series_store):
+                series_filename = f"youtube_analytics_series_{timestamp}.npz"
+                self.series_store.save(series_filename)
             
             print(f"📊 애널리틱스 데이터가 저장되었습니다!")
             print(f"   📄 JSON: {json_filename}")
             print(f"   📊 Excel: {excel_filename}")
+            if series_filename:
+                print(f"   📈 시계열: {series_filename} ({len(self.series_store)}개 시계열)")
+            if parquet_path:
+                print(f"   🧱 Parquet: {parquet_path}")
+            if history_count is not None:
+                print(f"   🗄️ 기록 DB: {self.history_store.path} (새 스냅샷 {history_count}개)")
             
             # 간단한 요약 출력
             print(f"\n📈 수집된 데이터 요약:")
@@ -1578,251 +3065,101 @@ class YouTubeStudioMonitor:
         except Exception as e:
             print(f"❌ 애널리틱스 데이터 저장 오류: {e}")
     
-    def save_simple_analytics_excel(self, analytics_data, filename):
-        """간단한 애널리틱스 엑셀 파일 생성 (단일 시트)"""
-        try:
-            if not analytics_data:
-                print("❌ 저장할 애널리틱스 데이터가 없습니다.")
-                return
-
-            # 워크북 생성
-            workbook = openpyxl.Workbook()
-            worksheet = workbook.active
-            worksheet.title = 'YouTube Analytics'
-            
-            # 헤더 설정 (썸네일을 첫 번째 열로, 단순화)
-            headers = [
-                '썸네일', '비디오 ID', '제목', '공개상태', '길이', '게시일',
-                '조회수', '노출수', '클릭률', 
-                '시청시간 (분)', '평균 시청시간 (초)', 
-                '평균 조회율 (%)'
-            ]
-            
-            # 헤더 작성
-            for col_num, header in enumerate(headers, 1):
-                cell = worksheet.cell(row=1, column=col_num, value=header)
-                cell.fill = PatternFill(start_color="2E75B6", end_color="2E75B6", fill_type="solid")
-                cell.font = Font(name="맑은 고딕", size=11, bold=True, color="FFFFFF")
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = Border(
-                    left=Side(style='thin'), right=Side(style='thin'),
-                    top=Side(style='thin'), bottom=Side(style='thin')
-                )
-            
-            # 데이터 처리
-            for row_idx, item in enumerate(analytics_data, 2):
-                video_info = item.get('basic_video_info', {})
-                video_id = item.get('video_id', 'N/A')
-                video_title = item.get('video_title', 'N/A')
-                
-                # 다중 탭 API 응답 데이터에서 메트릭 추출
-                tabs_api_data = item.get('analytics_data', {})
-                
-                impressions = 0
-                views = 0
-                click_rate = 0
-                watch_time_minutes = 0
-                average_view_duration_seconds = 0
-                average_percentage_watched = 0
-                
-                # 각 탭의 API 응답에서 데이터 추출
-                for tab_name, tab_api_data in tabs_api_data.items():
-                    if tab_api_data and 'response_data' in tab_api_data:
-                        response_data = tab_api_data['response_data']
-                        cards = response_data.get('cards', [])
-                        
-                        for card in cards:
-                            if 'keyMetricCardData' in card:
-                                tabs = card['keyMetricCardData'].get('keyMetricTabs', [])
-                                for tab in tabs:
-                                    primary_content = tab.get('primaryContent', {})
-                                    metric = primary_content.get('metric', '')
-                                    total = primary_content.get('total', 0)
-                                    
-                                    if metric == 'VIDEO_THUMBNAIL_IMPRESSIONS':
-                                        impressions = total
-                                    elif metric == 'VIDEO_THUMBNAIL_IMPRESSIONS_VTR':
-                                        click_rate = total
-                                    elif metric in ['EXTERNAL_VIEWS', 'VIEWS', 'VIEW_COUNT']:
-                                        views = total
-                                    elif metric in ['EXTERNAL_WATCH_TIME', 'WATCH_TIME']:
-                                        watch_time_minutes = round(total / 1000 / 60, 1)
-                                    elif metric in ['WATCH_TIME_MINUTES']:
-                                        watch_time_minutes = total
-                                    elif metric in ['AVERAGE_VIEW_DURATION', 'AVG_VIEW_DURATION', 'AVERAGE_VIEW_DURATION_SECONDS']:
-                                        average_view_duration_seconds = total
-                            
-                            elif 'audienceRetentionHighlightsCardData' in card:
-                                videos_data = card['audienceRetentionHighlightsCardData'].get('videosData', [])
-                                for video_data in videos_data:
-                                    if video_data.get('videoId') == video_id:
-                                        metric_totals = video_data.get('metricTotals', {})
-                                        
-                                        avg_duration_millis = metric_totals.get('avgViewDurationMillis', 0)
-                                        if avg_duration_millis:
-                                            average_view_duration_seconds = round(avg_duration_millis / 1000)
-                                        
-                                        avg_percentage = metric_totals.get('avgPercentageWatched', 0)
-                                        if avg_percentage:
-                                            average_percentage_watched = round(avg_percentage * 100, 2)
-                                        
-                                        retention_views = metric_totals.get('views', 0)
-                                        if retention_views and not views:
-                                            views = retention_views
-                                        break
-                
-                # 시간과 상태 변환 함수들
-                def format_timestamp_korean(timestamp):
-                    try:
-                        if timestamp and str(timestamp) != 'N/A' and str(timestamp).isdigit():
-                            dt = datetime.fromtimestamp(int(timestamp))
-                            return dt.strftime('%Y년 %m월 %d일 %H시 %M분')
-                        return 'N/A'
-                    except:
-                        return 'N/A'
-                
-                def format_duration(seconds):
-                    try:
-                        if seconds and str(seconds) != 'N/A' and str(seconds).isdigit():
-                            seconds = int(seconds)
-                            hours = seconds // 3600
-                            minutes = (seconds % 3600) // 60
-                            secs = seconds % 60
-                            if hours > 0:
-                                return f"{hours}:{minutes:02d}:{secs:02d}"
-                            else:
-                                return f"{minutes}:{secs:02d}"
-                        return 'N/A'
-                    except:
-                        return 'N/A'
-                
-                # 공개 상태 변환
-                privacy_mapping = {
-                    'VIDEO_PRIVACY_PUBLIC': '공개',
-                    'VIDEO_PRIVACY_PRIVATE': '비공개',
-                    'VIDEO_PRIVACY_UNLISTED': '제한공개',
-                    'VIDEO_PRIVACY_DRAFT': '임시보관함',
-                    'VIDEO_PRIVACY_SCHEDULED': '예약 게시',
-                    'VIDEO_STATUS_PROCESSED': '처리 완료',
-                    'VIDEO_STATUS_UPLOADING': '업로드 중',
-                    'VIDEO_STATUS_PROCESSING': '처리 중',
-                    'VIDEO_STATUS_FAILED': '실패'
-                }
-                
-                privacy_status = (
-                    video_info.get('privacy') or 
-                    video_info.get('status') or 
-                    video_info.get('privacyStatus') or 
-                    'Unknown'
-                )
-                privacy_korean = privacy_mapping.get(privacy_status, privacy_status)
-                
-                # 썸네일 URL 추출
-                thumbnail_url = None
-                if 'thumbnailDetails' in video_info and 'thumbnails' in video_info['thumbnailDetails']:
-                    thumbnails = video_info['thumbnailDetails']['thumbnails']
-                    if thumbnails and len(thumbnails) > 0:
-                        thumbnail_url = thumbnails[-1].get('url')
-                elif 'thumbnail_urls' in video_info:
-                    urls = video_info['thumbnail_urls']
-                    if urls and len(urls) > 0:
-                        thumbnail_url = urls[-1]
-                if not thumbnail_url and video_id != 'N/A':
-                    thumbnail_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
-                
-                # 데이터 행 작성 (썸네일을 첫 번째로)
-                data = [
-                    "썸네일 이미지",  # 첫 번째 열: 썸네일
-                    video_id,
-                    video_title[:50],
-                    privacy_korean,
-                    format_duration(video_info.get('lengthSeconds')),
-                    format_timestamp_korean(video_info.get('timePublishedSeconds')),
-                    int(video_info.get('public_viewCount', 0)) if video_info.get('public_viewCount') else 0,
-                    int(impressions) if impressions else 0,
-                    round(float(click_rate), 2) if click_rate else 0,  # 소수점으로 표시 (% 제거)
-                    int(watch_time_minutes) if watch_time_minutes else 0,
-                    int(average_view_duration_seconds) if average_view_duration_seconds else 0,
-                    round(float(average_percentage_watched), 2) if average_percentage_watched else 0
-                ]
-                
-                # 데이터 셀 작성 및 스타일 적용
-                for col_num, value in enumerate(data, 1):
-                    cell = worksheet.cell(row=row_idx, column=col_num, value=value)
-                    cell.font = Font(name="맑은 고딕", size=10)
-                    cell.border = Border(
-                        left=Side(style='thin'), right=Side(style='thin'),
-                        top=Side(style='thin'), bottom=Side(style='thin')
-                    )
-                
-                                        # 컬럼별 정렬 및 포맷 (썸네일이 첫 번째로 이동)
-                    if col_num in [7, 8, 10, 11]:  # 숫자 컬럼들 (조회수, 노출수, 시청시간, 평균시청시간)
-                        cell.alignment = Alignment(horizontal="right", vertical="center")
-                        if isinstance(value, (int, float)) and value > 0:
-                            cell.number_format = '#,##0'
-                    elif col_num in [9, 12]:  # 소수점 컬럼들 (클릭률, 평균조회율)
-                        cell.alignment = Alignment(horizontal="right", vertical="center")
-                        if isinstance(value, (int, float)) and value > 0:
-                            cell.number_format = '0.00'
-                    elif col_num in [1, 2, 4, 5]:  # 중앙 정렬 (썸네일, ID, 공개상태, 길이)
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                    else:
-                        cell.alignment = Alignment(horizontal="left", vertical="center")
-                
-                # 썸네일 이미지 삽입 (1번째 열)
-                thumbnail_cell = worksheet.cell(row=row_idx, column=1)
-                if thumbnail_url:
-                    try:
-                        print(f"      📷 썸네일 다운로드: {thumbnail_url[:50]}...")
-                        response = requests.get(thumbnail_url, timeout=15, headers={
-                            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                        })
-                        
-                        if response.status_code == 200:
-                            # BytesIO를 사용해서 메모리에서 처리
-                            img_data = BytesIO(response.content)
-                            img = Image(img_data)
-                            
-                            # 이미지 크기 조정 (더 크게)
-                            img.width = 200
-                            img.height = 150
-                            
-                            # 셀에 이미지 고정
-                            img.anchor = f'A{row_idx}'
-                            worksheet.add_image(img)
-                            
-                            # 행 높이를 더 크게 조정 (썸네일에 맞춰서)
-                            worksheet.row_dimensions[row_idx].height = 120
-                            
-                            thumbnail_cell.value = "📷"
-                            print(f"      ✅ 썸네일 삽입 완료")
-                        else:
-                            thumbnail_cell.value = f"❌ HTTP {response.status_code}"
-                            print(f"      ❌ 썸네일 다운로드 실패: {response.status_code}")
-                    except Exception as e:
-                        thumbnail_cell.value = "❌ 오류"
-                        print(f"      ❌ 썸네일 오류: {str(e)[:50]}")
-                else:
-                    thumbnail_cell.value = "❌ URL없음"
-                
-
-            
-            # 컬럼 너비 설정 (썸네일이 첫 번째 열)
-            column_widths = [30, 15, 40, 12, 8, 18, 12, 12, 10, 15, 15, 12]
-            for col_num, width in enumerate(column_widths, 1):
-                worksheet.column_dimensions[openpyxl.utils.get_column_letter(col_num)].width = width
-            
-            # 행 높이 설정 (헤더는 작게, 데이터 행은 썸네일에 맞게)
-            worksheet.row_dimensions[1].height = 25  # 헤더 행
-            for row in range(2, len(analytics_data) + 2):
-                worksheet.row_dimensions[row].height = 120  # 데이터 행들 (썸네일에 맞춰서)
+    def write_analytics_excel_row(self, writer, item):
+        """애널리틱스 레코드 하나를 엑셀 행으로 기록 (썸네일은 디스크 캐시에서)"""
+        values, image_bytes = self.build_analytics_excel_row(item)
+        writer.append(values, height=120, image_bytes=image_bytes, image_column=1, image_size=ANALYTICS_THUMBNAIL_SIZE)
+    
+    def build_analytics_excel_row(self, item):
+        """애널리틱스 레코드 하나의 엑셀 행 값과 셀 크기 썸네일 반환: (values, image_bytes) - 썸네일이 없으면 다운로드"""
+        video_info = item.get('basic_video_info') or {}
+        video_id, thumbnail_url = thumbnail_item(video_info, item.get('video_id'))
+        video_title = item.get('video_title') or 'N/A'
+        
+        # 수집 시 추출해 둔 메트릭 사용 (이전 형식 레코드는 API 응답에서 추출)
+        if item.get('metrics'):
+            metrics = VideoMetrics.from_record(item['metrics'])
+        else:
+            metrics = extract_video_metrics(item.get('analytics_data', {}), video_id)
+        
+        # 썸네일 (셀 크기로 줄인 이미지)
+        image_bytes = None
+        if thumbnail_url:
+            try:
+                image_bytes, error = self.thumbnail_cache.fetch_resized(video_id, thumbnail_url, *ANALYTICS_THUMBNAIL_SIZE)
+                thumbnail_label = "📷" if image_bytes else f"❌ {error}"
+            except Exception as e:
+                thumbnail_label = "❌ 오류"
+                print(f"      ❌ 썸네일 오류: {str(e)[:50]}")
+        else:
+            thumbnail_label = "❌ URL없음"
+        
+        values = [
+            thumbnail_label,
+            video_id,
+            video_title[:50],
+            privacy_label(video_info),
+            format_duration(video_info.get('lengthSeconds')),
+            format_timestamp_korean(video_info.get('timePublishedSeconds')),
+            safe_int(video_info.get('public_viewCount')),
+            int(metrics.impressions) if metrics.impressions else 0,
+            round(float(metrics.click_rate), 2) if metrics.click_rate else 0,  # 소수점으로 표시 (% 제거)
+            int(metrics.watch_time_minutes) if metrics.watch_time_minutes else 0,
+            int(metrics.average_view_duration_seconds) if metrics.average_view_duration_seconds else 0,
+            round(float(metrics.average_percentage_watched), 2) if metrics.average_percentage_watched else 0
+        ]
+        return values, image_bytes
+    
+    def open_analytics_excel(self, filename):
+        return StreamingExcelWriter(
+            filename, 'YouTube Analytics', ANALYTICS_EXCEL_HEADERS, ANALYTICS_EXCEL_COLUMN_WIDTHS,
+            ANALYTICS_EXCEL_COLUMN_STYLES, header_color="2E75B6", header_height=25
+        )
+    
+    def save_analytics_parquet(self, analytics_data, filename):
+        """비디오 + 애널리틱스 메트릭 테이블을 Parquet로 저장 (저장 경로 반환, pyarrow가 없으면 건너뜀)"""
+        if not PYARROW_AVAILABLE:
+            print("⚠️ pyarrow가 설치되어 있지 않아 Parquet 저장을 건너뜁니다. (pip install pyarrow)")
+            return None
+        
+        try:
+            table = build_video_table(analytics_data, self.channel_id)
+            if self.parquet_dataset_dir:
+                # channel_id=.../collection_date=.../*.parquet (실행마다 새 파일이 추가됨)
+                table.to_parquet(self.parquet_dataset_dir, engine='pyarrow', index=False,
+                                 partition_cols=['channel_id', 'collection_date'])
+                return self.parquet_dataset_dir
+            table.to_parquet(filename, engine='pyarrow', index=False)
+            return filename
+        except Exception as e:
+            print(f"❌ Parquet 저장 오류: {e}")
+            return None
+    
+    def save_analytics_history(self, analytics_data):
+        """이번 실행의 스냅샷을 SQLite 기록 DB에 추가 (추가된 스냅샷 수 반환, 실패 시 None)"""
+        try:
+            return self.history_store.record_run(analytics_data, self.channel_id)
+        except Exception as e:
+            print(f"❌ 기록 DB 저장 오류: {e}")
+            return None
+    
+    def save_simple_analytics_excel(self, analytics_data, filename):
+        """간단한 애널리틱스 엑셀 파일 생성 (단일 시트, write_only 스트리밍 저장)"""
+        try:
+            if not analytics_data:
+                print("❌ 저장할 애널리틱스 데이터가 없습니다.")
+                return
             
-            # 자동 필터 및 틀 고정
-            worksheet.auto_filter.ref = f"A1:{openpyxl.utils.get_column_letter(len(headers))}{len(analytics_data) + 1}"
-            worksheet.freeze_panes = "A2"
+            # 썸네일은 행을 쓰기 전에 한꺼번에 준비 (캐시에 없는 것만 동시에 다운로드)
+            self.thumbnail_cache.prefetch(
+                (thumbnail_item(item.get('basic_video_info'), item.get('video_id')) for item in analytics_data),
+                size=ANALYTICS_THUMBNAIL_SIZE
+            )
             
-            # 파일 저장
-            workbook.save(filename)
+            writer = self.open_analytics_excel(filename)
+            for item in analytics_data:
+                self.write_analytics_excel_row(writer, item)
+            writer.close()
             
             print(f"✅ 📊 통합 애널리틱스 엑셀 파일이 생성되었습니다: {filename}")
             print(f"   • ✅ 기본 비디오 정보 + 애널리틱스 데이터 통합")
@@ -1837,145 +3174,126 @@ class YouTubeStudioMonitor:
             import traceback
             traceback.print_exc()
     
-
+    def stream_analytics_record(self, record):
+        """--stream-excel: 비디오 결과가 확정될 때마다 엑셀 행을 바로 기록"""
+        if not self.stream_excel:
+            return
+        try:
+            with self.excel_stream_lock:
+                if self.analytics_excel_stream is None:
+                    self.open_analytics_excel_stream()
+                    # 스트림을 열기 전에 확보된 레코드(--resume 체크포인트 등)부터 함께 기록
+                    with self.results_lock:
+                        records = list(self.video_analytics_data)
+                else:
+                    records = [record]
+            self.write_streamed_records(records)
+        except Exception as e:
+            print(f"⚠️ 엑셀 행 기록 실패 ({record.get('video_id')}): {e}")
     
+    def open_analytics_excel_stream(self):
+        """스트리밍 엑셀 파일을 열고 남은 썸네일을 백그라운드에서 준비 (excel_stream_lock 안에서 호출)"""
+        filename = f"youtube_analytics_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        self.analytics_excel_stream = self.open_analytics_excel(filename)
+        self.streamed_video_ids = set()
+        print(f"📊 엑셀 스트리밍 시작: {filename}")
+        
+        # 남은 비디오 썸네일은 백그라운드에서 미리 받아 행 기록이 다운로드를 기다리지 않게 함
+        videos = list(self.collected_data)
+        threading.Thread(
+            target=self.thumbnail_cache.prefetch,
+            args=((thumbnail_item(video, video.get('videoId')) for video in videos),),
+            kwargs={'size': ANALYTICS_THUMBNAIL_SIZE},
+            daemon=True
+        ).start()
+    
+    def write_streamed_records(self, records):
+        """아직 기록하지 않은 레코드를 스트리밍 엑셀에 추가
 
-
+        썸네일 다운로드/축소는 잠금 밖에서 하고 excel_stream_lock은 행 추가에만 잡으므로,
+        느린 썸네일 하나 때문에 결과를 확정한 다른 워커들이 줄 서서 기다리지 않습니다.
+        """
+        for record in records:
+            video_id = record.get('video_id')
+            with self.excel_stream_lock:
+                if self.analytics_excel_stream is None:
+                    self.open_analytics_excel_stream()
+                if video_id in self.streamed_video_ids:
+                    continue
+                self.streamed_video_ids.add(video_id)  # 다른 스레드가 같은 행을 다시 준비하지 않도록 먼저 표시
+            
+            try:
+                values, image_bytes = self.build_analytics_excel_row(record)
+            except Exception:
+                with self.excel_stream_lock:
+                    self.streamed_video_ids.discard(video_id)
+                raise
+            
+            with self.excel_stream_lock:
+                if self.analytics_excel_stream is None:
+                    # 행을 준비하는 동안 finish_analytics_excel_stream이 파일을 닫음 - 기록하지 못한 행으로 되돌림
+                    self.streamed_video_ids.discard(video_id)
+                    print(f"⚠️ 스트리밍 엑셀이 이미 닫혀 {video_id} 행을 기록하지 못했습니다. (JSON에는 저장됨)")
+                    return  # 남은 레코드로 새 파일을 다시 열지 않음
+                self.analytics_excel_stream.append(values, height=120, image_bytes=image_bytes,
+                                                   image_column=1, image_size=ANALYTICS_THUMBNAIL_SIZE)
+    
+    def finish_analytics_excel_stream(self, analytics_data):
+        """스트리밍 엑셀에 남은 레코드를 기록하고 저장 (저장한 파일 이름 반환)"""
+        if self.analytics_excel_stream is None and not analytics_data:
+            print("❌ 저장할 애널리틱스 데이터가 없습니다.")
+            return None
+        self.write_streamed_records(analytics_data)
+        
+        with self.excel_stream_lock:
+            writer = self.analytics_excel_stream
+            self.analytics_excel_stream = None
+            if writer is None:
+                return None
+            row_count = writer.close()
+        
+        print(f"✅ 📊 스트리밍 애널리틱스 엑셀 저장 완료: {writer.filename} ({row_count}행, 비디오가 확정된 순서)")
+        return writer.filename
+    
     def save_videos_to_excel(self, videos, filename):
-        """비디오 데이터를 예쁘게 포맷된 엑셀 파일로 저장"""
+        """비디오 데이터를 예쁘게 포맷된 엑셀 파일로 저장 (write_only 스트리밍 저장)"""
         try:
             if not videos:
                 print("❌ 저장할 비디오 데이터가 없습니다.")
                 return
 
-            # 필요한 임포트
-            import requests
-            from openpyxl.drawing.image import Image
-            from io import BytesIO
-            import tempfile
-            import urllib.request
-
             print(f"📊 {len(videos)}개 비디오 데이터 처리 시작...")
             
-            # 확장된 공개 상태 매핑 (모든 가능한 상태 포함)
-            privacy_mapping = {
-                'VIDEO_PRIVACY_PUBLIC': '공개',
-                'VIDEO_PRIVACY_PRIVATE': '비공개', 
-                'VIDEO_PRIVACY_UNLISTED': '제한공개',
-                'VIDEO_PRIVACY_DRAFT': '임시보관함',
-                'VIDEO_PRIVACY_SCHEDULED': '예약 게시',
-                'VIDEO_STATUS_PROCESSED': '처리 완료',
-                'VIDEO_STATUS_UPLOADING': '업로드 중',
-                'VIDEO_STATUS_PROCESSING': '처리 중',
-                'VIDEO_STATUS_FAILED': '실패',
-                'PUBLIC': '공개',
-                'PRIVATE': '비공개',
-                'UNLISTED': '제한공개'
-            }
-
-            # 엑셀 워크북 생성 (단일 시트만)
-            workbook = openpyxl.Workbook()
-            worksheet = workbook.active
-            worksheet.title = 'YouTube Videos'
-            
-            # 헤더 설정
-            headers = [
-                '비디오 ID', '제목', '공개 상태', '길이', '생성일', '게시일',
-                '조회수', '좋아요', '댓글수', '시청 시간 (분)', '구독자 증가',
-                '상태', '비디오 URL', '썸네일', '설명'
-            ]
+            # 썸네일은 행을 쓰기 전에 한꺼번에 준비 (캐시에 없는 것만 동시에 다운로드)
+            thumbnails = [thumbnail_item(video, video.get('videoId')) for video in videos]
+            self.thumbnail_cache.prefetch(thumbnails, size=VIDEOS_THUMBNAIL_SIZE)
             
-            # 헤더 작성
-            for col_num, header in enumerate(headers, 1):
-                cell = worksheet.cell(row=1, column=col_num, value=header)
-                cell.fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-                cell.font = Font(name="맑은 고딕", size=11, bold=True, color="FFFFFF")
-                cell.alignment = Alignment(horizontal="center", vertical="center")
-                cell.border = Border(
-                    left=Side(style='thin'), right=Side(style='thin'),
-                    top=Side(style='thin'), bottom=Side(style='thin')
+            # 엑셀 워크북 생성 (단일 시트만)
+            writer = StreamingExcelWriter(
+                filename, 'YouTube Videos', VIDEOS_EXCEL_HEADERS, VIDEOS_EXCEL_COLUMN_WIDTHS,
+                VIDEOS_EXCEL_COLUMN_STYLES, header_color="4472C4"
             )
             
             # 데이터 처리
-            for row_idx, video in enumerate(videos, 2):
-                print(f"   📹 처리 중: {video.get('title', 'Unknown')[:30]}...")
-                
-                # 시간 변환 함수 (한국 시간으로)
-                def format_timestamp_korean(timestamp):
-                    try:
-                        if timestamp and str(timestamp) != 'N/A' and str(timestamp).isdigit():
-                            dt = datetime.fromtimestamp(int(timestamp))
-                            return dt.strftime('%Y년 %m월 %d일 %H시 %M분')
-                        return 'N/A'
-                    except:
-                        return 'N/A'
+            for video, (video_id, thumbnail_url) in zip(videos, thumbnails):
+                video_url = f"https://www.youtube.com/watch?v={video_id}"
                 
-                # 길이를 시:분:초 형식으로 변환
-                def format_duration(seconds):
-                    try:
-                        if seconds and str(seconds) != 'N/A' and str(seconds).isdigit():
-                            seconds = int(seconds)
-                            hours = seconds // 3600
-                            minutes = (seconds % 3600) // 60
-                            secs = seconds % 60
-                            if hours > 0:
-                                return f"{hours}:{minutes:02d}:{secs:02d}"
-                            else:
-                                return f"{minutes}:{secs:02d}"
-                        return 'N/A'
-                    except:
-                        return 'N/A'
-                
-                # 숫자 안전 변환
-                def safe_int(value, default=0):
+                # 썸네일 이미지 (14번째 열)
+                image_bytes = None
+                if thumbnail_url:
                     try:
-                        if value and str(value) != 'N/A':
-                            return int(value)
-                        return default
-                    except:
-                        return default
-                
-                # 비디오 ID와 URL
-                video_id = video.get('videoId', 'N/A')
-                
-                # 공개 상태 변환 - 모든 가능한 필드 체크
-                privacy_status = (
-                    video.get('privacy') or 
-                    video.get('status') or 
-                    video.get('privacyStatus') or 
-                    'Unknown'
-                )
-                privacy_korean = privacy_mapping.get(privacy_status, privacy_status)
-                
-                # 썸네일 URL 추출 - 여러 경로 시도
-                thumbnail_url = None
-                
-                # 경로 1: thumbnailDetails.thumbnails
-                if 'thumbnailDetails' in video and 'thumbnails' in video['thumbnailDetails']:
-                    thumbnails = video['thumbnailDetails']['thumbnails']
-                    if thumbnails and len(thumbnails) > 0:
-                        # 가장 큰 해상도 선택
-                        thumbnail_url = thumbnails[-1].get('url')
-                
-                # 경로 2: thumbnail_urls (이미 추출된 경우)
-                if not thumbnail_url and 'thumbnail_urls' in video:
-                    urls = video['thumbnail_urls']
-                    if urls and len(urls) > 0:
-                        thumbnail_url = urls[-1]
-                
-                # 경로 3: 직접 thumbnail 필드
-                if not thumbnail_url:
-                    thumbnail_url = video.get('thumbnail')
-                
-                # 경로 4: 비디오 ID로 YouTube 기본 썸네일 생성
-                if not thumbnail_url and video_id != 'N/A':
-                    thumbnail_url = f"https://img.youtube.com/vi/{video_id}/maxresdefault.jpg"
+                        image_bytes, error = self.thumbnail_cache.fetch_resized(video_id, thumbnail_url, *VIDEOS_THUMBNAIL_SIZE)
+                        thumbnail_label = "📷 이미지" if image_bytes else f"❌ {error}"
+                    except Exception as e:
+                        thumbnail_label = "❌ 오류"
+                        print(f"      ❌ 썸네일 오류: {str(e)[:50]}")
+                else:
+                    thumbnail_label = "❌ URL없음"
                 
-                # 데이터 행 작성
-                data = [
+                writer.append([
                     video_id,
                     video.get('title', 'N/A'),
-                    privacy_korean,
+                    privacy_label(video),
                     format_duration(video.get('lengthSeconds')),
                     format_timestamp_korean(video.get('timeCreatedSeconds')),
                     format_timestamp_korean(video.get('timePublishedSeconds')),
@@ -1985,87 +3303,16 @@ class YouTubeStudioMonitor:
                     safe_int(video.get('public_watchTimeMinutes', 0)),
                     safe_int(video.get('public_subscribersGained', 0)),
                     video.get('status', 'N/A'),
-                    f"https://www.youtube.com/watch?v={video_id}",
-                    "썸네일 이미지",  # 이미지가 들어갈 자리
+                    video_url,
+                    thumbnail_label,
                     video.get('description', 'N/A')[:200] if video.get('description') else 'N/A'
-                ]
-                
-                # 데이터 셀 작성 및 스타일 적용
-                for col_num, value in enumerate(data, 1):
-                    cell = worksheet.cell(row=row_idx, column=col_num, value=value)
-                    cell.font = Font(name="맑은 고딕", size=10)
-                    cell.border = Border(
-                        left=Side(style='thin'), right=Side(style='thin'),
-                        top=Side(style='thin'), bottom=Side(style='thin')
+                ],
+                    height=70 if image_bytes else None,
+                    hyperlinks={13: video_url} if video_id != 'N/A' else None,  # 비디오 URL 하이퍼링크 (13번째 열)
+                    image_bytes=image_bytes, image_column=14, image_size=VIDEOS_THUMBNAIL_SIZE
                 )
-                
-                    # 컬럼별 정렬
-                    if col_num in [7, 8, 9, 10, 11]:  # 숫자 컬럼들
-                        cell.alignment = Alignment(horizontal="right", vertical="center")
-                        if isinstance(value, int) and value > 0:
-                                cell.number_format = '#,##0'
-                    elif col_num in [1, 3, 12]:  # 중앙 정렬
-                        cell.alignment = Alignment(horizontal="center", vertical="center")
-                    else:
-                        cell.alignment = Alignment(horizontal="left", vertical="center")
-                
-                # 비디오 URL을 하이퍼링크로 설정 (13번째 열)
-                url_cell = worksheet.cell(row=row_idx, column=13)
-                if video_id != 'N/A':
-                    video_url = f"https://www.youtube.com/watch?v={video_id}"
-                    url_cell.value = video_url
-                    url_cell.hyperlink = video_url
-                    url_cell.font = Font(name="맑은 고딕", size=10, color="0000FF", underline="single")
-                    url_cell.alignment = Alignment(horizontal="left", vertical="center")
-                    print(f"      🔗 하이퍼링크 설정: {video_url}")
-                
-                # 썸네일 이미지 삽입 (14번째 열)
-                thumbnail_cell = worksheet.cell(row=row_idx, column=14)
-                if thumbnail_url:
-                    try:
-                        print(f"      📷 썸네일 다운로드: {thumbnail_url[:50]}...")
-                        response = requests.get(thumbnail_url, timeout=15, headers={
-                            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-                        })
-                        
-                        if response.status_code == 200:
-                            # BytesIO를 사용해서 메모리에서 처리
-                            img_data = BytesIO(response.content)
-                            img = Image(img_data)
-                            
-                            # 이미지 크기 조정
-                            img.width = 120
-                            img.height = 90
-                            
-                            # 셀에 이미지 고정
-                            img.anchor = f'{openpyxl.utils.get_column_letter(14)}{row_idx}'
-                            worksheet.add_image(img)
-                            
-                            # 행 높이 조정
-                            worksheet.row_dimensions[row_idx].height = 70
-                            
-                            thumbnail_cell.value = "📷 이미지"
-                            print(f"      ✅ 썸네일 삽입 완료")
-                        else:
-                            thumbnail_cell.value = f"❌ HTTP {response.status_code}"
-                            print(f"      ❌ 썸네일 다운로드 실패: {response.status_code}")
-                    except Exception as e:
-                        thumbnail_cell.value = "❌ 오류"
-                        print(f"      ❌ 썸네일 오류: {str(e)[:50]}")
-                else:
-                    thumbnail_cell.value = "❌ URL없음"
             
-            # 컬럼 너비 설정
-            column_widths = [15, 50, 12, 10, 22, 22, 12, 10, 10, 15, 12, 12, 50, 25, 60]
-            for col_num, width in enumerate(column_widths, 1):
-                worksheet.column_dimensions[openpyxl.utils.get_column_letter(col_num)].width = width
-                
-            # 자동 필터 및 틀 고정
-            worksheet.auto_filter.ref = f"A1:{openpyxl.utils.get_column_letter(len(headers))}{len(videos) + 1}"
-            worksheet.freeze_panes = "A2"
-                
-            # 파일 저장
-            workbook.save(filename)
+            writer.close()
             
             print(f"✅ 📊 완전히 새로운 엑셀 파일이 생성되었습니다: {filename}")
             print(f"   • ✅ 유닉스 타임스탬프 → 한국어 날짜")
@@ -2089,33 +3336,16 @@ class YouTubeStudioMonitor:
             # 애널리틱스 탭 URL 생성
             analytics_url = f"https://studio.youtube.com/video/{video_id}/analytics/{tab_config['url_suffix']}"
             
-            # 활성 탭에서 URL 변경
-            response = requests.get(f'http://localhost:{self.chrome_port}/json')
-            tabs = response.json()
-            
-            studio_tab = None
-            for tab in tabs:
-                if 'studio.youtube.com' in tab.get('url', ''):
-                    studio_tab = tab
-                    break
+            # 캡처에 필요 없는 이미지/폰트/추적 리소스 차단 (--lean-capture)
+            self.set_resource_blocking(True)
             
-            if studio_tab:
-                # JavaScript로 페이지 이동
-                ws_url = studio_tab['webSocketDebuggerUrl']
-                ws = websocket.create_connection(ws_url)
-                
-                ws.send(json.dumps({
-                    "id": 1,
-                    "method": "Runtime.evaluate",
-                    "params": {
-                        "expression": f"window.location.href = '{analytics_url}'"
-                    }
-                }))
-                
-                ws.close()
-                print(f"✅ {tab_config['name']} 탭으로 이동: {analytics_url}")
-                print(f"   📊 수집 예정: {tab_config['description']}")
-                time.sleep(8)  # 페이지 로딩 대기
+            # 탭의 대상 API(get_screen/get_cards) 요청이 감지되는 즉시 이동 완료
+            target_api = tab_config['api_endpoint']
+            print(f"🚀 {tab_config['name']} 탭으로 이동: {analytics_url}")
+            print(f"   📊 수집 예정: {tab_config['description']}")
+            ready_when = self.is_get_cards_api if target_api == 'get_cards' else self.is_get_screen_api
+            if self.navigate_and_wait(analytics_url, ready_when=ready_when):
+                print(f"✅ {tab_config['name']} 탭 로딩 완료 ({target_api} 요청 감지)")
                 return True
             
             return False
@@ -2134,8 +3364,8 @@ class YouTubeStudioMonitor:
                 self.current_tab_index = 0  # 반드시 0으로 리셋!
                 self.collected_analytics_data = {}  # 이전 데이터 클리어
             
-            # 첫 번째 비디오인지 확인 (이미 수집된 데이터 개수로 판단)
-            is_first_video = len(self.video_analytics_data) == 0
+            # 첫 번째 비디오인지 확인 (캡처된 요청 템플릿 유무로 판단)
+            is_first_video = not self.has_captured_analytics_requests()
             
             if is_first_video:
                 # 첫 번째 비디오: 브라우저 이동해서 요청 캡처
@@ -2152,9 +3382,9 @@ class YouTubeStudioMonitor:
                 else:
                     print("❌ 애널리틱스 탭 목록이 비어있습니다!")
             else:
-                # 두 번째 비디오부터: 캡처된 요청 사용해서 바로 데이터 수집
-                print(f"🚀 두 번째 이후 비디오: 캐시된 요청으로 직접 API 호출")
-                self.process_video_with_captured_requests(video_id)
+                # 두 번째 비디오부터: 캡처된 요청으로 병렬 수집 엔진이 처리
+                print(f"🚀 두 번째 이후 비디오: 캐시된 요청으로 병렬 API 호출")
+                self.proceed_to_next_video()
                 
         except Exception as e:
             print(f"❌ 다중 탭 수집 시작 오류: {e}")
@@ -2163,95 +3393,302 @@ class YouTubeStudioMonitor:
             # 오류 시 다음 비디오로 진행
             self.proceed_to_next_video()
     
+    def has_captured_analytics_requests(self):
+        """두 번째 이후 비디오 수집에 필요한 탭별 캡처 요청이 모두 있는지 확인"""
+        return bool(self.captured_reach_viewers_request and self.captured_interest_viewers_request)
+    
+    def get_pending_videos(self):
+        """아직 애널리틱스 수집이 끝나지 않은 비디오 목록 (수집 순서 유지)"""
+        with self.results_lock:
+            return [
+                video for video in self.collected_data
+                if video.get('videoId') and video.get('videoId') not in self.completed_video_ids
+            ]
+    
+    def apply_incremental_snapshot(self, videos):
+        """이전 실행 저장소와 비교해 바뀌지 않은 비디오는 이전 레코드를 완료 처리"""
+        if not self.incremental_store.load():
+            print("📂 이전 증분 저장소가 없어 전체 비디오를 수집합니다.")
+            return
+        
+        now = time.time()
+        reasons = {}
+        reused_count = 0
+        missing_series_count = 0
+        
+        for video in videos:
+            video_id = video.get('videoId')
+            reason = self.incremental_store.refresh_reason(video, self.recent_days, now)
+            if reason:
+                reasons[reason] = reasons.get(reason, 0) + 1
+                continue
+            
+            # 제목/썸네일 등 기본 정보는 최신 스냅샷으로 교체하고 애널리틱스는 재사용
+            record = dict(self.incremental_store.previous_record(video_id))
+            record['basic_video_info'] = video
+            record['video_title'] = video.get('title')
+            record['reused_from_previous_run'] = True
+            if not self.add_reused_series(record):
+                missing_series_count += 1
+            self.record_video_analytics(record)
+            reused_count += 1
+        
+        reason_labels = {
+            'new': '새 비디오',
+            'views_changed': '조회수 변경',
+            'republished': '게시 시각 변경',
+            'recent': f'최근 {self.recent_days}일 이내 게시',
+            'unknown_publish_time': '게시 시각 없음'
+        }
+        print(f"♻️ 증분 수집: {reused_count}개 재사용, {len(videos) - reused_count}개 다시 수집")
+        for reason, count in reasons.items():
+            print(f"   • {reason_labels.get(reason, reason)}: {count}개")
+        if missing_series_count:
+            print(f"   ⚠️ 응답 본문이 남아 있지 않은 재사용 비디오 {missing_series_count}개는 시계열(.npz)에 포함되지 않습니다.")
+    
+    def add_reused_series(self, record):
+        """재사용한 이전 레코드의 응답 본문(레코드 안 또는 --raw-bodies spill 파일)에서 시계열을 다시 추출 (성공 여부 반환)"""
+        video_id = record.get('video_id')
+        analytics_data = record.get('analytics_data') or {}
+        try:
+            if not any((tab_data or {}).get('response_data') for tab_data in analytics_data.values()):
+                raw_file = record.get('raw_response_file')
+                if not raw_file or not os.path.exists(raw_file):
+                    return False
+                with gzip.open(raw_file, 'rt', encoding='utf-8') as f:
+                    analytics_data = {tab_name: {'response_data': body} for tab_name, body in json.load(f).items()}
+            
+            metrics = extract_video_metrics(analytics_data, video_id, collect_series=True)
+            self.series_store.add_metrics(video_id, metrics)
+            return bool(metrics.series)
+        except Exception as e:
+            print(f"⚠️ [{video_id}] 재사용 레코드 시계열 추출 실패: {e}")
+            return False
+    
+    def record_video_analytics(self, combined_data):
+        """한 비디오의 종합 데이터를 결과 목록에 추가 (중복 방지)"""
+        video_id = combined_data.get('video_id')
+        with self.results_lock:
+            if video_id in self.completed_video_ids:
+                print(f"⚠️ 비디오 {video_id}는 이미 수집되었습니다. 중복 추가 방지.")
+                return False
+            
+            self.video_analytics_data.append(combined_data)
+            self.completed_video_ids.add(video_id)
+        self.mark_progress()
+        
+        # 중단되더라도 여기까지의 결과는 --resume으로 이어갈 수 있도록 즉시 디스크에 기록
+        try:
+            self.checkpoint.append_record(combined_data)
+        except Exception as e:
+            print(f"⚠️ 체크포인트 기록 실패: {e}")
+        self.stream_analytics_record(combined_data)
+        
+        print(f"✅ 새로운 비디오 데이터 추가됨: {video_id}")
+        return True
+    
     def process_video_with_captured_requests(self, video_id):
-        """캡처된 요청들을 사용해서 비디오 데이터를 바로 수집"""
+        """캡처된 요청들을 사용해서 비디오 데이터를 바로 수집 (워커 스레드에서 실행)"""
         try:
             print(f"🚀 캐시된 요청으로 {video_id} 비디오 데이터 수집 중...")
             
             # 캐시된 요청 확인
-            if not hasattr(self, 'captured_reach_viewers_request') or not hasattr(self, 'captured_interest_viewers_request'):
+            if not self.has_captured_analytics_requests():
                 print(f"❌ 캐시된 요청이 없습니다. 첫 번째 비디오가 제대로 수집되지 않았을 수 있습니다.")
-                # 다음 비디오로 바로 진행
-                self.proceed_to_next_video()
-                return
+                return None
             
-            print(f"✅ 캐시된 요청 발견. API 호출 시작...")
-                    
-            # 수집된 탭별 실제 API 응답 데이터 저장
-            collected_api_responses = {}
+            # reach_viewers / interest_viewers 탭 순서대로 처리
+            reach_response = self.replay_analytics_request(self.captured_reach_viewers_request, video_id)
+            interest_response = self.replay_analytics_request(self.captured_interest_viewers_request, video_id)
             
-            # reach_viewers 탭 처리
-            print(f"📡 reach_viewers 탭 데이터 수집 중...")
-            try:
-                api_response = self.replay_analytics_request(self.captured_reach_viewers_request, video_id)
-                if api_response:
-                    collected_api_responses['reach_viewers'] = {
-                        'api_type': 'get_screen',
-                        'response_data': api_response,
-                        'tab_config': self.analytics_tabs[0]  # reach_viewers는 첫 번째 탭
-                    }
-                    print(f"   ✅ reach_viewers: 성공")
-                    self.extract_metrics_from_get_screen_response_immediate(api_response, video_id)
-                else:
-                    print(f"   ❌ reach_viewers: 실패")
-            except Exception as e:
-                print(f"   ❌ reach_viewers 오류: {e}")
+            return self.build_captured_video_record(video_id, reach_response, interest_response)
+            
+        except Exception as e:
+            print(f"❌ 캐시된 요청으로 비디오 처리 오류: {e}")
+            import traceback
+            traceback.print_exc()
+            return None
+    
+    async def process_video_with_captured_requests_async(self, video_id):
+        """process_video_with_captured_requests의 asyncio 버전 (두 탭을 동시에 요청)"""
+        try:
+            if not self.has_captured_analytics_requests():
+                print(f"❌ 캐시된 요청이 없습니다. 첫 번째 비디오가 제대로 수집되지 않았을 수 있습니다.")
+                return None
+            
+            reach_response, interest_response = await asyncio.gather(
+                self.replay_analytics_request_async(self.captured_reach_viewers_request, video_id),
+                self.replay_analytics_request_async(self.captured_interest_viewers_request, video_id)
+            )
+            
+            # 메트릭 추출/응답 본문 gzip 저장은 이벤트 루프 밖에서 (진행 중인 요청이 멈추지 않도록)
+            return await asyncio.get_running_loop().run_in_executor(
+                None, self.build_captured_video_record, video_id, reach_response, interest_response
+            )
             
-            # interest_viewers 탭 처리  
-            print(f"📡 interest_viewers 탭 데이터 수집 중...")
+        except Exception as e:
+            print(f"❌ 캐시된 요청으로 비디오 처리 오류: {e}")
+            return None
+    
+    def build_captured_video_record(self, video_id, reach_response, interest_response):
+        """캐시된 요청으로 받은 탭별 응답을 하나의 비디오 데이터로 종합"""
+        # 수집된 탭별 실제 API 응답 데이터 저장
+        collected_api_responses = {}
+        
+        if reach_response:
+            collected_api_responses['reach_viewers'] = {
+                'api_type': 'get_screen',
+                'response_data': reach_response,
+                'tab_config': self.analytics_tabs[0]  # reach_viewers는 첫 번째 탭
+            }
+            print(f"   ✅ [{video_id}] reach_viewers: 성공")
+        else:
+            print(f"   ❌ [{video_id}] reach_viewers: 실패")
+        
+        if interest_response:
+            collected_api_responses['interest_viewers'] = {
+                'api_type': 'get_cards',
+                'response_data': interest_response,
+                'tab_config': self.analytics_tabs[1]  # interest_viewers는 두 번째 탭
+            }
+            print(f"   ✅ [{video_id}] interest_viewers: 성공")
+        else:
+            print(f"   ❌ [{video_id}] interest_viewers: 실패")
+        
+        # 기본 비디오 정보 찾기
+        basic_video_info = self.collected_data_by_id.get(video_id)
+        
+        print(f"✅ 비디오 {video_id} 데이터 수집 완료 ({len(collected_api_responses)}/{len(self.analytics_tabs)} 탭)")
+        
+        # 종합된 데이터 반환 (결과 병합은 호출한 쪽에서 순서대로 처리)
+        combined_data = {
+            'video_id': video_id,
+            'video_title': basic_video_info.get('title') if basic_video_info else 'Unknown',
+            'collected_at': datetime.now().isoformat(),
+            'basic_video_info': basic_video_info,
+            'tabs_data': {},  # 캐시된 요청 사용이므로 빈 값
+            'analytics_data': collected_api_responses,  # 실제 API 응답 데이터
+            'retry_count': self.video_retry_counts.get(video_id, 0)
+        }
+        return self.compact_video_record(combined_data)
+    
+    def compact_video_record(self, combined_data):
+        """응답이 도착한 시점에 메트릭을 추출하고, 설정에 따라 응답 본문을 파일로 내보내거나 버림"""
+        video_id = combined_data['video_id']
+        analytics_data = combined_data['analytics_data']
+        metrics = extract_video_metrics(analytics_data, video_id, collect_series=True)
+        self.series_store.add_metrics(video_id, metrics)
+        self.print_video_metrics(video_id, metrics)
+        combined_data['metrics'] = metrics.as_record()
+        
+        if self.raw_bodies == 'keep' or not analytics_data:
+            return combined_data
+        
+        if self.raw_bodies == 'spill':
             try:
-                api_response = self.replay_analytics_request(self.captured_interest_viewers_request, video_id)
-                if api_response:
-                    collected_api_responses['interest_viewers'] = {
-                        'api_type': 'get_cards',
-                        'response_data': api_response,
-                        'tab_config': self.analytics_tabs[1]  # interest_viewers는 두 번째 탭
-                    }
-                    print(f"   ✅ interest_viewers: 성공")
-                    self.extract_metrics_from_get_cards_response_immediate(api_response, video_id)
-                else:
-                    print(f"   ❌ interest_viewers: 실패")
+                self.raw_dir.mkdir(parents=True, exist_ok=True)
+                raw_path = self.raw_dir / f"{video_id}.json.gz"
+                with gzip.open(raw_path, 'wt', encoding='utf-8') as f:
+                    json.dump({tab_name: tab_data['response_data'] for tab_name, tab_data in analytics_data.items()}, f, ensure_ascii=False)
+                combined_data['raw_response_file'] = str(raw_path)
             except Exception as e:
-                print(f"   ❌ interest_viewers 오류: {e}")
+                print(f"⚠️ [{video_id}] 응답 본문 파일 저장 실패 - 본문을 버립니다: {e}")
+        
+        # 탭 항목에는 api_type/tab_config만 남김 (고정 크기 레코드)
+        # 캡처된 요청은 체크포인트/요청 템플릿에 따로 저장되므로 레코드에서 제외
+        combined_data['analytics_data'] = {
+            tab_name: {key: value for key, value in tab_data.items() if key != 'response_data'}
+            for tab_name, tab_data in analytics_data.items()
+        }
+        combined_data['tabs_data'] = {
+            tab_name: {key: value for key, value in tab_data.items() if key != 'captured_request'}
+            for tab_name, tab_data in combined_data.get('tabs_data', {}).items()
+        }
+        return combined_data
+    
+    def print_video_metrics(self, video_id, metrics):
+        """추출된 메트릭을 콘솔에 출력"""
+        print(f"📊 [{video_id}] 애널리틱스 메트릭:")
+        print(f"   📊 노출수: {metric_text(metrics.impressions)}")
+        print(f"   📊 클릭률: {metric_text(metrics.click_rate, '')}%")
+        print(f"   📊 조회수: {metric_text(metrics.views)}")
+        print(f"   📊 시청시간: {metric_text(metrics.watch_time_minutes)}분")
+        print(f"   📊 평균 시청시간: {metric_text(metrics.average_view_duration_seconds)}초")
+        print(f"   📊 평균 조회율: {metric_text(metrics.average_percentage_watched, '')}%")
+        if metrics.subscribers_net_change:
+            print(f"   📊 구독자 증감: {metrics.subscribers_net_change:+,}")
+        for metric, total in metrics.totals.items():
+            if metric not in KEY_METRIC_FIELDS:
+                print(f"   📊 {metric}: {total:,}")
+    
+    def collect_videos_concurrently(self, videos):
+        """캡처된 요청으로 여러 비디오의 애널리틱스를 병렬 수집하고 결과를 순서대로 병합"""
+        try:
+            video_ids = [video.get('videoId') for video in videos]
+            total = len(video_ids)
+            print(f"\n🚀 병렬 애널리틱스 수집 시작: {total}개 비디오, 워커 {self.max_workers}개")
             
-            # 기본 비디오 정보 찾기
-            basic_video_info = None
-            for video in self.collected_data:
-                if video.get('videoId') == video_id:
-                    basic_video_info = video
-                    break
+            started_at = time.time()
             
-            # 중복 체크: 이미 수집된 비디오인지 확인
-            already_exists = any(item.get('video_id') == video_id for item in self.video_analytics_data)
-            
-            if not already_exists:
-                # 종합된 데이터 저장
-                combined_data = {
-                    'video_id': video_id,
-                    'video_title': basic_video_info.get('title') if basic_video_info else 'Unknown',
-                    'collected_at': datetime.now().isoformat(),
-                    'basic_video_info': basic_video_info,
-                    'tabs_data': {},  # 캐시된 요청 사용이므로 빈 값
-                    'analytics_data': collected_api_responses  # 실제 API 응답 데이터
-                }
-                
-                self.video_analytics_data.append(combined_data)
-                print(f"✅ 새로운 비디오 데이터 추가됨: {video_id}")
+            if self.replay_backend == 'asyncio':
+                # 이벤트 루프 하나에서 모든 비디오 요청을 동시에 진행
+                failed_count = self.replay_client.run(self.collect_videos_async(video_ids))
             else:
-                print(f"⚠️ 비디오 {video_id}는 이미 수집되었습니다. 중복 추가 방지.")
-            
-            print(f"✅ 비디오 {video_id} 데이터 수집 완료 ({len(collected_api_responses)}/{len(self.analytics_tabs)} 탭)")
-            print(f"💾 현재까지 수집된 비디오: {len(self.video_analytics_data)}개")
-            
-            # 다음 비디오로 진행
-            self.proceed_to_next_video()
+                failed_count = 0
+                with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='analytics') as executor:
+                    # executor.map은 입력 순서대로 결과를 돌려주므로 병합 순서가 유지됨
+                    results = executor.map(self.process_video_with_captured_requests, video_ids)
+                    for index, (video_id, combined_data) in enumerate(zip(video_ids, results), 1):
+                        if not self.merge_collected_video(index, total, video_id, combined_data):
+                            failed_count += 1
+            
+            elapsed = time.time() - started_at
+            print(f"🎉 병렬 수집 완료: {total - failed_count}/{total}개 성공 ({elapsed:.1f}초)")
+            print(f"   ⏱️ 최종 요청 속도: {self.rate_limiter.rate:.2f}회/초 (제한 응답 {self.rate_limiter.throttled_count}회)")
             
         except Exception as e:
-            print(f"❌ 캐시된 요청으로 비디오 처리 오류: {e}")
+            print(f"❌ 병렬 애널리틱스 수집 오류: {e}")
             import traceback
             traceback.print_exc()
-            # 오류가 나도 다음 비디오로 진행
-            self.proceed_to_next_video()
+        
+        # 실패한 비디오가 있어도 다시 돌지 않고 전체 수집을 마무리
+        self.complete_analytics_collection()
+    
+    async def collect_videos_async(self, video_ids):
+        """asyncio 백엔드 병렬 수집 - 동시 요청 수를 제한하고 결과는 입력 순서대로 병합"""
+        semaphore = asyncio.Semaphore(self.max_workers)
+        
+        async def limited(video_id):
+            async with semaphore:
+                return await self.process_video_with_captured_requests_async(video_id)
+        
+        tasks = [asyncio.ensure_future(limited(video_id)) for video_id in video_ids]
+        failed_count = 0
+        loop = asyncio.get_running_loop()
+        
+        # 앞쪽 비디오부터 차례로 기다리며 병합 (뒤쪽 요청은 그동안 계속 진행)
+        # 체크포인트 fsync, 엑셀 스트리밍(썸네일 다운로드)은 병합 전용 스레드 하나에서 순서대로 처리
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix='analytics-merge') as merge_executor:
+            for index, (video_id, task) in enumerate(zip(video_ids, tasks), 1):
+                combined_data = await task
+                merged = await loop.run_in_executor(
+                    merge_executor, self.merge_collected_video, index, len(video_ids), video_id, combined_data
+                )
+                if not merged:
+                    failed_count += 1
+        
+        return failed_count
+    
+    def merge_collected_video(self, index, total, video_id, combined_data):
+        """병렬 수집된 비디오 결과 하나를 병합하고 진행 상황 출력"""
+        self.mark_progress()
+        if combined_data:
+            self.record_video_analytics(combined_data)
+        else:
+            print(f"❌ 비디오 {video_id} 수집 실패")
+        
+        print(f"💾 진행 상황: [{index}/{total}] (현재까지 수집된 비디오: {len(self.video_analytics_data)}개)")
+        return combined_data is not None
     
     def proceed_to_next_tab(self, current_video_id):
         """다음 탭으로 이동하거나 다음 비디오로 진행"""
@@ -2280,6 +3717,7 @@ class YouTubeStudioMonitor:
                     # 현재 비디오의 모든 탭 수집 완료
                     print(f"🎉 비디오 {current_video_id}의 모든 탭 수집 완료!")
                     print(f"   수집된 탭들: {list(self.collected_analytics_data.keys())}")
+                    self.set_resource_blocking(False)  # 브라우저 캡처가 끝났으므로 페이지를 원래대로
                     self.finalize_video_analytics(current_video_id)
                     
                     # 다음 비디오로 진행하거나 전체 수집 완료
@@ -2305,8 +3743,12 @@ class YouTubeStudioMonitor:
                     captured_request = tab_data['captured_request']
                     api_type = tab_data['api_type']
                     
-                    # 캡처된 요청을 복제해서 실제 응답 데이터 가져오기
-                    api_response = self.replay_analytics_request(captured_request, video_id)
+                    # 브라우저가 받은 응답이 있으면 그대로 사용, 없을 때만 캡처된 요청을 복제
+                    api_response = tab_data.get('response_data')
+                    if api_response:
+                        print(f"   📥 브라우저 응답 사용 (복제 요청 생략)")
+                    else:
+                        api_response = self.replay_analytics_request(captured_request, video_id)
                     
                     if api_response:
                         collected_api_responses[tab_name] = {
@@ -2315,42 +3757,28 @@ class YouTubeStudioMonitor:
                             'tab_config': tab_data['tab_config']
                         }
                         print(f"   ✅ {tab_name}: API 응답 수집 완료")
-                        
-                        # CTR과 노출수 즉시 추출 및 출력
-                        if api_type == 'get_screen':
-                            self.extract_metrics_from_get_screen_response_immediate(api_response, video_id)
-                        elif api_type == 'get_cards':
-                            self.extract_metrics_from_get_cards_response_immediate(api_response, video_id)
                     else:
                         print(f"   ❌ {tab_name}: API 응답 수집 실패")
                 else:
                     print(f"   ⚠️ {tab_name}: 캡처된 요청 없음")
             
             # 기본 비디오 정보 찾기
-            basic_video_info = None
-            for video in self.collected_data:
-                if video.get('videoId') == video_id:
-                    basic_video_info = video
-                    break
+            basic_video_info = self.collected_data_by_id.get(video_id)
             
-            # 중복 체크: 이미 수집된 비디오인지 확인
-            already_exists = any(item.get('video_id') == video_id for item in self.video_analytics_data)
-            
-            if not already_exists:
-                # 종합된 데이터 저장
-                combined_data = {
-                    'video_id': video_id,
-                    'video_title': basic_video_info.get('title') if basic_video_info else 'Unknown',
-                    'collected_at': datetime.now().isoformat(),
-                    'basic_video_info': basic_video_info,
-                    'tabs_data': self.collected_analytics_data.copy(),
-                    'analytics_data': collected_api_responses  # 실제 API 응답 데이터
-                }
-                
-                self.video_analytics_data.append(combined_data)
-                print(f"✅ 새로운 비디오 데이터 추가됨: {video_id}")
-            else:
-                print(f"⚠️ 비디오 {video_id}는 이미 수집되었습니다. 중복 추가 방지.")
+            # 종합된 데이터 저장 (중복 체크 포함)
+            combined_data = {
+                'video_id': video_id,
+                'video_title': basic_video_info.get('title') if basic_video_info else 'Unknown',
+                'collected_at': datetime.now().isoformat(),
+                'basic_video_info': basic_video_info,
+                'tabs_data': {  # 응답 본문은 analytics_data에만 보관
+                    tab_name: {key: value for key, value in tab_data.items() if key != 'response_data'}
+                    for tab_name, tab_data in self.collected_analytics_data.items() if tab_data
+                },
+                'analytics_data': collected_api_responses,  # 실제 API 응답 데이터
+                'retry_count': self.video_retry_counts.get(video_id, 0)
+            }
+            self.record_video_analytics(self.compact_video_record(combined_data))
             
             print(f"📊 비디오 {video_id} 데이터 종합 완료:")
             for tab_name, tab_data in self.collected_analytics_data.items():
@@ -2360,7 +3788,7 @@ class YouTubeStudioMonitor:
                     print(f"   ❌ {tab_name}: 데이터 없음")
             
             # 첫 번째 비디오라면 캡처된 요청들을 저장해서 다른 비디오들이 사용할 수 있게 함
-            if len(self.video_analytics_data) == 1:
+            if not self.has_captured_analytics_requests():
                 print(f"💾 첫 번째 비디오의 캡처된 요청들을 저장 중...")
                 for tab_name, tab_data in self.collected_analytics_data.items():
                     if tab_data and 'captured_request' in tab_data:
@@ -2370,6 +3798,12 @@ class YouTubeStudioMonitor:
                         elif tab_name == 'interest_viewers':
                             self.captured_interest_viewers_request = tab_data['captured_request']
                             print(f"   ✅ interest_viewers 요청 저장됨")
+                if self.has_captured_analytics_requests():
+                    self.checkpoint.save_templates(
+                        self.captured_reach_viewers_request, self.captured_interest_viewers_request
+                    )
+                    self.save_request_template('get_screen', self.captured_reach_viewers_request)
+                    self.save_request_template('get_cards', self.captured_interest_viewers_request)
             
             print(f"💾 현재까지 수집된 비디오: {len(self.video_analytics_data)}개")
             print(f"🔄 다음 비디오 처리 또는 전체 완료 대기 중...")
@@ -2382,36 +3816,33 @@ class YouTubeStudioMonitor:
     def proceed_to_next_video(self):
         """다음 비디오 처리 또는 전체 수집 완료"""
         try:
-            print(f"🔄 다음 비디오로 진행 중... (현재 수집: {len(self.video_analytics_data)}개)")
+            pending_videos = self.get_pending_videos()
+            print(f"🔄 다음 비디오로 진행 중... (현재 수집: {len(self.video_analytics_data)}개, 남은 비디오: {len(pending_videos)}개)")
             
-            # 다음 비디오 찾기
-            if len(self.video_analytics_data) < len(self.collected_data):
-                next_video_index = len(self.video_analytics_data)
-                next_video = self.collected_data[next_video_index]
+            if pending_videos and self.has_captured_analytics_requests():
+                # 캡처된 요청이 있으면 남은 비디오 전체를 병렬 수집 엔진으로 처리
+                # (CDP 메시지 수신 스레드를 막지 않도록 별도 스레드에서 실행)
+                threading.Thread(
+                    target=self.collect_videos_concurrently,
+                    args=(pending_videos,),
+                    daemon=True
+                ).start()
+                
+            elif pending_videos:
+                # 아직 캡처된 요청이 없으면 다음 비디오로 브라우저 캡처를 다시 시도
+                next_video = pending_videos[0]
                 next_video_id = next_video.get('videoId')
                 next_video_title = next_video.get('title', '제목없음')[:30]
+                print(f"📹 {next_video_title} (ID: {next_video_id}) - 브라우저로 요청 캡처 재시도")
                 
-                print(f"📹 [{next_video_index + 1}/{len(self.collected_data)}] {next_video_title} (ID: {next_video_id})")
-                
-                # 다음 비디오의 다중 탭 수집 시작 (짧은 지연 후)
-                def delayed_start():
-                    time.sleep(2)  # 2초 대기로 안정성 확보
-                    self.start_multi_tab_analytics_collection(next_video_id)
-                
-                threading.Thread(target=delayed_start, daemon=True).start()
+                threading.Thread(
+                    target=self.start_multi_tab_analytics_collection,
+                    args=(next_video_id,),
+                    daemon=True
+                ).start()
                 
             else:
-                # 모든 비디오 처리 완료
-                print(f"🎉 모든 {len(self.collected_data)}개 비디오의 수집 완료!")
-                print(f"📊 총 수집된 비디오: {len(self.video_analytics_data)}개")
-                
-                if self.video_analytics_data:
-                    print(f"💾 엑셀 파일로 저장합니다...")
-                self.save_analytics_data(self.video_analytics_data)
-                
-                # 모니터링 중단
-                print(f"🏁 모든 데이터 수집 완료! 모니터링을 중단합니다.")
-                self.monitoring = False
+                self.complete_analytics_collection()
             
         except Exception as e:
             print(f"❌ 다음 비디오 진행 오류: {e}")
@@ -2421,179 +3852,133 @@ class YouTubeStudioMonitor:
             print(f"🛑 오류로 인해 모니터링을 중단합니다.")
             self.monitoring = False
     
+    def complete_analytics_collection(self):
+        """모든 비디오 처리 완료 - 결과 저장 후 모니터링 중단"""
+        print(f"🎉 모든 {len(self.collected_data)}개 비디오의 수집 완료!")
+        print(f"📊 총 수집된 비디오: {len(self.video_analytics_data)}개")
+        
+        # 재시도 요약 (어떤 비디오가 일시적 오류를 겪었는지)
+        if self.video_retry_counts:
+            retried = sorted(self.video_retry_counts.items(), key=lambda item: item[1], reverse=True)
+            print(f"🔁 재시도 발생 비디오: {len(retried)}개 (총 {sum(self.video_retry_counts.values())}회)")
+            for video_id, retry_count in retried[:5]:
+                print(f"   • {video_id}: {retry_count}회")
+        
+        # 재사용/병렬 수집 레코드를 비디오 목록 순서대로 정렬
+        video_order = {video.get('videoId'): index for index, video in enumerate(self.collected_data)}
+        with self.results_lock:
+            self.video_analytics_data.sort(key=lambda record: video_order.get(record.get('video_id'), len(video_order)))
+        
+        if self.video_analytics_data:
+            print(f"💾 엑셀 파일로 저장합니다...")
+        self.save_analytics_data(self.video_analytics_data)
+        
+        if self.incremental_store is not None:
+            try:
+                self.incremental_store.update(self.video_analytics_data)
+                self.incremental_store.save()
+                print(f"♻️ 증분 저장소 갱신: {self.incremental_store.path} ({len(self.incremental_store.videos)}개 비디오)")
+            except Exception as e:
+                print(f"⚠️ 증분 저장소 저장 실패: {e}")
+        
+        if not self.get_pending_videos():
+            self.checkpoint.mark_completed()
+        
+        # 모니터링 중단 (start_monitoring 대기 루프가 즉시 종료됨)
+        print(f"🏁 모든 데이터 수집 완료! 모니터링을 중단합니다.")
+        self.monitoring = False
+        self.collection_done.set()
+    
+    def get_compiled_payload(self, post_data):
+        """캡처된 POST 바디의 바이트 템플릿 반환 (처음 한 번만 컴파일, 파싱 실패 시 None)"""
+        if post_data not in self.compiled_payloads:
+            try:
+                compiled = CompiledPayload(post_data)
+                if compiled.video_id_paths:
+                    print(f"   📐 페이로드 템플릿 컴파일: videoId {len(compiled.video_id_paths)}곳 ({', '.join(compiled.video_id_paths)})")
+            except (ValueError, TypeError):
+                compiled = None
+                print(f"   ⚠️ 페이로드 템플릿 컴파일 실패 - 원본 바디 사용")
+            self.compiled_payloads[post_data] = compiled
+        return self.compiled_payloads[post_data]
+    
+    def build_analytics_post_data(self, captured_request, video_id):
+        """캡처된 애널리틱스 요청 바디에서 비디오 ID를 교체한 POST 데이터(bytes) 생성"""
+        post_data = captured_request['postData']
+        
+        # 비디오 ID 교체 (필요한 경우) - 컴파일된 템플릿에 ID만 이어 붙임
+        if post_data:
+            compiled = self.get_compiled_payload(post_data)
+            if compiled and compiled.video_id_paths:
+                return compiled.render(video_id=video_id)
+        
+        return post_data
+    
+    def parse_analytics_response(self, response):
+        """복제 요청 응답을 JSON으로 변환 (실패 시 None)"""
+        print(f"   📨 응답 수신: {response.status_code}")
+        
+        if response.status_code == 200:
+            try:
+                return response.json()
+            except json.JSONDecodeError:
+                print(f"   ❌ JSON 파싱 실패")
+                return None
+        else:
+            print(f"   ❌ HTTP 에러: {response.status_code}")
+            return None
+    
     def replay_analytics_request(self, captured_request, video_id):
         """캡처된 애널리틱스 요청을 복제해서 API 응답 가져오기"""
         try:
-            url = captured_request['url']
-            method = captured_request['method']
-            headers = captured_request['headers'].copy()
-            post_data = captured_request['postData']
-            
             print(f"   📡 API 요청 시작... (타임아웃: 15초)")
+            post_data = self.build_analytics_post_data(captured_request, video_id)
             
-            # 비디오 ID 교체 (필요한 경우)
-            if post_data:
-                try:
-                    payload = json.loads(post_data)
-                    modified_payload = self.replace_video_id_in_payload(payload, video_id)
-                    if modified_payload:
-                        post_data = json.dumps(modified_payload, separators=(',', ':'))
-                        print(f"   🔄 비디오 ID 교체 완료")
-                except:
-                    print(f"   ⚠️ 비디오 ID 교체 실패 - 원본 사용")
-            
-            # requests 세션 생성
-            session = requests.Session()
-            
-            # 쿠키 설정
-            if 'Cookie' in headers:
-                cookie_str = headers['Cookie']
-                cookies = {}
-                for item in cookie_str.split(';'):
-                    if '=' in item:
-                        key, value = item.strip().split('=', 1)
-                        cookies[key] = value
-                session.cookies.update(cookies)
-                print(f"   🍪 쿠키 설정 완료 ({len(cookies)}개)")
-            
-            # Content-Length 제거
-            headers.pop('Content-Length', None)
-            
-            # 요청 전송 (더 짧은 타임아웃)
-            if method.upper() == 'POST' and post_data:
-                try:
-                    json_data = json.loads(post_data)
-                    response = session.post(url, headers=headers, json=json_data, timeout=15)
-                except json.JSONDecodeError:
-                    response = session.post(url, headers=headers, data=post_data, timeout=15)
-            else:
-                response = session.get(url, headers=headers, timeout=15)
-            
-            print(f"   📨 응답 수신: {response.status_code}")
-            
-            if response.status_code == 200:
-                try:
-                    return response.json()
-                except json.JSONDecodeError:
-                    print(f"   ❌ JSON 파싱 실패")
-                    return None
-            else:
-                print(f"   ❌ HTTP 에러: {response.status_code}")
-                return None
+            # 요청 전송 (공유 클라이언트의 연결 풀 재사용, 더 짧은 타임아웃, 재시도 포함)
+            response = self.replay_client.send(
+                captured_request['url'], captured_request['method'], captured_request['headers'], post_data, timeout=15
+            )
+            self.add_retry_count(video_id, response)
+            return self.parse_analytics_response(response)
                 
-        except requests.Timeout:
+        except requests.Timeout as e:
+            self.add_retry_count(video_id, e)
             print(f"   ⏰ API 요청 타임아웃 (15초)")
             return None
         except Exception as e:
+            self.add_retry_count(video_id, e)
             print(f"   ❌ API 요청 오류: {e}")
             return None
     
-    def extract_metrics_from_get_cards_response_immediate(self, cards_data, video_id):
-        """get_cards API 응답에서 즉시 메트릭 추출 및 출력"""
+    async def replay_analytics_request_async(self, captured_request, video_id):
+        """replay_analytics_request의 asyncio 버전 (asyncio 백엔드 전용)"""
         try:
-            print(f"📊 [{video_id}] get_cards 데이터에서 조회수/시청시간 추출:")
-            
-            if 'cards' in cards_data:
-                cards = cards_data['cards']
-                for card in cards:
-                    if 'keyMetricCardData' in card:
-                        tabs = card['keyMetricCardData'].get('keyMetricTabs', [])
-                        for tab in tabs:
-                            primary_content = tab.get('primaryContent', {})
-                            metric = primary_content.get('metric', '')
-                            total = primary_content.get('total', 0)
-                            
-                            if metric in ['EXTERNAL_VIEWS', 'VIEWS']:
-                                print(f"   📊 조회수: {total:,}")
-                            elif metric in ['EXTERNAL_WATCH_TIME', 'WATCH_TIME']:
-                                # 시청시간 밀리초→분 변환
-                                print(f"   🔍 시청시간 원본: 메트릭='{metric}', 값={total:,}")
-                                minutes = round(total / 1000 / 60, 1)
-                                print(f"   📊 시청시간(밀리초→분): {total:,}ms = {minutes:.1f}분")
-                            elif metric in ['WATCH_TIME_MINUTES']:
-                                print(f"   🔍 시청시간 원본: 메트릭='{metric}', 값={total:,}")
-                                print(f"   📊 시청시간(분단위): {total:,}분")
-                            elif metric in ['AVERAGE_VIEW_DURATION', 'AVG_VIEW_DURATION', 'AVERAGE_VIEW_DURATION_SECONDS', 'VIEW_DURATION_AVG']:
-                                print(f"   📊 평균 시청시간: {total:,}초")
-                            elif metric in ['SUBSCRIBERS_NET_CHANGE']:
-                                print(f"   📊 구독자 증감: {total:+,}")
-                            elif metric:
-                                print(f"   📊 {metric}: {total:,}")
-                    
-                    # audienceRetentionHighlightsCardData에서 평균 시청시간과 평균 조회율 추출
-                    elif 'audienceRetentionHighlightsCardData' in card:
-                        videos_data = card['audienceRetentionHighlightsCardData'].get('videosData', [])
-                        for video_data in videos_data:
-                            if video_data.get('videoId') == video_id:
-                                metric_totals = video_data.get('metricTotals', {})
-                                
-                                # 평균 시청시간 (밀리초 → 초)
-                                avg_duration_millis = metric_totals.get('avgViewDurationMillis', 0)
-                                if avg_duration_millis:
-                                    avg_duration_seconds = round(avg_duration_millis / 1000)
-                                    print(f"   📊 평균 시청시간: {avg_duration_millis:,}ms = {avg_duration_seconds:,}초")
-                                
-                                # 평균 조회율 (소수 → 퍼센트)
-                                avg_percentage = metric_totals.get('avgPercentageWatched', 0)
-                                if avg_percentage:
-                                    avg_percentage_display = round(avg_percentage * 100, 2)
-                                    print(f"   📊 평균 조회율: {avg_percentage:.4f} = {avg_percentage_display}%")
-                                
-                                break
+            post_data = self.build_analytics_post_data(captured_request, video_id)
+            response = await self.replay_client.send_async(
+                captured_request['url'], captured_request['method'], captured_request['headers'], post_data, timeout=15
+            )
+            self.add_retry_count(video_id, response)
+            return self.parse_analytics_response(response)
             
+        except asyncio.TimeoutError as e:
+            self.add_retry_count(video_id, e)
+            print(f"   ⏰ API 요청 타임아웃 (15초)")
+            return None
         except Exception as e:
-            print(f"❌ get_cards 메트릭 추출 오류: {e}")
+            self.add_retry_count(video_id, e)
+            print(f"   ❌ API 요청 오류: {e}")
+            return None
     
-    def extract_metrics_from_get_screen_response_immediate(self, screen_data, video_id):
-        """get_screen API 응답에서 즉시 메트릭 추출 및 출력"""
-        try:
-            print(f"📊 [{video_id}] get_screen 데이터에서 CTR/노출수 추출:")
-            
-            if 'cards' in screen_data:
-                cards = screen_data['cards']
-                for card in cards:
-                    if 'keyMetricCardData' in card:
-                        tabs = card['keyMetricCardData'].get('keyMetricTabs', [])
-                        for tab in tabs:
-                            primary_content = tab.get('primaryContent', {})
-                            metric = primary_content.get('metric', '')
-                            total = primary_content.get('total', 0)
-                            
-                            if metric == 'VIDEO_THUMBNAIL_IMPRESSIONS':
-                                print(f"   📊 노출수: {total:,}")
-                            elif metric == 'VIDEO_THUMBNAIL_IMPRESSIONS_VTR':
-                                print(f"   📊 클릭률: {total}%")
-                            elif metric in ['AVERAGE_VIEW_DURATION', 'AVG_VIEW_DURATION', 'AVERAGE_VIEW_DURATION_SECONDS', 'VIEW_DURATION_AVG']:
-                                print(f"   📊 평균 시청시간: {total:,}초")
-                            elif metric:
-                                print(f"   📊 {metric}: {total:,}")
-                    
-                    # audienceRetentionHighlightsCardData에서 평균 시청시간과 평균 조회율 추출
-                    elif 'audienceRetentionHighlightsCardData' in card:
-                        videos_data = card['audienceRetentionHighlightsCardData'].get('videosData', [])
-                        for video_data in videos_data:
-                            if video_data.get('videoId') == video_id:
-                                metric_totals = video_data.get('metricTotals', {})
-                                
-                                # 평균 시청시간 (밀리초 → 초)
-                                avg_duration_millis = metric_totals.get('avgViewDurationMillis', 0)
-                                if avg_duration_millis:
-                                    avg_duration_seconds = round(avg_duration_millis / 1000)
-                                    print(f"   📊 평균 시청시간: {avg_duration_millis:,}ms = {avg_duration_seconds:,}초")
-                                
-                                # 평균 조회율 (소수 → 퍼센트)
-                                avg_percentage = metric_totals.get('avgPercentageWatched', 0)
-                                if avg_percentage:
-                                    avg_percentage_display = round(avg_percentage * 100, 2)
-                                    print(f"   📊 평균 조회율: {avg_percentage:.4f} = {avg_percentage_display}%")
-                                
-                                break
-            
-        except Exception as e:
-            print(f"❌ get_screen 메트릭 추출 오류: {e}")
+    def add_retry_count(self, video_id, result):
+        """응답/예외에 기록된 재시도 횟수를 비디오별로 누적"""
+        retry_count = getattr(result, 'retry_count', 0)
+        if retry_count:
+            with self.results_lock:
+                self.video_retry_counts[video_id] = self.video_retry_counts.get(video_id, 0) + retry_count
+            print(f"   🔁 [{video_id}] 재시도 {retry_count}회 후 완료")
     
     def extract_metrics_from_get_cards_response(self, cards_data):
-        """get_cards API 응답에서 메트릭 추출"""
+        """get_cards API 응답에서 메트릭 추출 (원래 메트릭 이름 + 시계열)"""
         try:
             extracted_metrics = {}
             
@@ -2601,45 +3986,26 @@ class YouTubeStudioMonitor:
                 print("⚠️ cards 데이터가 없습니다.")
                 return extracted_metrics
             
-            cards = cards_data['cards']
-            print(f"🔍 {len(cards)}개 카드에서 데이터 추출 중...")
+            print(f"🔍 {len(cards_data['cards'])}개 카드에서 데이터 추출 중...")
+            metrics = extract_response_metrics(cards_data, None, collect_series=True)
             
-            for i, card in enumerate(cards):
-                print(f"   카드 {i+1}: {list(card.keys())}")
+            for metric, total in metrics.totals.items():
+                print(f"     📊 {metric}: {total:,}")
+                extracted_metrics[metric] = total
                 
-                # keyMetricCardData에서 주요 지표 추출
-                if 'keyMetricCardData' in card:
-                    tabs = card['keyMetricCardData'].get('keyMetricTabs', [])
-                    for tab in tabs:
-                        primary_content = tab.get('primaryContent', {})
-                        metric = primary_content.get('metric', '')
-                        total = primary_content.get('total', 0)
-                        
-                        if metric and total is not None:
-                            print(f"     📊 {metric}: {total:,}")
-                            extracted_metrics[metric] = total
-                            
-                            # 시계열 데이터도 추출 (타임스탬프 변환)
-                            main_series = primary_content.get('mainSeries', {})
-                            datums = main_series.get('datums', [])
-                            if datums:
-                                converted_datums = []
-                                for datum in datums:
-                                    x = datum.get('x')  # 유닉스 타임스탬프
-                                    y = datum.get('y')  # 값
-                                    converted_datums.append({
-                                        'timestamp': self.convert_unix_timestamp(x),
-                                        'unix_timestamp': x,
-                                        'value': y
-                                    })
-                                extracted_metrics[f'{metric}_timeseries'] = converted_datums
-                
-                # personalizedHeaderCardData에서 제목 정보 추출
-                if 'personalizedHeaderCardData' in card:
-                    title = card['personalizedHeaderCardData'].get('title', '')
-                    if title:
-                        print(f"     📝 카드 제목: {title}")
-                        extracted_metrics['header_title'] = title
+                # 시계열 데이터도 추출 (유닉스 타임스탬프(ms) -> datetime64 일괄 변환)
+                datums = metrics.series.get(metric)
+                if datums:
+                    timestamps, values = series_columns(datums)
+                    extracted_metrics[f'{metric}_timeseries'] = {
+                        'timestamp': timestamps.astype('datetime64[ms]'),
+                        'unix_timestamp': timestamps,
+                        'value': values
+                    }
+            
+            if metrics.header_title:
+                print(f"     📝 카드 제목: {metrics.header_title}")
+                extracted_metrics['header_title'] = metrics.header_title
             
             print(f"✅ 총 {len(extracted_metrics)}개 메트릭 추출 완료")
             return extracted_metrics
@@ -2649,19 +4015,16 @@ class YouTubeStudioMonitor:
             return {}
     
     def extract_metrics_from_get_screen_response(self, screen_data):
-        """get_screen API 응답에서 메트릭 추출"""
+        """get_screen API 응답에서 메트릭 추출 (원래 메트릭 이름 -> total)"""
         try:
-            extracted_metrics = {}
-            
             if not screen_data:
                 print("⚠️ screen 데이터가 없습니다.")
-                return extracted_metrics
+                return {}
             
             print(f"🔍 get_screen 데이터에서 메트릭 추출 중...")
-            print(f"   응답 키들: {list(screen_data.keys())}")
-            
-            # get_screen 응답 구조에 따라 데이터 추출 로직 구현
-            # (실제 응답 구조를 보고 나중에 상세 구현)
+            extracted_metrics = dict(extract_response_metrics(screen_data, None).totals)
+            for metric, total in extracted_metrics.items():
+                print(f"     📊 {metric}: {total:,}")
             
             return extracted_metrics
             
@@ -2670,6 +4033,69 @@ class YouTubeStudioMonitor:
             return {}
 
 def main():
+    parser = argparse.ArgumentParser(description="YouTube Studio 다중 탭 애널리틱스 수집 시스템")
+    parser.add_argument('--workers', type=int, default=8,
+                        help='두 번째 이후 비디오의 애널리틱스를 병렬로 수집할 워커 수 (기본: 8)')
+    parser.add_argument('--backend', choices=['threads', 'asyncio'], default='threads',
+                        help='복제 요청 백엔드: threads(requests 스레드 풀) 또는 asyncio(aiohttp 이벤트 루프)')
+    parser.add_argument('--rate', type=float, default=5.0,
+                        help='youtubei 요청 시작 속도 (초당 요청 수, 기본: 5). 응답 상태에 따라 자동 조절됨')
+    parser.add_argument('--burst', type=int, default=10,
+                        help='한 번에 연속으로 보낼 수 있는 최대 요청 수 (기본: 10)')
+    parser.add_argument('--capture-mode', choices=['network', 'fetch'], default='network',
+                        help='요청 캡처 방식: network(Network 도메인 전체 이벤트) 또는 fetch(youtubei 요청만 브라우저에서 필터링)')
+    parser.add_argument('--lean-capture', action='store_true',
+                        help='애널리틱스 탭 캡처 중 이미지/영상/폰트/추적 리소스를 차단해 브라우저 부하를 줄임')
+    parser.add_argument('--headless', action='store_true',
+                        help='로그인된 프로필이 있으면 화면 없는 Chrome으로 무인 실행 (엔터 입력 불필요)')
+    parser.add_argument('--idle-timeout', type=int, default=300,
+                        help='이 시간(초) 동안 수집 진행이 없으면 중단 (기본: 300). 전체 수집 시간에는 제한 없음')
+    parser.add_argument('--incremental', action='store_true',
+                        help='이전 실행 결과와 비교해 새 비디오/조회수 변경/최근 게시 비디오만 다시 수집')
+    parser.add_argument('--recent-days', type=int, default=7,
+                        help='증분 모드에서 항상 다시 수집할 최근 게시 기간 (일, 기본: 7)')
+    parser.add_argument('--raw-bodies', choices=['keep', 'spill', 'drop'], default='keep',
+                        help='애널리틱스 응답 본문 보관: keep(레코드에 보관), spill(비디오별 gzip 파일), drop(메트릭만 보관)')
+    parser.add_argument('--raw-dir', default='raw_responses',
+                        help='--raw-bodies spill일 때 응답 본문 gzip 파일을 저장할 폴더 (기본: raw_responses)')
+    parser.add_argument('--thumbnail-cache', default='thumbnail_cache',
+                        help='엑셀 썸네일 디스크 캐시 폴더 (기본: thumbnail_cache). 같은 URL은 다음 실행부터 다시 받지 않음')
+    parser.add_argument('--thumbnail-quality', type=int, default=80,
+                        help='엑셀에 넣는 셀 크기 썸네일의 JPEG 품질 (1-95, 기본: 80)')
+    parser.add_argument('--stream-excel', action='store_true',
+                        help='비디오 결과가 확정될 때마다 애널리틱스 엑셀 행을 바로 기록 (대규모 채널용, 행은 확정 순서)')
+    parser.add_argument('--parquet', action='store_true',
+                        help='비디오당 한 행(기본 정보 + 애널리틱스 메트릭)의 Parquet 파일도 저장 (pyarrow 필요)')
+    parser.add_argument('--parquet-dataset', default=None,
+                        help='Parquet를 이 폴더에 채널/수집 날짜별로 분할해 누적 저장 (--parquet 포함)')
+    parser.add_argument('--history-db', default='youtube_history.db',
+                        help='실행마다 비디오/메트릭 스냅샷을 누적하는 SQLite 기록 DB (기본: youtube_history.db)')
+    parser.add_argument('--no-history', action='store_true',
+                        help='SQLite 기록 DB에 저장하지 않음')
+    parser.add_argument('--trend', nargs=2, metavar=('VIDEO_ID', 'METRIC'), default=None,
+                        help='수집 없이 기록 DB에서 비디오 메트릭 추이만 출력 (예: --trend abc123 click_rate)')
+    parser.add_argument('--trend-days', type=int, default=30,
+                        help='--trend 조회 기간 (일, 기본: 30)')
+    parser.add_argument('--use-templates', action='store_true',
+                        help='저장된 요청 템플릿(request_templates.json)과 최신 쿠키로 페이지 이동 없이 수집')
+    parser.add_argument('--resume', action='store_true',
+                        help='체크포인트에서 이어서 수집 (완료된 비디오는 건너뜀)')
+    parser.add_argument('--checkpoint-dir', default='collection_checkpoint',
+                        help='진행 상황 체크포인트 폴더 (기본: collection_checkpoint)')
+    args = parser.parse_args()
+    
+    if args.trend:
+        video_id, metric = args.trend
+        try:
+            rows = HistoryStore(args.history_db).metric_trend(video_id, metric, args.trend_days)
+        except sqlite3.Error as e:
+            print(f"❌ 기록 DB를 읽을 수 없습니다 ({args.history_db}): {e}")
+            return
+        print(f"📈 {video_id} {metric} 최근 {args.trend_days}일 추이 ({len(rows)}개 스냅샷)")
+        for collected_at, value in rows:
+            print(f"   {collected_at}  {value}")
+        return
+    
     print("YouTube Studio 다중 탭 애널리틱스 수집 시스템")
     print("=" * 80)
     print("🎯 실제 네트워크 요청을 감지하고 그대로 복제하여 완전한 데이터를 수집합니다!")
@@ -2685,7 +4111,7 @@ def main():
     print("   🔸 2단계: 각 비디오 다중 탭 애널리틱스 수집")  
     print("     • tab-reach_viewers → get_screen API (노출수, CTR)")
     print("     • tab-interest_viewers → get_cards API (조회수, 시청시간, 구독자)")
-    print("     • 각 탭을 순차적으로 방문하여 모든 데이터 수집")
+    print("     • 첫 번째 비디오의 탭을 방문해 요청 캡처 후 나머지 비디오는 병렬 수집")
     print("     • 유닉스 타임스탬프를 사람이 읽을 수 있는 형식으로 변환")
     print("\n✨ 특징:")
     print("   • 계정 변경 가능 - 수동 로그인으로 원하는 계정 선택")
@@ -2696,14 +4122,37 @@ def main():
     print("   • 자동으로 모든 데이터를 JSON으로 저장")
     print("   • 성공한 요청만 복제하여 높은 성공률")
     
-    monitor = YouTubeStudioMonitor()
+    monitor = YouTubeStudioMonitor(
+        max_workers=args.workers,
+        replay_backend=args.backend,
+        requests_per_second=args.rate,
+        burst=args.burst,
+        checkpoint_dir=args.checkpoint_dir,
+        incremental=args.incremental,
+        recent_days=args.recent_days,
+        capture_mode=args.capture_mode,
+        lean_capture=args.lean_capture,
+        headless=args.headless,
+        raw_bodies=args.raw_bodies,
+        raw_dir=args.raw_dir,
+        thumbnail_cache_dir=args.thumbnail_cache,
+        thumbnail_quality=args.thumbnail_quality,
+        stream_excel=args.stream_excel,
+        parquet=args.parquet,
+        parquet_dataset_dir=args.parquet_dataset,
+        history_db=None if args.no_history else args.history_db
+    )
     
     try:
-        # 모니터링 시작 (충분한 시간 제공)
-        monitor.start_monitoring(300)  # 5분으로 증가 (2단계 수집)
+        if args.resume:
+            monitor.resume_collection(args.idle_timeout)
+        elif not (args.use_templates and monitor.run_from_templates(args.idle_timeout)):
+            # 모니터링 시작 (수집 완료 시 즉시 종료, 진행이 멈춘 경우에만 타임아웃)
+            monitor.start_monitoring(args.idle_timeout)
         
     except KeyboardInterrupt:
         print("\n사용자에 의해 중단되었습니다.")
+        print(f"💾 완료된 비디오는 {args.checkpoint_dir}에 저장되어 있습니다. --resume으로 이어서 수집할 수 있습니다.")
     except Exception as e:
         print(f"오류 발생: {e}")
     finally:
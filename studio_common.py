@@ -0,0 +1,602 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# once.py와 보조 스크립트(extract_token.py, create_final_excel.py)가 함께 쓰는 가벼운 도구 모음
+# (요청 복제 클라이언트, 속도 제한/재시도, SAPISID 서명, 메트릭 추출, 썸네일 캐시)
+# pandas/numpy/openpyxl/websocket 없이 import 됩니다.
+
+import time
+import hashlib
+import random
+import asyncio
+import threading
+import os
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from pathlib import Path
+from dataclasses import dataclass, field, asdict
+from typing import Optional
+from io import BytesIO
+
+
+class AdaptiveRateLimiter:
+    """모든 youtubei 요청이 공유하는 적응형 토큰 버킷 속도 제한기
+
+    초당 rate개의 토큰이 채워지고 최대 burst개까지 한 번에 보낼 수 있습니다.
+    429/503 응답을 받으면 속도를 절반으로 낮추고 (Retry-After가 있으면 그만큼 전체 대기),
+    그 대기 시간 동안 도착하는 제한 응답은 같은 묶음으로 보고 속도를 더 낮추지 않습니다.
+    정상 응답이 연속으로 이어지면 max_rate까지 조금씩 다시 높입니다.
+    """
+
+    THROTTLE_STATUS_CODES = (429, 503)
+
+    def __init__(self, rate=5.0, burst=10, min_rate=0.2, max_rate=None, speedup_after=20):
+        self.rate = float(rate)
+        self.burst = max(1, burst)
+        self.min_rate = min_rate
+        self.max_rate = max_rate or self.rate * 4
+        self.speedup_after = speedup_after  # 이 횟수만큼 연속 성공하면 속도 증가
+        self.tokens = float(self.burst)
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0  # 스로틀 응답 이후 전체 요청을 멈춰 둘 시각
+        self.success_streak = 0
+        self.throttled_count = 0
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """토큰 하나를 예약하고 요청 전에 기다려야 할 시간(초) 반환"""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+            self.updated_at = now
+
+            # 토큰이 모자라면 빚으로 예약 → 동시에 기다리는 요청들이 순서대로 간격을 두고 나감
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return max(wait, self.blocked_until - now)
+
+    def acquire(self):
+        """요청을 보내도 될 때까지 대기 (블로킹)"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """acquire의 asyncio 버전"""
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record(self, status_code, retry_after=None):
+        """응답 상태코드를 반영해서 속도 조절"""
+        with self.lock:
+            if status_code in self.THROTTLE_STATUS_CODES:
+                self.success_streak = 0
+                self.throttled_count += 1
+                now = time.monotonic()
+                if now < self.blocked_until:
+                    # 이미 속도를 낮추고 대기 중 - 같은 시점에 보낸 동시 요청들의 제한 응답은 한 번만 반영
+                    if retry_after and str(retry_after).isdigit():
+                        self.blocked_until = max(self.blocked_until, now + int(retry_after))
+                    return
+                self.rate = max(self.min_rate, self.rate / 2)
+
+                pause = 1.0 / self.rate
+                if retry_after and str(retry_after).isdigit():
+                    pause = max(pause, int(retry_after))
+                self.blocked_until = now + pause
+                print(f"   🐢 요청 제한 응답({status_code}) - 속도를 {self.rate:.2f}회/초로 낮추고 {pause:.1f}초 대기")
+
+            elif status_code is not None and 200 <= status_code < 300:
+                self.success_streak += 1
+                if self.success_streak >= self.speedup_after and self.rate < self.max_rate:
+                    self.success_streak = 0
+                    self.rate = min(self.max_rate, self.rate * 1.25)
+                    print(f"   🚀 응답이 안정적이라 속도를 {self.rate:.2f}회/초로 높입니다")
+            
+            elif status_code is not None and 400 <= status_code < 500:
+                # 세션 만료(401), 서명 거부(403), 없는 비디오(404) 등은 정상 응답이 아니므로 가속하지 않음
+                self.success_streak = 0
+
+
+class RetryPolicy:
+    """복제 요청 재시도 정책 (상한이 있는 지수 백오프 + full jitter)
+
+    idempotent=True인 엔드포인트(읽기 전용 youtubei 조회)는 5xx, 타임아웃, 연결 오류도 재시도하고,
+    그렇지 않은 엔드포인트는 서버가 처리하지 않았다고 알려주는 429/503만 재시도합니다.
+    """
+
+    RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+    NOT_PROCESSED_STATUS_CODES = (429, 503)
+
+    def __init__(self, max_attempts=4, base_delay=1.0, max_delay=30.0, idempotent=True):
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.idempotent = idempotent
+
+    def should_retry(self, attempt, status_code=None, error=None):
+        """attempt번째 시도 결과를 보고 다시 시도할지 결정"""
+        if attempt >= self.max_attempts:
+            return False
+        if error is not None:
+            # 타임아웃/연결 오류는 서버가 이미 처리했을 수 있으므로 멱등 요청만 재시도
+            return self.idempotent
+        if status_code in self.NOT_PROCESSED_STATUS_CODES:
+            return True
+        return self.idempotent and status_code in self.RETRYABLE_STATUS_CODES
+
+    def backoff(self, attempt, retry_after=None):
+        """다음 시도 전 대기 시간(초) - min(max_delay, base * 2^(attempt-1)) 범위의 무작위 값"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+        if retry_after and str(retry_after).isdigit():
+            delay = max(delay, min(self.max_delay, int(retry_after)))
+        return delay
+
+    @staticmethod
+    def for_url(retry_policies, url):
+        """URL의 엔드포인트 이름(get_screen, get_cards, list_creator_videos...)에 맞는 정책 선택"""
+        endpoint = urlparse(url).path.rstrip('/').rsplit('/', 1)[-1]
+        return retry_policies.get(endpoint) or retry_policies['default']
+
+
+# 엔드포인트별 기본 재시도 정책 (youtubei 조회 API는 모두 읽기 전용이라 멱등)
+DEFAULT_RETRY_POLICIES = {
+    'list_creator_videos': RetryPolicy(max_attempts=5, base_delay=1.0, max_delay=30.0),
+    'get_screen': RetryPolicy(max_attempts=4, base_delay=1.0, max_delay=20.0),
+    'get_cards': RetryPolicy(max_attempts=4, base_delay=1.0, max_delay=20.0),
+    'default': RetryPolicy(max_attempts=3, base_delay=1.0, max_delay=10.0, idempotent=False),
+}
+
+
+def parse_cookie_header(cookie_header):
+    """'a=1; b=2' 형식의 Cookie 헤더를 dict로 변환"""
+    cookies = {}
+    for item in (cookie_header or '').split(';'):
+        if '=' in item:
+            key, value = item.strip().split('=', 1)
+            cookies[key] = value
+    return cookies
+
+
+STUDIO_ORIGIN = 'https://studio.youtube.com'
+
+# Authorization 헤더 스킴별로 서명에 쓰는 쿠키
+SAPISID_AUTH_SCHEMES = (
+    ('SAPISIDHASH', 'SAPISID'),
+    ('SAPISID1PHASH', '__Secure-1PAPISID'),
+    ('SAPISID3PHASH', '__Secure-3PAPISID'),
+)
+
+
+def build_sapisid_authorization(cookies, origin=STUDIO_ORIGIN, user_session_id=None, timestamp=None):
+    """SAPISID 계열 쿠키로 youtubei Authorization 헤더 생성 (쿠키가 없으면 None)
+
+    각 스킴 값은 '<ts>_<sha1("[세션ID ]ts 쿠키값 origin")>[_u]' 형식입니다.
+    """
+    if isinstance(cookies, str):
+        cookies = parse_cookie_header(cookies)
+    timestamp = str(int(timestamp if timestamp is not None else time.time()))
+    
+    parts = []
+    for scheme, cookie_name in SAPISID_AUTH_SCHEMES:
+        sid = cookies.get(cookie_name) or (cookies.get('SAPISID') if cookie_name != 'SAPISID' else None)
+        if not sid:
+            continue
+        hash_input = ' '.join(filter(None, [user_session_id, timestamp, sid, origin]))
+        digest = hashlib.sha1(hash_input.encode('utf-8')).hexdigest()
+        parts.append(f"{scheme} {timestamp}_{digest}{'_u' if user_session_id else ''}")
+    return ' '.join(parts) or None
+
+
+class SapisidSigner:
+    """복제 요청마다 새 SAPISIDHASH/SAPISID1PHASH/SAPISID3PHASH 헤더를 계산하는 서명기
+
+    캡처된 Authorization 값은 생성 시각이 들어 있어 시간이 지나면 거부되므로,
+    쿠키 jar의 SAPISID 계열 쿠키와 요청 origin으로 매 요청 현재 시각 기준 값을 다시 만듭니다.
+    같은 초 안의 요청은 계산 결과를 재사용합니다.
+    """
+
+    def __init__(self, user_session_id=None):
+        self.user_session_id = user_session_id  # ytcfg DATASYNC_ID 앞부분 (있으면 '_u' 형식)
+        self.cookies = {}
+        self.cached_key = None
+        self.cached_authorization = None
+        self.lock = threading.Lock()
+
+    def update_cookies(self, cookies):
+        """Cookie 헤더 문자열 또는 dict에서 서명에 필요한 쿠키만 보관"""
+        if isinstance(cookies, str):
+            cookies = parse_cookie_header(cookies)
+        sid_cookies = {name: cookies[name] for _, name in SAPISID_AUTH_SCHEMES if cookies.get(name)}
+        if sid_cookies:
+            with self.lock:
+                self.cookies.update(sid_cookies)
+                self.cached_key = None
+
+    def sign(self, headers):
+        """SAPISID 계열 Authorization이 있는 헤더면 새 값으로 교체한 사본 반환 (아니면 그대로)"""
+        auth_key = next((key for key in headers if key.lower() == 'authorization'), None)
+        if not auth_key or not str(headers[auth_key]).startswith('SAPISID') or 'SAPISID' not in self.cookies:
+            return headers
+        
+        origin = headers.get('X-Origin') or headers.get('Origin') or STUDIO_ORIGIN
+        timestamp = int(time.time())
+        with self.lock:
+            key = (timestamp, origin, self.user_session_id)
+            if key != self.cached_key:
+                self.cached_authorization = build_sapisid_authorization(
+                    self.cookies, origin, self.user_session_id, timestamp
+                )
+                self.cached_key = key
+            authorization = self.cached_authorization
+        
+        signed_headers = dict(headers)
+        signed_headers[auth_key] = authorization
+        return signed_headers
+
+
+class ReplayClient:
+    """캡처된 요청을 복제 전송하는 공유 HTTP 클라이언트
+
+    keep-alive 연결 풀을 가진 requests 세션 하나를 모든 복제 경로가 함께 사용합니다.
+    Cookie 헤더는 한 번만 파싱해서 세션 쿠키 jar에 넣고, 캡처된 헤더로 만든
+    기본 헤더도 캐시해 두므로 요청마다 세션/쿠키/헤더를 다시 만들지 않습니다.
+    """
+
+    def __init__(self, pool_size=10, rate_limiter=None, retry_policies=None):
+        self.rate_limiter = rate_limiter  # 모든 요청이 거쳐가는 AdaptiveRateLimiter (선택)
+        self.retry_policies = retry_policies or DEFAULT_RETRY_POLICIES  # 엔드포인트별 RetryPolicy
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.loaded_cookie_headers = set()  # 이미 jar에 등록한 Cookie 헤더 문자열
+        self.prepared_headers = {}  # id(캡처된 헤더) -> (캡처된 헤더, 기본 헤더)
+        self.lock = threading.Lock()
+        self.signer = SapisidSigner()  # 요청마다 Authorization 재계산
+
+    def load_cookie_header(self, cookie_header):
+        """Cookie 헤더 문자열을 파싱해서 세션 쿠키 jar에 등록 (같은 헤더는 한 번만)"""
+        if not cookie_header or cookie_header in self.loaded_cookie_headers:
+            return 0
+
+        cookies = parse_cookie_header(cookie_header)
+        self.session.cookies.update(cookies)
+        self.signer.update_cookies(cookies)
+        self.loaded_cookie_headers.add(cookie_header)
+        return len(cookies)
+
+    def prepare_headers(self, headers):
+        """캡처된 헤더에서 전송용 기본 헤더 생성 (Cookie/Content-Length 제외, 캐시 사용)"""
+        with self.lock:
+            cached = self.prepared_headers.get(id(headers))
+            if cached and cached[0] is headers:
+                return cached[1]
+
+            cookie_count = self.load_cookie_header(headers.get('Cookie') or headers.get('cookie'))
+            if cookie_count:
+                print(f"   🍪 쿠키 jar 설정: {cookie_count}개")
+
+            base_headers = {
+                key: value for key, value in headers.items()
+                if key.lower() not in ('cookie', 'content-length')
+            }
+            if not any(key.lower() == 'content-type' for key in base_headers):
+                base_headers['Content-Type'] = 'application/json'
+
+            self.prepared_headers[id(headers)] = (headers, base_headers)
+            return base_headers
+
+    def send(self, url, method, headers, data=None, timeout=30):
+        """캡처된 헤더로 요청 전송 (data는 이미 직렬화된 str 또는 bytes 바디)
+
+        엔드포인트 재시도 정책에 따라 재전송하며, 반환된 응답(또는 마지막 예외)의
+        retry_count 속성에 재시도 횟수가 기록됩니다.
+        """
+        request_headers = self.prepare_headers(headers)
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+
+        policy = RetryPolicy.for_url(self.retry_policies, url)
+        attempt = 0
+
+        while True:
+            attempt += 1
+            if self.rate_limiter:
+                self.rate_limiter.acquire()
+
+            # 속도 제한 대기/재시도 후 실제 전송 시각 기준으로 Authorization 서명
+            signed_headers = self.signer.sign(request_headers)
+            try:
+                if method.upper() == 'POST':
+                    response = self.session.post(url, headers=signed_headers, data=data, timeout=timeout)
+                else:
+                    response = self.session.get(url, headers=signed_headers, timeout=timeout)
+            except (requests.Timeout, requests.ConnectionError) as e:
+                if not policy.should_retry(attempt, error=e):
+                    e.retry_count = attempt - 1
+                    raise
+                delay = policy.backoff(attempt)
+                print(f"   🔁 요청 오류 ({type(e).__name__}) - {delay:.1f}초 후 재시도 ({attempt}/{policy.max_attempts})")
+                time.sleep(delay)
+                continue
+
+            retry_after = response.headers.get('Retry-After')
+            if self.rate_limiter:
+                self.rate_limiter.record(response.status_code, retry_after)
+
+            if response.status_code != 200 and policy.should_retry(attempt, status_code=response.status_code):
+                delay = policy.backoff(attempt, retry_after)
+                print(f"   🔁 HTTP {response.status_code} - {delay:.1f}초 후 재시도 ({attempt}/{policy.max_attempts})")
+                time.sleep(delay)
+                continue
+
+            response.retry_count = attempt - 1
+            return response
+
+    def close(self):
+        """연결 풀 정리"""
+        self.session.close()
+
+
+def millis_to_minutes(value):
+    return round(value / 1000 / 60, 1)
+
+
+# keyMetricTabs[*].primaryContent.metric 이름(별칭 포함) -> (VideoMetrics 필드, 값 변환)
+KEY_METRIC_FIELDS = {
+    'VIDEO_THUMBNAIL_IMPRESSIONS': ('impressions', None),
+    'VIDEO_THUMBNAIL_IMPRESSIONS_VTR': ('click_rate', None),
+    'EXTERNAL_VIEWS': ('views', None),
+    'VIEWS': ('views', None),
+    'VIEW_COUNT': ('views', None),
+    'EXTERNAL_WATCH_TIME': ('watch_time_minutes', millis_to_minutes),
+    'WATCH_TIME': ('watch_time_minutes', millis_to_minutes),
+    'WATCH_TIME_MINUTES': ('watch_time_minutes', None),
+    'AVERAGE_VIEW_DURATION': ('average_view_duration_seconds', None),
+    'AVG_VIEW_DURATION': ('average_view_duration_seconds', None),
+    'AVERAGE_VIEW_DURATION_SECONDS': ('average_view_duration_seconds', None),
+    'VIEW_DURATION_AVG': ('average_view_duration_seconds', None),
+    'SUBSCRIBERS_NET_CHANGE': ('subscribers_net_change', None),
+}
+
+# audienceRetentionHighlightsCardData.videosData[*].metricTotals 키 -> (VideoMetrics 필드, 값 변환)
+RETENTION_TOTAL_FIELDS = {
+    'avgViewDurationMillis': ('average_view_duration_seconds', lambda value: round(value / 1000)),
+    'avgPercentageWatched': ('average_percentage_watched', lambda value: round(value * 100, 2)),
+    'views': ('retention_views', None),
+}
+
+
+@dataclass
+class VideoMetrics:
+    """한 비디오의 애널리틱스 메트릭 (콘솔 출력, JSON, 엑셀이 모두 이 레코드를 사용)
+
+    응답에 없던 메트릭은 None으로 남아 "수집되지 않음"과 실제 0을 구분합니다.
+    """
+    impressions: Optional[int] = None
+    click_rate: Optional[float] = None
+    views: Optional[int] = None
+    watch_time_minutes: Optional[float] = None
+    average_view_duration_seconds: Optional[int] = None
+    average_percentage_watched: Optional[float] = None
+    subscribers_net_change: Optional[int] = None
+    retention_views: Optional[int] = None
+    header_title: str = ''
+    totals: dict = field(default_factory=dict)  # keyMetricTabs의 원래 메트릭 이름 -> total (별칭 표에 없는 메트릭 포함)
+    series: dict = field(default_factory=dict, repr=False)  # 메트릭 이름 -> mainSeries.datums (collect_series일 때만)
+
+    def as_record(self):
+        """레코드에 저장할 dict (시계열 제외)"""
+        record = asdict(self)
+        record.pop('series')
+        return record
+
+    @classmethod
+    def from_record(cls, record):
+        known = {name for name in cls.__dataclass_fields__ if name != 'series'}
+        return cls(**{key: value for key, value in record.items() if key in known})
+
+
+def extract_response_metrics(response_data, video_id, metrics=None, collect_series=False):
+    """get_screen / get_cards 응답의 카드를 한 번만 순회하며 메트릭을 metrics에 채움"""
+    if metrics is None:
+        metrics = VideoMetrics()
+    
+    for card in (response_data or {}).get('cards', []):
+        if 'keyMetricCardData' in card:
+            for tab in card['keyMetricCardData'].get('keyMetricTabs', []):
+                primary_content = tab.get('primaryContent', {})
+                metric = primary_content.get('metric', '')
+                total = primary_content.get('total', 0)
+                if not metric or total is None:
+                    continue
+                
+                metrics.totals[metric] = total
+                target = KEY_METRIC_FIELDS.get(metric)
+                if target:
+                    field_name, convert = target
+                    setattr(metrics, field_name, convert(total) if convert else total)
+                if collect_series:
+                    datums = primary_content.get('mainSeries', {}).get('datums', [])
+                    if datums:
+                        metrics.series[metric] = datums
+        
+        elif 'audienceRetentionHighlightsCardData' in card:
+            for video_data in card['audienceRetentionHighlightsCardData'].get('videosData', []):
+                if video_data.get('videoId') != video_id:
+                    continue
+                for key, value in video_data.get('metricTotals', {}).items():
+                    target = RETENTION_TOTAL_FIELDS.get(key)
+                    if target and value is not None:
+                        field_name, convert = target
+                        setattr(metrics, field_name, convert(value) if convert else value)
+                break
+        
+        elif 'personalizedHeaderCardData' in card:
+            metrics.header_title = card['personalizedHeaderCardData'].get('title', '') or metrics.header_title
+    
+    # 조회수 카드가 없으면 리텐션 카드의 조회수 사용
+    if metrics.views is None and metrics.retention_views is not None:
+        metrics.views = metrics.retention_views
+    return metrics
+
+
+def extract_video_metrics(analytics_data, video_id, collect_series=False):
+    """탭별 API 응답(record['analytics_data'])에서 VideoMetrics 생성"""
+    metrics = VideoMetrics()
+    for tab_api_data in (analytics_data or {}).values():
+        if tab_api_data and tab_api_data.get('response_data'):
+            extract_response_metrics(tab_api_data['response_data'], video_id, metrics, collect_series)
+    return metrics
+
+
+# YouTube 썸네일 변형(파일 이름) -> 가로 픽셀 (너비 정보가 없는 URL 목록에서 크기를 고를 때 사용)
+THUMBNAIL_VARIANT_WIDTHS = {
+    'default': 120, 'mqdefault': 320, 'hqdefault': 480, 'sddefault': 640, 'hq720': 1280, 'maxresdefault': 1280
+}
+THUMBNAIL_MIN_WIDTH = 200  # 엑셀 셀에 표시하는 가장 큰 썸네일 너비 (px)
+
+
+def select_thumbnail_url(video_info, video_id=None, min_width=THUMBNAIL_MIN_WIDTH):
+    """셀 크기(min_width) 이상인 가장 작은 썸네일 URL 선택 (크기를 알 수 없으면 가장 큰 것)"""
+    candidates = []
+    thumbnails = (video_info.get('thumbnailDetails') or {}).get('thumbnails') or []
+    if thumbnails:
+        candidates = [(thumb.get('width'), thumb.get('url')) for thumb in thumbnails if thumb.get('url')]
+    elif video_info.get('thumbnail_urls'):
+        candidates = [(None, url) for url in video_info['thumbnail_urls'] if url]
+    elif video_info.get('thumbnail'):
+        candidates = [(None, video_info['thumbnail'])]
+    
+    if not candidates:
+        if video_id and video_id != 'N/A':
+            return f"https://i.ytimg.com/vi/{video_id}/mqdefault.jpg"  # 320x180, 모든 비디오에 존재
+        return None
+    
+    sized = []
+    for width, url in candidates:
+        if not width:
+            variant = urlparse(url).path.rsplit('/', 1)[-1].split('.', 1)[0]
+            width = THUMBNAIL_VARIANT_WIDTHS.get(variant)
+        if width and width >= min_width:
+            sized.append((width, url))
+    return min(sized)[1] if sized else candidates[-1][1]
+
+
+def thumbnail_item(video_info, video_id):
+    """(캐시 키 video_id, 썸네일 URL) - prefetch와 행 기록이 같은 키로 캐시를 찾도록 한 곳에서 계산"""
+    video_id = video_id or 'N/A'
+    return video_id, select_thumbnail_url(video_info or {}, video_id)
+
+
+def resize_thumbnail(image_bytes, width, height, quality=80):
+    """썸네일을 셀 표시 크기(width x height px)로 줄이고 JPEG로 다시 압축"""
+    from PIL import Image as PILImage  # 썸네일을 줄일 때만 필요
+    
+    with PILImage.open(BytesIO(image_bytes)) as image:
+        image.draft('RGB', (width, height))  # JPEG는 디코딩 단계에서 미리 축소
+        resized = image.convert('RGB').resize((width, height), PILImage.Resampling.LANCZOS)
+    output = BytesIO()
+    resized.save(output, format='JPEG', quality=quality, optimize=True)
+    return output.getvalue()
+
+
+class ThumbnailCache:
+    """엑셀용 썸네일 다운로더 + 디스크 캐시
+
+    파일 이름은 sha1(videoId + URL)이라 썸네일이 바뀌어 URL이 달라지면 새로 받고,
+    같은 URL은 다음 실행부터 디스크에서 읽습니다. 워크북을 만들기 전에 prefetch()로
+    빠진 썸네일을 연결 풀을 공유하는 스레드들로 동시에 받아 두며, 셀 크기를 주면
+    원본 대신 셀 크기로 줄여 다시 압축한 이미지를 함께 캐시합니다.
+    """
+
+    USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+
+    def __init__(self, cache_dir='thumbnail_cache', max_workers=8, timeout=15, quality=80):
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max(1, max_workers)
+        self.timeout = timeout
+        self.quality = quality  # 셀 크기 썸네일 JPEG 품질 (1-95)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.session.headers['User-Agent'] = self.USER_AGENT
+        self.errors = {}  # (video_id, url) -> 실패 사유 (같은 실행에서 다시 시도하지 않음)
+
+    def path_for(self, video_id, url):
+        digest = hashlib.sha1(f"{video_id}\n{url}".encode('utf-8')).hexdigest()
+        return self.cache_dir / f"{digest}.img"
+
+    def fetch(self, video_id, url):
+        """썸네일 바이트 반환: (bytes, None) 또는 실패 시 (None, 사유)"""
+        path = self.path_for(video_id, url)
+        if path.exists():
+            return path.read_bytes(), None
+        if (video_id, url) in self.errors:
+            return None, self.errors[(video_id, url)]
+        
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+        except Exception as e:
+            print(f"      ❌ 썸네일 오류 ({video_id}): {str(e)[:50]}")
+            self.errors[(video_id, url)] = '오류'
+            return None, '오류'
+        
+        if response.status_code != 200:
+            print(f"      ❌ 썸네일 다운로드 실패 ({video_id}): {response.status_code}")
+            self.errors[(video_id, url)] = f"HTTP {response.status_code}"
+            return None, self.errors[(video_id, url)]
+        
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        temp_path.write_bytes(response.content)
+        os.replace(temp_path, path)
+        return response.content, None
+
+    def resized_path_for(self, video_id, url, width, height):
+        path = self.path_for(video_id, url)
+        return path.with_name(f"{path.stem}_{width}x{height}_q{self.quality}.jpg")
+
+    def fetch_resized(self, video_id, url, width, height):
+        """셀 크기로 줄여 다시 압축한 썸네일 반환: (bytes, None) 또는 실패 시 (None, 사유)"""
+        path = self.resized_path_for(video_id, url, width, height)
+        if path.exists():
+            return path.read_bytes(), None
+        
+        image_bytes, error = self.fetch(video_id, url)
+        if image_bytes is None:
+            return None, error
+        
+        try:
+            resized = resize_thumbnail(image_bytes, width, height, self.quality)
+        except Exception as e:
+            print(f"      ⚠️ 썸네일 축소 실패 ({video_id}) - 원본 사용: {str(e)[:50]}")
+            return image_bytes, None
+        
+        temp_path = path.with_suffix(f'.{threading.get_ident()}.tmp')
+        temp_path.write_bytes(resized)
+        os.replace(temp_path, path)
+        return resized, None
+
+    def prefetch(self, items, size=None):
+        """(video_id, url) 목록 중 캐시에 없는 썸네일을 동시에 다운로드 (size=(가로, 세로)면 셀 크기 이미지까지 생성)"""
+        items = list(dict.fromkeys((video_id, url) for video_id, url in items if url))
+        if size:
+            is_cached = lambda item: self.resized_path_for(*item, *size).exists()
+            load = lambda item: self.fetch_resized(*item, *size)
+        else:
+            is_cached = lambda item: self.path_for(*item).exists()
+            load = lambda item: self.fetch(*item)
+        missing = [item for item in items if item not in self.errors and not is_cached(item)]
+        print(f"📷 썸네일 준비: {len(items)}개 (캐시 {len(items) - len(missing)}개, 다운로드 {len(missing)}개)")
+        if not missing:
+            return
+        
+        started_at = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='thumbnail') as executor:
+            failed = sum(1 for data, _ in executor.map(load, missing) if data is None)
+        print(f"   ✅ 썸네일 다운로드 완료: {len(missing) - failed}/{len(missing)}개 ({time.time() - started_at:.1f}초)")
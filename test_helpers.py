@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# 순수 도우미(메트릭 추출, 페이로드 템플릿, 재시도/속도 제한, SAPISID 서명, Parquet 테이블, 기록 DB)를
+# 저장소에 있는 실제 수집 결과(youtube_analytics_data_20250724_142724.json)로 고정하는 검사
+
+import json
+import random
+import sqlite3
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from studio_common import (
+    AdaptiveRateLimiter, RetryPolicy, DEFAULT_RETRY_POLICIES, build_sapisid_authorization,
+    extract_response_metrics, extract_video_metrics,
+)
+from once import YouTubeStudioMonitor, CompiledPayload, HistoryStore, build_video_table
+
+SAMPLE_FILE = Path(__file__).parent / 'youtube_analytics_data_20250724_142724.json'
+
+
+def load_sample_records():
+    with open(SAMPLE_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)['analytics_data']
+
+
+# 표 기반 추출기 도입 전 탭별 추출기가 같은 파일에서 내던 값
+EXPECTED_METRICS = {
+    'MNDICwtk-60': {'impressions': 6899, 'click_rate': 4.81, 'views': 426, 'watch_time_minutes': 729.3,
+                    'average_view_duration_seconds': 149, 'average_percentage_watched': 18.16,
+                    'subscribers_net_change': 2, 'retention_views': 135},
+    'LPRi6MMlYao': {'impressions': 9828, 'click_rate': 4.72, 'views': 549, 'watch_time_minutes': 1434.6,
+                    'average_view_duration_seconds': 159, 'average_percentage_watched': 17.77,
+                    'subscribers_net_change': 3, 'retention_views': 537},
+    'EYtFebNa5CQ': {'impressions': 17394, 'click_rate': 6.53, 'views': 1402, 'watch_time_minutes': 3191.9,
+                    'average_view_duration_seconds': 137, 'average_percentage_watched': 14.79,
+                    'subscribers_net_change': 10, 'retention_views': 1392},
+}
+
+
+def test_extract_video_metrics_matches_previous_outputs():
+    """두 탭 응답을 합친 메트릭이 이전 추출기 결과와 같은지"""
+    for record in load_sample_records():
+        metrics = extract_video_metrics(record['analytics_data'], record['video_id'])
+        for name, expected in EXPECTED_METRICS[record['video_id']].items():
+            assert getattr(metrics, name) == expected, (record['video_id'], name)
+        assert metrics.totals['RETURNING_VIEWERS'] is not None
+
+
+def test_extract_response_metrics_per_tab():
+    """탭 하나의 응답만으로는 그 탭에 있는 메트릭만 채워지고 나머지는 None"""
+    record = load_sample_records()[0]
+    reach = extract_response_metrics(record['analytics_data']['reach_viewers']['response_data'], record['video_id'])
+    assert (reach.impressions, reach.click_rate, reach.views) == (6899, 4.81, 426)
+    assert reach.watch_time_minutes is None and reach.retention_views is None
+
+    interest = extract_response_metrics(record['analytics_data']['interest_viewers']['response_data'], record['video_id'])
+    assert interest.impressions is None and interest.click_rate is None
+    assert (interest.watch_time_minutes, interest.average_view_duration_seconds) == (729.3, 149)
+
+    assert extract_video_metrics({}, 'missing').as_record()['views'] is None
+
+
+def test_views_fall_back_to_retention_card():
+    """조회수 카드가 없으면 리텐션 카드의 조회수를 사용 (다른 비디오의 리텐션 값은 무시)"""
+    response = {'cards': [{'audienceRetentionHighlightsCardData': {'videosData': [
+        {'videoId': 'other', 'metricTotals': {'views': 999}},
+        {'videoId': 'target', 'metricTotals': {'views': 42, 'avgViewDurationMillis': 61400, 'avgPercentageWatched': 0.1234}},
+    ]}}]}
+    metrics = extract_response_metrics(response, 'target')
+    assert (metrics.views, metrics.retention_views) == (42, 42)
+    assert (metrics.average_view_duration_seconds, metrics.average_percentage_watched) == (61, 12.34)
+
+
+def test_collected_zero_metrics_are_kept():
+    """수집된 0은 None(미수집)과 구분해서 그대로 유지하고, 조회수 카드의 0을 리텐션 값으로 덮어쓰지 않음"""
+    response = {'cards': [
+        {'keyMetricCardData': {'keyMetricTabs': [{'primaryContent': {'metric': 'EXTERNAL_VIEWS', 'total': 0}}]}},
+        {'audienceRetentionHighlightsCardData': {'videosData': [
+            {'videoId': 'target', 'metricTotals': {'views': 0, 'avgViewDurationMillis': 0, 'avgPercentageWatched': 0}},
+        ]}},
+    ]}
+    metrics = extract_response_metrics(response, 'target')
+    assert (metrics.views, metrics.retention_views) == (0, 0)
+    assert (metrics.average_view_duration_seconds, metrics.average_percentage_watched) == (0, 0)
+
+    retention_only = extract_response_metrics({'cards': response['cards'][1:]}, 'target')
+    assert retention_only.views == 0
+
+
+def test_compiled_payload_render_matches_replace_video_id(tmp_path, monkeypatch):
+    """바이트 템플릿 결과가 기존 replace_video_id_in_payload와 같은 JSON인지"""
+    monkeypatch.chdir(tmp_path)
+    monitor = YouTubeStudioMonitor(history_db=None)
+    for tab_data in load_sample_records()[0]['tabs_data'].values():
+        post_data = tab_data['captured_request']['postData']
+        compiled = CompiledPayload(post_data)
+
+        assert 'screenConfig.entity.videoId' in compiled.video_id_paths
+        assert json.loads(compiled.render()) == json.loads(post_data)
+        assert json.loads(compiled.render(video_id='NEW_ID')) == \
+            monitor.replace_video_id_in_payload(json.loads(post_data), 'NEW_ID')
+
+        paged = json.loads(compiled.render(video_id='NEW_ID', page_token='token "quoted"'))
+        assert paged['pageToken'] == 'token "quoted"'
+        assert paged['screenConfig']['entity']['videoId'] == 'NEW_ID'
+
+
+def test_retry_policy_decisions():
+    read_only = RetryPolicy(max_attempts=3)
+    assert read_only.should_retry(1, status_code=500)
+    assert read_only.should_retry(1, error=TimeoutError())
+    assert not read_only.should_retry(1, status_code=404)
+    assert not read_only.should_retry(3, status_code=503)
+
+    # 멱등이 아니면 서버가 처리하지 않았다고 알려준 429/503만 재시도
+    write = RetryPolicy(max_attempts=3, idempotent=False)
+    assert write.should_retry(1, status_code=429)
+    assert not write.should_retry(1, status_code=500)
+    assert not write.should_retry(1, error=ConnectionError())
+
+
+def test_retry_policy_backoff_and_endpoint_selection():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0)
+    random.seed(0)
+    for attempt in range(1, 8):
+        assert 0 <= policy.backoff(attempt) <= min(5.0, 2 ** (attempt - 1))
+    assert policy.backoff(1, retry_after='3') >= 3
+    assert policy.backoff(1, retry_after='60') == 5.0
+
+    url = 'https://studio.youtube.com/youtubei/v1/yta_web/get_cards?alt=json'
+    assert RetryPolicy.for_url(DEFAULT_RETRY_POLICIES, url) is DEFAULT_RETRY_POLICIES['get_cards']
+    assert RetryPolicy.for_url(DEFAULT_RETRY_POLICIES, 'https://example.com/other') is DEFAULT_RETRY_POLICIES['default']
+
+
+def test_rate_limiter_halves_once_per_throttle_burst():
+    limiter = AdaptiveRateLimiter(rate=5.0, burst=10)
+    for _ in range(8):
+        limiter.record(429)
+    assert limiter.rate == 2.5
+    assert limiter.throttled_count == 8
+
+    limiter.blocked_until = 0.0  # 대기 시간이 지난 뒤의 제한 응답은 새 묶음
+    limiter.record(503)
+    assert limiter.rate == 1.25
+
+    floor = AdaptiveRateLimiter(rate=0.3, min_rate=0.2)
+    floor.record(429)
+    assert floor.rate == 0.2
+
+
+def test_rate_limiter_speeds_up_and_spaces_requests():
+    limiter = AdaptiveRateLimiter(rate=4.0, burst=2, max_rate=5.0, speedup_after=3)
+    for _ in range(3):
+        limiter.record(200)
+    assert limiter.rate == 5.0
+    for _ in range(3):
+        limiter.record(200)
+    assert limiter.rate == 5.0  # max_rate에서 멈춤
+
+    assert limiter.reserve() == 0 and limiter.reserve() == 0
+    assert limiter.reserve() > 0  # burst를 넘은 요청은 간격을 두고 대기
+
+
+def test_rate_limiter_does_not_speed_up_on_client_errors():
+    """401/403/404 같은 실패 응답은 정상 응답으로 세지 않고 연속 성공 횟수도 초기화"""
+    limiter = AdaptiveRateLimiter(rate=2.0, max_rate=5.0, speedup_after=3)
+    for _ in range(10):
+        limiter.record(403)
+    assert limiter.rate == 2.0
+    assert limiter.throttled_count == 0
+
+    limiter.record(200)
+    limiter.record(200)
+    limiter.record(401)
+    limiter.record(200)
+    assert limiter.rate == 2.0
+
+
+def test_build_sapisid_authorization():
+    """'<ts>_<sha1("[세션ID ]ts 쿠키값 origin")>[_u]' 형식 (스킴별 쿠키, 없으면 SAPISID 사용)"""
+    cookies = {'SAPISID': 'SID1', '__Secure-1PAPISID': 'P1'}
+    assert build_sapisid_authorization(cookies, timestamp=1700000000) == (
+        'SAPISIDHASH 1700000000_e64ccf7696cbed57a41809860793c0b3b393e3a4 '
+        'SAPISID1PHASH 1700000000_2dadafac071d1ad32e9feb31191fa4d3556fdf75 '
+        'SAPISID3PHASH 1700000000_e64ccf7696cbed57a41809860793c0b3b393e3a4'
+    )
+    assert build_sapisid_authorization('SAPISID=SID1', user_session_id='123', timestamp=1700000000).startswith(
+        'SAPISIDHASH 1700000000_d91327bc24305ccfd361d7af50aaab8467bf121f_u '
+    )
+    assert build_sapisid_authorization({'NID': 'x'}, timestamp=1) is None
+
+
+def test_build_video_table_types_and_missing_metrics():
+    records = load_sample_records() + [
+        {'video_id': 'failed', 'collected_at': '2025-07-24T15:00:00', 'basic_video_info': {}, 'analytics_data': {}}
+    ]
+    table = build_video_table(records, channel_id='UCtest')
+
+    assert list(table['video_id']) == ['MNDICwtk-60', 'LPRi6MMlYao', 'EYtFebNa5CQ', 'failed']
+    assert str(table['impressions'].dtype) == 'Int64'
+    assert str(table['click_rate'].dtype) == 'float64'
+    assert table.loc[0, 'impressions'] == 6899 and table.loc[0, 'click_rate'] == 4.81
+    assert int(table.loc[0, 'view_count']) == int(records[0]['basic_video_info']['public_viewCount'])
+    assert str(table['time_published'].dt.tz) == 'UTC'
+
+    # 수집되지 않은 메트릭은 0이 아니라 NA
+    assert table.loc[3, 'impressions'] is pd.NA
+    assert pd.isna(table.loc[3, 'click_rate'])
+    # 마이크로초 유무가 섞인 수집 시각도 모두 파싱
+    assert table['collected_at'].notna().all()
+    assert set(table['channel_id']) == {'UCtest'}
+
+
+def test_history_store_snapshots_and_trend(tmp_path):
+    store = HistoryStore(tmp_path / 'history.db')
+    records = load_sample_records()
+    failed = {'video_id': 'failed', 'collected_at': '2099-01-01T00:00:00', 'basic_video_info': {},
+              'analytics_data': {}, 'metrics': {'click_rate': 0.0, 'impressions': 0}}
+
+    assert store.record_run(records + [failed], 'UCtest') == 4
+    assert store.record_run(records, 'UCtest') == 0  # 같은 수집 시각은 다시 기록하지 않음
+
+    later = [dict(record, collected_at='2099-01-01T00:00:00') for record in records]
+    assert store.record_run(later, 'UCtest') == 3
+
+    assert store.metric_trend('MNDICwtk-60', 'click_rate', days=100000) == [
+        ('2025-07-24T14:27:17.427229', 4.81), ('2099-01-01T00:00:00', 4.81)
+    ]
+    assert store.metric_trend('MNDICwtk-60', 'click_rate', days=30) == [('2099-01-01T00:00:00', 4.81)]
+    assert store.metric_trend('failed', 'click_rate', days=100000) == []  # 실패한 날의 가짜 0 없음
+
+    connection = store.connect()
+    try:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert connection.execute("SELECT COUNT(*) FROM snapshots WHERE video_id = 'failed'").fetchone()[0] == 1
+    finally:
+        connection.close()
+
+
+def test_history_store_trend_does_not_create_database(tmp_path):
+    missing = tmp_path / 'typo.db'
+    with pytest.raises(sqlite3.OperationalError):
+        HistoryStore(missing).metric_trend('MNDICwtk-60', 'click_rate')
+    assert not missing.exists()